@@ -0,0 +1,130 @@
+"""
+Cursor timing and smoothness of the gesture mouse (modules.mouse_control).
+
+A synthetic fingertip moves along a circle and is pushed to a CursorDriver at
+camera rate from the benchmark thread, exactly as the frame loop does, while
+the driver's own thread moves a RecordingBackend cursor. Every configuration
+runs in real time and is scored on the recorded cursor:
+
+    updates_hz  cursor moves per second
+    gap_ms      p95 and max time between consecutive cursor moves
+    step_px     RMS and max distance of one cursor move (large steps are
+                what reads as stutter)
+    error_px    RMS distance to where the fingertip really was at each move
+                (lag shows up here)
+
+'camera_rate' moves the cursor once per hand update like a plain frame-loop
+mouse; 'display_rate' is the driver at mouse.rate_hz with interpolation and
+extrapolation.
+
+Run from the repository root:
+
+    python -m benchmarks.cursor_benchmark
+    python -m benchmarks.cursor_benchmark --rate 144 --seconds 5 --output cursor.json
+"""
+import argparse
+import json
+import math
+import threading
+import time
+
+import numpy as np
+
+from core.config_manager import MouseConfig
+from modules.mouse_control import CursorDriver, RecordingBackend
+
+
+def circle(t, width, height, period=2.0):
+    """Fingertip in screen pixels at time t: a circle every period seconds."""
+    angle = 2 * math.pi * t / period
+    radius = min(width, height) * 0.3
+    return width / 2 + radius * math.cos(angle), height / 2 + radius * math.sin(angle)
+
+
+def run_config(rate_hz, smoothing, predict_ms, args):
+    backend = RecordingBackend(args.width, args.height)
+    driver = CursorDriver(backend, rate_hz=rate_hz, smoothing=smoothing,
+                          max_extrapolation=predict_ms / 1000.0)
+    stop = threading.Event()
+    start = time.perf_counter()
+
+    def camera():
+        # Hand updates arrive at camera rate, delayed by the pipeline latency
+        frame = 0
+        while not stop.is_set():
+            due = start + frame / args.fps
+            stop.wait(max(0.0, due - time.perf_counter()))
+            captured = due - args.latency_ms / 1000.0
+            driver.track.push(due, *circle(captured - start, args.width, args.height))
+            frame += 1
+
+    feeder = threading.Thread(target=camera, name='CameraFeed', daemon=True)
+    feeder.start()
+    driver.start()
+    time.sleep(args.seconds)
+    stop.set()
+    feeder.join()
+    driver.close()
+    return score(backend.moves, start, args)
+
+
+def score(moves, start, args):
+    # The first moves converge from the first target, skip half a second
+    moves = np.array([m for m in moves if m[0] - start >= 0.5], dtype=np.float64)
+    if len(moves) < 3:
+        return {'updates_hz': 0.0}
+    times, points = moves[:, 0], moves[:, 1:]
+    gaps = np.diff(times) * 1000.0
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    truth = np.array([circle(t - start, args.width, args.height) for t in times])
+    error = np.linalg.norm(points - truth, axis=1)
+    return {
+        'updates_hz': round(len(moves) / (times[-1] - times[0]), 1),
+        'gap_p95_ms': round(float(np.percentile(gaps, 95)), 2),
+        'gap_max_ms': round(float(gaps.max()), 2),
+        'step_rms_px': round(float(np.sqrt(np.mean(steps ** 2))), 2),
+        'step_max_px': round(float(steps.max()), 2),
+        'error_rms_px': round(float(np.sqrt(np.mean(error ** 2))), 2),
+    }
+
+
+def run(args):
+    config = MouseConfig()
+    configs = {
+        'camera_rate': (args.fps, 0.0, 0.0),
+        'display_rate': (args.rate, config.smoothing, config.predict_ms),
+    }
+    return {
+        'seconds': args.seconds,
+        'camera_fps': args.fps,
+        'screen': [args.width, args.height],
+        'configs': {name: run_config(*params, args) for name, params in configs.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Timing and smoothness of the gesture mouse cursor")
+    parser.add_argument('--seconds', type=float, default=3.0, help="run time of every configuration")
+    parser.add_argument('--fps', type=float, default=30.0, help="hand updates per second")
+    parser.add_argument('--rate', type=float, default=MouseConfig().rate_hz, help="cursor thread rate (Hz)")
+    parser.add_argument('--latency-ms', type=float, default=50.0,
+                        help="capture-to-landmarks latency of the simulated pipeline")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--output', metavar='FILE', help="write the JSON report to FILE")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(f"{report['seconds']:.1f} s per configuration, hands at {report['camera_fps']:.0f} Hz")
+    print(f"{'config':<14}{'moves/s':>9}{'gap p95':>9}{'gap max':>9}{'step rms':>10}{'step max':>10}{'error':>8}")
+    for name, r in report['configs'].items():
+        print(f"{name:<14}{r['updates_hz']:>9.1f}{r.get('gap_p95_ms', 0):>9.2f}{r.get('gap_max_ms', 0):>9.2f}"
+              f"{r.get('step_rms_px', 0):>10.2f}{r.get('step_max_px', 0):>10.2f}{r.get('error_rms_px', 0):>8.2f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""
+End-to-end frame pipeline benchmark.
+
+Drives the main.py loop (CameraManager -> GestureEngine -> Painter) plus the
+virtual keyboard rendering and checks the project targets: at least 30 FPS,
+at most 100 ms gesture latency, at most 30% CPU and at most 500 MB RAM.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline_benchmark --headless --frames 600 --output run.json
+    python -m benchmarks.pipeline_benchmark --video clip.mp4 --headless
+    python -m benchmarks.pipeline_benchmark --replay session.lmrec --headless
+
+Without --video or --replay frames are blank and hands come from
+SyntheticHands, so no camera or MediaPipe is needed. --video runs the real
+MediaPipe model on the clip; --video together with --replay feeds the clip's
+frames but the recorded landmarks.
+
+Stage latencies are wall-clock times per frame. Gesture latency is the time
+from frame capture to the painter output being ready (plus the hand-off to
+the display thread when not headless). --display null runs that hand-off
+without a window, so its cost can be measured on machines without one. CPU% is process CPU time over wall time, both for one core and
+normalized over all cores. By default the source is read as fast as the
+pipeline allows, which measures throughput but naturally keeps a core busy;
+pass --fps 30 to pace it like a webcam when checking the CPU and latency
+targets. The exit status is 0 only when every target is met.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import SyntheticHands
+from core.camera_manager import CameraManager
+from core.detection_scheduler import DetectionScheduler
+from core.display import DisplayStage, create_sink
+from core.gesture_engine import GestureEngine
+from core.inference_worker import InferenceWorker
+from core.recorder import BlankCapture, LandmarkRecording, ReplayHands
+from modules.keyboard import VirtualKeyboard
+from modules.painter import Painter
+from utils.logger import tracer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TARGETS = {
+    'fps': 30.0,
+    'latency_p95_ms': 100.0,
+    'cpu_percent': 30.0,
+    'peak_rss_mb': 500.0,
+}
+
+STAGES = ('capture', 'inference', 'painter', 'keyboard', 'display')
+
+
+def percentiles(samples):
+    """Summary (in milliseconds) of a list of durations in seconds."""
+    if not samples:
+        return None
+    ms = np.asarray(samples, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return {
+        'mean': round(float(ms.mean()), 3),
+        'p50': round(float(p50), 3),
+        'p95': round(float(p95), 3),
+        'p99': round(float(p99), 3),
+        'max': round(float(ms.max()), 3),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def open_pipeline(args):
+    """Starts the capture and builds the engine for the chosen source."""
+    # Hands backends are built from picklable factories so that --worker
+    # can create them in the inference process; None means MediaPipe.
+    hands_factory = functools.partial(ReplayHands, args.replay) if args.replay else None
+    if args.video:
+        source = args.video
+    elif args.replay:
+        recording = LandmarkRecording(args.replay)
+        source = BlankCapture(recording.width or args.width, recording.height or args.height,
+                              fps=args.fps, count=len(recording))
+    else:
+        # Paced sources drop frames, so only a throughput run can be counted
+        count = args.frames + args.warmup if args.frames > 0 and not args.fps else None
+        source = BlankCapture(args.width, args.height, fps=args.fps, count=count)
+        hands_factory = functools.partial(SyntheticHands, noise=args.noise)
+
+    # With --fps 0 every frame is processed (throughput); otherwise the
+    # source behaves like a camera and slow frames cause drops.
+    capture = CameraManager(source, mirror=args.video is not None, realtime=args.fps > 0)
+    if not capture.start():
+        raise RuntimeError(f"Could not open video source {args.video}")
+
+    if args.worker:
+        hands = InferenceWorker(capture.width, capture.height, backend_factory=hands_factory,
+                                pipelined=args.worker == 'pipelined')
+    else:
+        hands = hands_factory() if hands_factory else None
+    scheduler = DetectionScheduler() if args.idle_gating else None
+    engine = GestureEngine(hands=hands, inference_scale=args.inference_scale, scheduler=scheduler)
+    return capture, engine
+
+
+def run(args):
+    capture, engine = open_pipeline(args)
+
+    timings = {stage: [] for stage in STAGES}
+    latencies = []
+    painter = keyboard = keyboard_frame = None
+    display = None
+    if not args.headless:
+        display = DisplayStage(create_sink(args.display, 'GesturePro benchmark'))
+        display.start()
+    frames = 0
+    wall_start = cpu_start = None
+    if args.warmup <= 0:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    try:
+        while args.frames <= 0 or frames < args.frames + args.warmup:
+            t0 = time.perf_counter()
+            packet = capture.read_packet()
+            t1 = time.perf_counter()
+            if packet is None:
+                break
+            frame = packet.frame
+
+            if painter is None:
+                height, width = frame.shape[:2]
+                painter = Painter(width, height)
+                keyboard = VirtualKeyboard(width, height)
+                keyboard_frame = np.empty_like(frame)
+
+            results = engine.process_frame(frame, packet.timestamp)
+            t2 = time.perf_counter()
+            # Both modules draw on the camera frame, give the keyboard its own
+            np.copyto(keyboard_frame, frame)
+            output = painter.update(frame, results, engine)
+            t3 = time.perf_counter()
+            keyboard.update(keyboard_frame, results, engine)
+            t4 = time.perf_counter()
+            if display is not None:
+                display.submit(output)
+                if not display.handle_keys():
+                    break
+            t5 = time.perf_counter()
+
+            frames += 1
+            if frames == args.warmup:
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+            if frames <= args.warmup:
+                continue
+
+            timings['capture'].append(t1 - t0)
+            timings['inference'].append(t2 - t1)
+            timings['painter'].append(t3 - t2)
+            timings['keyboard'].append(t4 - t3)
+            if not args.headless:
+                timings['display'].append(t5 - t4)
+            latencies.append((t5 if not args.headless else t3) - packet.timestamp)
+
+        wall = time.perf_counter() - wall_start if wall_start is not None else 0.0
+        cpu = time.process_time() - cpu_start if cpu_start is not None else 0.0
+    finally:
+        capture.stop()
+        engine.close()
+        if display is not None:
+            display.close()
+
+    measured = len(latencies)
+    cores = os.cpu_count() or 1
+    fps = measured / wall if wall > 0 else 0.0
+    cpu_percent = 100.0 * cpu / wall if wall > 0 else 0.0
+    latency = percentiles(latencies)
+    rss = peak_rss_mb()
+
+    report = {
+        'config': {
+            'source': args.video or args.replay or 'synthetic',
+            'hands': 'replay' if args.replay else ('mediapipe' if args.video else 'synthetic'),
+            'resolution': [painter.frame_width, painter.frame_height] if painter else None,
+            'source_fps': args.fps,
+            'inference_scale': args.inference_scale,
+            'idle_gating': args.idle_gating,
+            'worker': args.worker,
+            'headless': args.headless,
+            'display': None if args.headless else args.display,
+            'warmup_frames': args.warmup,
+        },
+        'system': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': cores,
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+        },
+        'frames': measured,
+        'duration_s': round(wall, 3),
+        'fps': round(fps, 2),
+        'stages_ms': {stage: percentiles(samples) for stage, samples in timings.items() if samples},
+        'latency_ms': latency,
+        'cpu_percent': round(cpu_percent, 1),
+        'cpu_percent_all_cores': round(cpu_percent / cores, 1),
+        'peak_rss_mb': round(rss, 1) if rss is not None else None,
+        'capture': capture.stats(),
+        'display': display.stats() if display is not None else None,
+        'scheduler': engine.scheduler.stats() if engine.scheduler is not None else None,
+    }
+    report['targets'] = check_targets(report)
+    return report
+
+
+def check_targets(report):
+    """Compares a report against TARGETS; a value of None is never met."""
+    values = {
+        'fps': report['fps'],
+        'latency_p95_ms': report['latency_ms']['p95'] if report['latency_ms'] else None,
+        'cpu_percent': report['cpu_percent_all_cores'],
+        'peak_rss_mb': report['peak_rss_mb'],
+    }
+    checks = {}
+    for name, target in TARGETS.items():
+        value = values[name]
+        if value is None:
+            ok = False
+        elif name == 'fps':
+            ok = value >= target
+        else:
+            ok = value <= target
+        checks[name] = {'target': target, 'value': value, 'ok': ok}
+    return checks
+
+
+def print_report(report, out=sys.stdout):
+    print(f"Frames: {report['frames']} in {report['duration_s']} s "
+          f"({report['config']['source']}, hands: {report['config']['hands']})", file=out)
+    print(f"{'stage':<10} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)", file=out)
+    rows = dict(report['stages_ms'])
+    if report['latency_ms']:
+        rows['latency'] = report['latency_ms']
+    for stage, stats in rows.items():
+        print(f"{stage:<10} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f} "
+              f"{stats['max']:>8.2f}", file=out)
+    for name, check in report['targets'].items():
+        status = 'OK  ' if check['ok'] else 'FAIL'
+        print(f"[{status}] {name}: {check['value']} (target {check['target']})", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GesturePro end-to-end pipeline benchmark")
+    parser.add_argument('--video', metavar='FILE',
+                        help="video file to process (runs MediaPipe unless --replay is given)")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="recorded landmarks to use instead of MediaPipe")
+    parser.add_argument('--frames', type=int, default=300,
+                        help="frames to measure after warm-up (0 = until the source ends)")
+    parser.add_argument('--warmup', type=int, default=30,
+                        help="frames processed before measuring starts")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fps', type=float, default=0,
+                        help="pace the source like a camera at this rate (0 = as fast as possible)")
+    parser.add_argument('--noise', type=float, default=0.0,
+                        help="landmark jitter of the synthetic hand (normalized units)")
+    parser.add_argument('--inference-scale', type=float, default=1.0)
+    parser.add_argument('--idle-gating', action='store_true',
+                        help="skip detection on idle frames (DetectionScheduler)")
+    parser.add_argument('--worker', nargs='?', const='sync', choices=('sync', 'pipelined'),
+                        help="run inference in a worker process (pipelined: overlap with rendering)")
+    parser.add_argument('--headless', action='store_true',
+                        help="no display stage at all (for build machines)")
+    parser.add_argument('--display', metavar='SINK', default='window',
+                        help="display sink when not headless: window, null, queue or pipe:PATH")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="also write a Chrome/Perfetto trace of every stage to FILE")
+    parser.add_argument('--output', metavar='FILE',
+                        help="write the JSON report to FILE ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        tracer.enable()
+    try:
+        report = run(args)
+    finally:
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+            tracer.disable()
+            tracer.clear()
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Report written to {args.output}")
+    return 0 if all(check['ok'] for check in report['targets'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
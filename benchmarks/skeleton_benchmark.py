@@ -0,0 +1,113 @@
+"""
+Cost of drawing hand skeletons (ui.skeleton) per frame.
+
+Every renderer draws the same synthetic hands onto a camera-sized frame:
+
+    per_call    what mp.solutions.drawing_utils.draw_landmarks does: a
+                Python loop with one OpenCV call per connection and one per
+                landmark (reimplemented, so it runs without MediaPipe, and
+                drawing the same pixels as the vectorized renderer)
+    mediapipe   drawing_utils itself, when MediaPipe's solutions API is
+                installed
+    vectorized  SkeletonRenderer: one cv2.polylines for the bones, one for
+                the joints
+    off         SkeletonRenderer with the 'off' style
+
+Run from the repository root:
+
+    python -m benchmarks.skeleton_benchmark
+    python -m benchmarks.skeleton_benchmark --hands 2 --frames 2000 --output skeleton.json
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.gesture_engine import mediapipe_solutions
+from core.landmarks import results_from_arrays
+from ui.skeleton import HAND_CONNECTIONS, STYLES, SkeletonRenderer
+
+
+def per_call(frame, hands, style=STYLES['default']):
+    """The drawing_utils algorithm, one OpenCV call per landmark and connection."""
+    height, width = frame.shape[:2]
+    scale = np.array([width, height], dtype=np.float32)
+    for landmarks in hands:
+        points = [tuple(point) for point in (landmarks[:, :2] * scale).astype(np.int32).tolist()]
+        for a, b in HAND_CONNECTIONS.tolist():
+            cv2.line(frame, points[a], points[b], style.connection_color, style.thickness, style.line_type)
+        for point in points:
+            # A zero-length thick line is the filled dot SkeletonRenderer draws
+            cv2.line(frame, point, point, style.landmark_color, 2 * style.radius + 1, style.line_type)
+
+
+def renderers():
+    """{name: draw(frame, hands)} of the renderers available here."""
+    vectorized = SkeletonRenderer()
+    off = SkeletonRenderer('off')
+    result = {
+        'per_call': per_call,
+        'vectorized': vectorized.draw,
+        'off': off.draw,
+    }
+    solutions = mediapipe_solutions()
+    if solutions:
+        drawing, connections = solutions.drawing_utils, solutions.hands.HAND_CONNECTIONS
+
+        def mediapipe(frame, hands):
+            for source in results_from_arrays(hands).multi_hand_landmarks:
+                drawing.draw_landmarks(frame, source, connections)
+        result['mediapipe'] = mediapipe
+    return result
+
+
+def run(args):
+    hands = np.stack([hand_pose(POSE_DRAW, 0.3 + 0.4 * i, 0.8, 1.5) for i in range(args.hands)])
+    frame = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+    results = {}
+    for name, draw in renderers().items():
+        for _ in range(20):
+            draw(frame, hands)
+        times = np.empty(args.frames)
+        for i in range(args.frames):
+            start = time.perf_counter()
+            draw(frame, hands)
+            times[i] = time.perf_counter() - start
+        times *= 1e6
+        results[name] = {
+            'mean_us': round(float(times.mean()), 1),
+            'p95_us': round(float(np.percentile(times, 95)), 1),
+        }
+    return {
+        'frames': args.frames,
+        'hands': args.hands,
+        'resolution': [args.width, args.height],
+        'renderers': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-frame cost of hand skeleton drawing")
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--hands', type=int, default=1)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--output', metavar='FILE', help="write the JSON report to FILE")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(f"{report['frames']} frames, {report['hands']} hand(s) at {args.width}x{args.height}")
+    print(f"{'renderer':<12}{'mean us':>10}{'p95 us':>10}")
+    for name, r in report['renderers'].items():
+        print(f"{name:<12}{r['mean_us']:>10.1f}{r['p95_us']:>10.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
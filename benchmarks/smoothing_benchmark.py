@@ -0,0 +1,159 @@
+"""
+Jitter versus lag of the landmark filters in utils.smoothing.
+
+Every filter configuration is run over the same landmark stream, either a
+recording made with main.py --record or a synthetic hand path with added
+noise, and scored on the index fingertip in pixels:
+
+    jitter   RMS of the second difference of the output (frame-to-frame
+             shake; a perfectly smooth path scores close to 0)
+    lag      time shift (ms) that best aligns the output with the reference
+             path; negative means the output runs ahead (prediction)
+    error    RMS distance to the reference (the noise-free path for synthetic
+             streams, the raw input for recordings)
+    cost     filter time per frame in microseconds
+
+Run from the repository root:
+
+    python -m benchmarks.smoothing_benchmark
+    python -m benchmarks.smoothing_benchmark --recording session.lmrec --output smoothing.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import SyntheticHands
+from core.landmarks import INDEX_FINGER_TIP
+from core.recorder import LandmarkRecording
+from utils.smoothing import KalmanFilter, OneEuroFilter
+
+CONFIGS = {
+    'raw': None,
+    'one_euro': OneEuroFilter,
+    'one_euro_smooth': lambda: OneEuroFilter(min_cutoff=0.5, beta=5.0),
+    'one_euro_predict_33ms': OneEuroFilter,
+    'kalman': KalmanFilter,
+    'kalman_smooth': lambda: KalmanFilter(process_noise=0.5, measurement_noise=0.01),
+    'kalman_predict_33ms': KalmanFilter,
+}
+# Prediction horizon (s) of the configurations that extrapolate
+PREDICT = {'one_euro_predict_33ms': 0.033, 'kalman_predict_33ms': 0.033}
+
+
+def synthetic_stream(frames, fps, noise, seed=0):
+    """(timestamps, noisy landmarks, clean landmarks) of one moving hand."""
+    source = SyntheticHands(period=150, draw_frames=frames, idle_frames=0, empty_frames=0)
+    clean = np.stack([source.landmarks(i)[0] for i in range(frames)])
+    rng = np.random.default_rng(seed)
+    noisy = clean + rng.normal(0, noise, clean.shape).astype(np.float32)
+    timestamps = np.arange(frames) / fps
+    return timestamps, noisy, clean
+
+
+def recorded_stream(path):
+    """(timestamps, landmarks, None) of the longest run with a hand in a recording."""
+    recording = LandmarkRecording(path)
+    present = recording.records['num_hands'] > 0
+    best_start = best_len = start = 0
+    for i, has_hand in enumerate(np.append(present, False)):
+        if not has_hand:
+            if i - start > best_len:
+                best_start, best_len = start, i - start
+            start = i + 1
+    if best_len < 3:
+        raise ValueError(f"{path} has no run of frames with a hand")
+    span = slice(best_start, best_start + best_len)
+    landmarks = np.array(recording.records['landmarks'][span, 0])
+    timestamps = np.array(recording.timestamps[span], dtype=np.float64)
+    return timestamps, landmarks, None
+
+
+def run_filter(make_filter, timestamps, landmarks, predict=0.0):
+    """Filtered (N, 21, 3) stream and mean time per frame in seconds."""
+    if make_filter is None:
+        return landmarks.copy(), 0.0
+    landmark_filter = make_filter()
+    out = np.empty_like(landmarks)
+    start = time.perf_counter()
+    for i in range(len(landmarks)):
+        landmark_filter(landmarks[i], timestamps[i])
+        out[i] = landmark_filter.predict(predict) if predict else landmark_filter.x
+    return out, (time.perf_counter() - start) / len(landmarks)
+
+
+def best_lag(timestamps, output, reference, max_lag=0.2, step=0.001):
+    """Shift (s) that minimizes the distance between output(t) and reference(t - shift)."""
+    best, best_error = 0.0, np.inf
+    inner = slice(len(timestamps) // 10, len(timestamps) - len(timestamps) // 10)
+    t = timestamps[inner]
+    for shift in np.arange(-max_lag, max_lag + step, step):
+        shifted = np.stack([np.interp(t - shift, timestamps, reference[:, k]) for k in range(2)], axis=1)
+        error = np.mean(np.sum((output[inner] - shifted) ** 2, axis=1))
+        if error < best_error:
+            best, best_error = shift, error
+    return best
+
+
+def score(timestamps, output, reference, width, height):
+    scale = np.array([width, height])
+    tip = output[:, INDEX_FINGER_TIP, :2] * scale
+    ref = reference[:, INDEX_FINGER_TIP, :2] * scale
+    second_diff = tip[2:] - 2 * tip[1:-1] + tip[:-2]
+    return {
+        'jitter_px': float(np.sqrt(np.mean(np.sum(second_diff ** 2, axis=1)))),
+        'lag_ms': round(float(best_lag(timestamps, tip, ref)) * 1000.0, 1),
+        'error_px': float(np.sqrt(np.mean(np.sum((tip - ref) ** 2, axis=1)))),
+    }
+
+
+def run(args):
+    if args.recording:
+        timestamps, landmarks, clean = recorded_stream(args.recording)
+        recording = LandmarkRecording(args.recording)
+        width, height = recording.width or args.width, recording.height or args.height
+    else:
+        timestamps, landmarks, clean = synthetic_stream(args.frames, args.fps, args.noise)
+        width, height = args.width, args.height
+    reference = clean if clean is not None else landmarks
+
+    results = {}
+    for name, make_filter in CONFIGS.items():
+        output, cost = run_filter(make_filter, timestamps, landmarks, PREDICT.get(name, 0.0))
+        results[name] = score(timestamps, output, reference, width, height)
+        results[name]['cost_us'] = round(cost * 1e6, 1)
+    return {
+        'source': args.recording or 'synthetic',
+        'frames': len(timestamps),
+        'resolution': [width, height],
+        'noise': None if args.recording else args.noise,
+        'filters': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jitter vs. lag of the landmark filters")
+    parser.add_argument('--recording', metavar='FILE', help="landmark recording to use")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--noise', type=float, default=0.003,
+                        help="landmark noise of the synthetic stream (normalized units)")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--output', metavar='FILE', help="write the JSON report to FILE")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(f"{report['source']}: {report['frames']} frames")
+    print(f"{'filter':<24}{'jitter px':>10}{'lag ms':>9}{'error px':>10}{'cost us':>9}")
+    for name, r in report['filters'].items():
+        print(f"{name:<24}{r['jitter_px']:>10.2f}{r['lag_ms']:>9.1f}{r['error_px']:>10.2f}{r['cost_us']:>9.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Synthetic hand motion for benchmarks.
+
+SyntheticHands is a drop-in replacement for mp.solutions.hands.Hands that
+moves one hand along a smooth Lissajous path and cycles through a drawing
+pose (index finger up), a fist and no hand at all, so every painter branch
+gets exercised without a camera or MediaPipe.
+"""
+import math
+
+import numpy as np
+
+from core.landmarks import NUM_LANDMARKS, results_from_arrays
+
+# Open hand relative to the wrist, in normalized frame units (y grows down).
+# Rows follow the MediaPipe landmark numbering.
+_OPEN_HAND = np.array([
+    (0.00, 0.00),                                                  # wrist
+    (-0.08, -0.03), (-0.13, -0.07), (-0.17, -0.10), (-0.21, -0.12),  # thumb
+    (-0.06, -0.15), (-0.06, -0.21), (-0.06, -0.25), (-0.06, -0.28),  # index
+    (-0.02, -0.15), (-0.02, -0.21), (-0.02, -0.25), (-0.02, -0.28),  # middle
+    (0.02, -0.15), (0.02, -0.21), (0.02, -0.25), (0.02, -0.28),      # ring
+    (0.06, -0.15), (0.06, -0.21), (0.06, -0.25), (0.06, -0.28),      # pinky
+], dtype=np.float32)
+
+# Curled finger: DIP and tip fold back below the PIP joint
+_CURLED_Y = np.array([-0.19, -0.15, -0.13], dtype=np.float32)
+
+
+def hand_pose(fingers, x, y, size=1.0):
+    """
+    (21, 3) landmarks of a hand whose wrist sits at normalized (x, y).
+    fingers is a sequence of five booleans in FINGER_NAMES order.
+    """
+    pose = _OPEN_HAND.copy()
+    if not fingers[0]:
+        pose[3] = (-0.12, -0.10)
+        pose[4] = (-0.11, -0.11)
+    for finger in range(1, 5):
+        if not fingers[finger]:
+            base = 1 + 4 * finger
+            pose[base + 1:base + 4, 1] = _CURLED_Y
+    landmarks = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[:, :2] = pose * size + (x, y)
+    return landmarks
+
+
+POSE_DRAW = (False, True, False, False, False)
+POSE_FIST = (False, False, False, False, False)
+
+
+class SyntheticHands:
+    """
+    Generates hand results frame by frame. The cycle is draw_frames of
+    drawing, idle_frames of a fist and empty_frames without a hand; noise is
+    the standard deviation of Gaussian jitter added to every landmark.
+    """
+    def __init__(self, period=240, draw_frames=60, idle_frames=20, empty_frames=20,
+                 noise=0.0, seed=0):
+        self.period = period
+        self.draw_frames = draw_frames
+        self.idle_frames = idle_frames
+        self.empty_frames = empty_frames
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+
+    def landmarks(self, index):
+        """Noise-free (N, 21, 3) landmarks of frame index."""
+        phase = index % (self.draw_frames + self.idle_frames + self.empty_frames)
+        if phase >= self.draw_frames + self.idle_frames:
+            return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        pose = POSE_DRAW if phase < self.draw_frames else POSE_FIST
+        t = 2 * math.pi * index / self.period
+        x = 0.5 + 0.25 * math.sin(t)
+        y = 0.75 + 0.1 * math.sin(2 * t)
+        return hand_pose(pose, x, y, size=0.8)[None]
+
+    def process(self, rgb_frame=None):
+        landmarks = self.landmarks(self.position)
+        self.position += 1
+        if self.noise and len(landmarks):
+            landmarks = landmarks + self.rng.normal(0, self.noise, landmarks.shape).astype(np.float32)
+        return results_from_arrays(landmarks, ['Right'] * len(landmarks), [0.95] * len(landmarks))
+
+    def close(self):
+        pass
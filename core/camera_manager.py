@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+
+from utils.logger import tracer
+
+# A captured frame together with its capture timestamp (time.perf_counter)
+# and its sequence number in the source stream.
+FramePacket = namedtuple('FramePacket', ['frame', 'timestamp', 'index'])
+
+
+class CameraManager:
+    """
+    Threaded capture stage.
+
+    A background reader thread pulls frames from the camera (or a video file)
+    into a small ring buffer so that a slow consumer never waits on the driver
+    and never receives stale, queued-up frames: read() always returns the
+    newest frame. Frames overwritten before anyone read them are counted as
+    dropped, frames that were already older than one frame interval when they
+    were handed out are counted as late.
+
+    source may be a camera index, a path to a video file or any object with
+    a cv2.VideoCapture-like read() method. A numeric string such as "0"
+    is a camera index.
+    """
+    def __init__(self, source=0, width=None, height=None, fps=None,
+                 buffer_size=2, mirror=False, realtime=True, loop=False):
+        if isinstance(source, str) and source.strip().isdigit():
+            source = int(source)
+        self.source = source
+        self.requested_width = width
+        self.requested_height = height
+        self.requested_fps = fps
+        self.buffer_size = max(1, buffer_size)
+        self.mirror = mirror
+        self.is_file = isinstance(source, str)
+        # Files and custom sources can be paced like a camera (latest frame
+        # wins) or read as fast as the consumer takes them, without losing
+        # frames. Webcams are always realtime.
+        self.realtime = realtime or not (self.is_file or hasattr(source, 'read'))
+        self.loop = loop
+
+        self.width = 0
+        self.height = 0
+        self.fps = 0.0
+
+        self._cap = None
+        self._thread = None
+        self._running = False
+        self._finished = False
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._last_index = -1
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self.frames_late = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        """Opens the source and starts the reader thread."""
+        if self._running:
+            return True
+
+        if hasattr(self.source, 'read'):
+            self._cap = self.source
+        else:
+            self._cap = cv2.VideoCapture(self.source)
+            if not self._cap.isOpened():
+                self._cap = None
+                return False
+            if not self.is_file:
+                if self.requested_width:
+                    self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.requested_width)
+                if self.requested_height:
+                    self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.requested_height)
+                if self.requested_fps:
+                    self._cap.set(cv2.CAP_PROP_FPS, self.requested_fps)
+                # Keep the driver queue as short as possible, we buffer ourselves
+                self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.fps = self._query_fps()
+        self.width, self.height = self._query_size()
+
+        self._running = True
+        self._finished = False
+        self._thread = threading.Thread(target=self._reader_loop, name='CameraManager', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stops the reader thread and releases the source."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._cap is not None and hasattr(self._cap, 'release'):
+            self._cap.release()
+        self._cap = None
+
+    release = stop
+
+    def is_opened(self):
+        """True while frames can still be read."""
+        with self._cond:
+            return self._running and (not self._finished or len(self._buffer) > 0)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def read_packet(self, timeout=1.0):
+        """
+        Returns the next FramePacket, or None when the stream has ended or no
+        frame arrived within timeout seconds.
+        """
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while not self._buffer:
+                if self._finished or not self._running:
+                    return None
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+            if self.realtime:
+                # Latest frame wins, everything older is thrown away
+                packet = self._buffer.pop()
+                self.frames_dropped += len(self._buffer)
+                self._buffer.clear()
+            else:
+                packet = self._buffer.popleft()
+                self._cond.notify_all()
+
+        self.frames_read += 1
+        if self.realtime and self.fps > 0:
+            if time.perf_counter() - packet.timestamp > 1.0 / self.fps:
+                self.frames_late += 1
+        self._last_index = packet.index
+        return packet
+
+    def read(self, timeout=1.0):
+        """cv2.VideoCapture-compatible read(): returns (ret, frame)."""
+        packet = self.read_packet(timeout)
+        if packet is None:
+            return False, None
+        return True, packet.frame
+
+    def stats(self):
+        """Returns a snapshot of the capture counters."""
+        with self._cond:
+            buffered = len(self._buffer)
+        return {
+            'captured': self.frames_captured,
+            'read': self.frames_read,
+            'dropped': self.frames_dropped,
+            'late': self.frames_late,
+            'buffered': buffered,
+        }
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def _reader_loop(self):
+        frame_interval = 1.0 / self.fps if (self.is_file and self.realtime and self.fps > 0) else 0.0
+        next_frame_time = time.perf_counter()
+        index = 0
+
+        while self._running:
+            with tracer.span('capture.read'):
+                ret, frame = self._cap.read()
+            if not ret:
+                if self.is_file and self.loop and index > 0:
+                    self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                break
+
+            if self.mirror:
+                with tracer.span('capture.flip'):
+                    frame = cv2.flip(frame, 1)
+
+            if frame_interval:
+                # Pace file playback like a real camera would
+                next_frame_time += frame_interval
+                delay = next_frame_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame_time = time.perf_counter()
+
+            packet = FramePacket(frame, time.perf_counter(), index)
+            index += 1
+
+            with self._cond:
+                if self.realtime:
+                    if len(self._buffer) >= self.buffer_size:
+                        self._buffer.popleft()
+                        self.frames_dropped += 1
+                else:
+                    while self._running and len(self._buffer) >= self.buffer_size:
+                        self._cond.wait()
+                    if not self._running:
+                        break
+                self._buffer.append(packet)
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def _query_fps(self):
+        fps = 0.0
+        if hasattr(self._cap, 'get'):
+            fps = self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+        if fps <= 0 or fps > 1000:
+            fps = float(self.requested_fps or 30)
+        return fps
+
+    def _query_size(self):
+        width = height = 0
+        if hasattr(self._cap, 'get'):
+            width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+            height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        if not width or not height:
+            width = self.requested_width or 0
+            height = self.requested_height or 0
+        return width, height
@@ -0,0 +1,175 @@
+"""
+Typed, hot-reloadable configuration (config.yaml).
+
+The YAML file is parsed once into immutable named tuples, one per section,
+so the frame loop reads plain attributes (config.camera.width) instead of
+looking up nested dicts. Values are converted to the type of their default
+and bad values raise ValueError naming the offending key.
+
+ConfigManager.poll() is called at frame boundaries. It looks at the file's
+modification time at most every poll_interval seconds and, when the file
+changed, parses it and returns the new Config; the caller then applies only
+the sections that differ (see changed_sections), so editing a gesture
+threshold never restarts the camera or reloads the model. A file that fails
+to parse is reported and the previous configuration stays in effect.
+"""
+import os
+import time
+from collections import namedtuple
+
+import yaml
+
+from core.landmarks import PINCH_THRESHOLD
+
+CameraConfig = namedtuple('CameraConfig', ['index', 'width', 'height', 'fps'],
+                          defaults=(0, 1280, 720, 30))
+DetectionConfig = namedtuple('DetectionConfig', ['max_hands', 'min_detection_confidence',
+                                                 'min_tracking_confidence', 'inference_scale',
+                                                 'roi_tracking', 'roi_margin'],
+                             defaults=(2, 0.7, 0.7, 1.0, False, 0.3))
+RecognitionConfig = namedtuple('RecognitionConfig', ['pinch_threshold', 'swipe_window', 'swipe_distance',
+                                                     'swipe_speed', 'swipe_cooldown', 'swipe_early_distance',
+                                                     'swipe_early_speed'],
+                               defaults=(PINCH_THRESHOLD, 0.4, 0.2, 0.8, 0.6, 0.12, 1.2))
+SmoothingConfig = namedtuple('SmoothingConfig', ['filter', 'predict_ms'], defaults=('one_euro', 0.0))
+MouseConfig = namedtuple('MouseConfig', ['sensitivity', 'smoothing', 'rate_hz', 'predict_ms',
+                                         'dead_zone', 'precision_scale'],
+                         defaults=(1.5, 0.7, 120.0, 80.0, 0.1, 0.3))
+DisplayConfig = namedtuple('DisplayConfig', ['skeleton'], defaults=('default',))
+GestureBinding = namedtuple('GestureBinding', ['name', 'action'])
+
+Config = namedtuple('Config', ['camera', 'detection', 'recognition', 'smoothing', 'mouse', 'display',
+                               'gestures'])
+
+SECTIONS = {
+    'camera': CameraConfig,
+    'detection': DetectionConfig,
+    'recognition': RecognitionConfig,
+    'smoothing': SmoothingConfig,
+    'mouse': MouseConfig,
+    'display': DisplayConfig,
+}
+
+DEFAULT_CONFIG = Config(*(cls() for cls in SECTIONS.values()), gestures=())
+
+
+def _convert(value, default, key):
+    """Converts value to the type of default."""
+    kind = type(default)
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"{key}: expected true or false, got {value!r}")
+        return value
+    if kind in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key}: expected a number, got {value!r}")
+        if kind is int and value != int(value):
+            raise ValueError(f"{key}: expected an integer, got {value!r}")
+        return kind(value)
+    if not isinstance(value, str):
+        raise ValueError(f"{key}: expected a string, got {value!r}")
+    return value
+
+
+def _section(cls, data, name):
+    if data is None:
+        return cls()
+    if not isinstance(data, dict):
+        raise ValueError(f"{name}: expected a mapping, got {data!r}")
+    unknown = set(data) - set(cls._fields)
+    if unknown:
+        raise ValueError(f"{name}: unknown keys {sorted(unknown)}, expected {list(cls._fields)}")
+    defaults = cls()
+    return cls(**{key: _convert(value, getattr(defaults, key), f"{name}.{key}")
+                  for key, value in data.items()})
+
+
+def _gestures(data):
+    if data is None:
+        return ()
+    if not isinstance(data, list):
+        raise ValueError(f"gestures: expected a list, got {data!r}")
+    bindings = []
+    for i, item in enumerate(data):
+        if not isinstance(item, dict) or set(item) != {'name', 'action'}:
+            raise ValueError(f"gestures[{i}]: expected name and action, got {item!r}")
+        bindings.append(GestureBinding(str(item['name']), str(item['action'])))
+    return tuple(bindings)
+
+
+def parse_config(text):
+    """Config from the text of a YAML file; missing sections and keys get defaults."""
+    data = yaml.safe_load(text) or {}
+    if not isinstance(data, dict):
+        raise ValueError("config: expected a mapping at the top level")
+    unknown = set(data) - set(SECTIONS) - {'gestures'}
+    if unknown:
+        raise ValueError(f"config: unknown sections {sorted(unknown)}")
+    sections = {name: _section(cls, data.get(name), name) for name, cls in SECTIONS.items()}
+    return Config(gestures=_gestures(data.get('gestures')), **sections)
+
+
+def load_config(path):
+    """Config from a YAML file, or the defaults when it does not exist."""
+    if not os.path.exists(path):
+        return DEFAULT_CONFIG
+    with open(path, encoding='utf-8') as f:
+        return parse_config(f.read())
+
+
+def changed_sections(old, new):
+    """Names of the sections that differ between two Configs."""
+    return [name for name in Config._fields if getattr(old, name) != getattr(new, name)]
+
+
+class ConfigManager:
+    """
+    Holds the current Config and reloads it when the file changes.
+
+    poll_interval   seconds between checks of the file's modification time
+    """
+    def __init__(self, path, poll_interval=1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.config = load_config(path)
+        self.error = None
+        self.reloads = 0
+        self.last_reload_ms = None
+        self._stamp = self._file_stamp()
+        self._next_check = time.perf_counter() + poll_interval
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self, now=None):
+        """
+        Reloads the file if it changed. Returns the new Config, or None when
+        nothing changed (or the new file is invalid; see self.error).
+        """
+        now = time.perf_counter() if now is None else now
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.poll_interval
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        start = time.perf_counter()
+        try:
+            config = load_config(self.path)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            self.error = e
+            print(f"Config {self.path} not applied: {e}")
+            return None
+        self.error = None
+        self.last_reload_ms = (time.perf_counter() - start) * 1000.0
+        if config == self.config:
+            return None
+        self.config = config
+        self.reloads += 1
+        return config
@@ -0,0 +1,146 @@
+"""
+Idle-aware gating of hand detection.
+
+While a hand is tracked every frame goes through MediaPipe. Once no hand has
+been seen for a few detections the scheduler goes idle: each frame is shrunk
+to a tiny grayscale probe and compared with the previous one, and full
+detection only runs when enough of the probe changed or every
+idle_interval-th frame. A hand entering the picture moves, so it is usually
+picked up on the very frame it appears; a hand that sneaks in without
+motion is found by the periodic check at most idle_interval - 1 frames late.
+"""
+import time
+
+import cv2
+import numpy as np
+
+from utils.logger import tracer
+
+
+class DetectionScheduler:
+    """
+    Decides per frame whether GestureEngine runs detection.
+
+    idle_after          detections without a hand before going idle
+    idle_interval       while idle, detect at least every idle_interval frames
+    probe_width         width in pixels of the motion probe
+    pixel_threshold     gray level change that counts a probe pixel as moving
+    motion_threshold    fraction of moving probe pixels that wakes detection up
+    """
+    def __init__(self, idle_after=3, idle_interval=6, probe_width=64,
+                 pixel_threshold=20, motion_threshold=0.01):
+        self.idle_after = max(1, idle_after)
+        self.idle_interval = max(1, idle_interval)
+        self.probe_width = probe_width
+        self.pixel_threshold = pixel_threshold
+        self.motion_threshold = motion_threshold
+
+        self.idle = False
+        self.misses = 0
+        self.last_motion = 0.0
+        self._probe = None
+        self._previous = None
+        self._diff = None
+        self._since_detection = 0
+        self._first_skipped_time = None
+        self._skipped_run = 0
+        self._skipped_start = None
+
+        # Metrics
+        self.frames = 0
+        self.detections = 0
+        self.skipped = 0
+        self.idle_frames = 0
+        self.motion_wakes = 0
+        self.wake_latencies = []
+        self.wake_latency_frames = []
+
+    def should_detect(self, frame, timestamp=None):
+        """True when detection has to run on this frame."""
+        self.frames += 1
+        if not self.idle:
+            self._previous = None
+            return self._detect()
+
+        self.idle_frames += 1
+        with tracer.span('engine.motion_probe'):
+            moving = self._motion(frame)
+        if moving:
+            self.motion_wakes += 1
+            return self._detect()
+        if self._since_detection + 1 >= self.idle_interval:
+            return self._detect()
+
+        self._since_detection += 1
+        self.skipped += 1
+        if self._first_skipped_time is None:
+            self._first_skipped_time = time.perf_counter() if timestamp is None else timestamp
+        return False
+
+    def update(self, hand_found, timestamp=None):
+        """Reports the outcome of a detection requested by should_detect()."""
+        if hand_found:
+            if self.idle:
+                # Worst case: the hand was there since the first skipped frame
+                self.wake_latency_frames.append(self._skipped_run)
+                if self._skipped_start is not None:
+                    now = time.perf_counter() if timestamp is None else timestamp
+                    self.wake_latencies.append(now - self._skipped_start)
+                else:
+                    self.wake_latencies.append(0.0)
+            self.idle = False
+            self.misses = 0
+        else:
+            self.misses += 1
+            if self.misses >= self.idle_after:
+                self.idle = True
+
+    def _detect(self):
+        # Remember the skipped run that this detection ends, for update()
+        self._skipped_run = self._since_detection
+        self._skipped_start = self._first_skipped_time
+        self._since_detection = 0
+        self._first_skipped_time = None
+        self.detections += 1
+        return True
+
+    def _motion(self, frame):
+        """Updates the probe and tells whether enough of it changed."""
+        height, width = frame.shape[:2]
+        probe_height = max(1, round(height * self.probe_width / width))
+        if self._probe is None or self._probe.shape != (probe_height, self.probe_width):
+            self._probe = np.empty((probe_height, self.probe_width), dtype=np.uint8)
+            self._previous = None
+            self._diff = np.empty_like(self._probe)
+
+        small = cv2.resize(frame, (self.probe_width, probe_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._probe)
+        else:
+            self._probe[...] = small
+
+        if self._previous is None:
+            self._previous = self._probe.copy()
+            self.last_motion = 0.0
+            return False
+
+        cv2.absdiff(self._probe, self._previous, dst=self._diff)
+        self._probe, self._previous = self._previous, self._probe
+        self.last_motion = np.count_nonzero(self._diff > self.pixel_threshold) / self._diff.size
+        return self.last_motion >= self.motion_threshold
+
+    def stats(self):
+        """Idle rate and wake-up latency metrics."""
+        latencies = np.asarray(self.wake_latencies, dtype=np.float64) * 1000.0
+        return {
+            'frames': self.frames,
+            'detections': self.detections,
+            'skipped': self.skipped,
+            'skip_rate': self.skipped / self.frames if self.frames else 0.0,
+            'idle_rate': self.idle_frames / self.frames if self.frames else 0.0,
+            'motion_wakes': self.motion_wakes,
+            'wake_ups': len(self.wake_latencies),
+            'wake_latency_ms_mean': float(latencies.mean()) if len(latencies) else None,
+            'wake_latency_ms_max': float(latencies.max()) if len(latencies) else None,
+            'wake_latency_frames_max': max(self.wake_latency_frames) if self.wake_latency_frames else None,
+        }
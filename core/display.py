@@ -0,0 +1,344 @@
+"""
+Threaded display stage and frame sinks.
+
+cv2.imshow + cv2.waitKey in the frame loop block processing on the window
+system's event loop and pace it to the display. DisplayStage is the
+consumer side instead: the frame loop hands every composed frame to
+submit(), which copies it into a triple buffer and returns at once, and a
+display thread shows the most recent frame on a sink at its own pace.
+Frames replaced before the thread got to them are counted as dropped, never
+queued up.
+
+Keys are read by the display thread too (the window sink polls HighGUI
+there, so every HighGUI call stays on one thread). The frame loop runs the
+handlers registered with bind() at a frame boundary by calling
+handle_keys(), so a handler never races with processing.
+
+HighGUI only works on the main thread on macOS, so there the window sink
+is not given a thread: DisplayStage shows each frame and polls for keys
+right inside submit(), on the frame loop's thread, as the old synchronous
+loop did. Sinks say so with main_thread_only.
+
+Sinks have show(frame), poll() -> key code or -1, and close():
+
+    WindowSink  an OpenCV window
+    NullSink    discards frames (headless throughput runs)
+    QueueSink   keeps copies of the newest frames for another consumer
+    PipeSink    writes raw BGR24 frames to a file, FIFO or stdout, e.g.
+                python main.py --display pipe:- | ffplay -f rawvideo
+                    -pixel_format bgr24 -video_size WxH -i -
+                (WxH of the composed frames: the painter's panel adds to
+                the camera height)
+
+create_sink() builds one from a --display argument.
+"""
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from utils.logger import tracer
+
+QUIT_KEYS = (ord('q'), 27)
+
+
+class WindowSink:
+    """Shows frames in an OpenCV window; closing the window quits."""
+    # Cocoa windows can only be driven from the main thread
+    main_thread_only = sys.platform == 'darwin'
+
+    def __init__(self, title='GesturePro'):
+        self.title = title
+        self.closed = False
+        self._shown = False
+
+    def show(self, frame):
+        cv2.imshow(self.title, frame)
+        self._shown = True
+
+    def poll(self):
+        key = cv2.waitKey(1)
+        if self._shown and cv2.getWindowProperty(self.title, cv2.WND_PROP_VISIBLE) < 1:
+            self.closed = True
+        return -1 if key < 0 else key & 0xFF
+
+    def close(self):
+        if self._shown:
+            cv2.destroyWindow(self.title)
+            cv2.waitKey(1)
+            self._shown = False
+
+
+class NullSink:
+    """Discards every frame."""
+    closed = False
+
+    def show(self, frame):
+        pass
+
+    def poll(self):
+        return -1
+
+    def close(self):
+        pass
+
+
+class QueueSink:
+    """
+    Puts a copy of every shown frame into frames, a queue.Queue of at most
+    maxsize frames; when it is full the oldest frame makes room.
+    """
+    closed = False
+
+    def __init__(self, maxsize=2):
+        self.frames = queue.Queue(maxsize)
+
+    def show(self, frame):
+        frame = frame.copy()
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def poll(self):
+        return -1
+
+    def close(self):
+        pass
+
+
+class PipeSink:
+    """
+    Writes frames as raw BGR24 bytes to target: a path (a file or a FIFO
+    made with mkfifo) or a binary stream. The sink closes when the reader
+    goes away.
+    """
+    def __init__(self, target):
+        self._owned = isinstance(target, str)
+        self.stream = open(target, 'wb') if self._owned else target
+        self.closed = False
+
+    def show(self, frame):
+        if self.closed:
+            return
+        try:
+            self.stream.write(np.ascontiguousarray(frame).data)
+            self.stream.flush()
+        except (BrokenPipeError, ValueError, OSError):
+            self.closed = True
+
+    def poll(self):
+        return -1
+
+    def close(self):
+        if self._owned and not self.stream.closed:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+
+
+def create_sink(spec, title='GesturePro'):
+    """
+    Sink from a --display argument: 'window', 'null', 'queue' or
+    'pipe:PATH' ('pipe:-' is stdout; print() output then goes to stderr so
+    it does not end up in the frames).
+    """
+    if spec == 'window':
+        return WindowSink(title)
+    if spec == 'null':
+        return NullSink()
+    if spec == 'queue':
+        return QueueSink()
+    if spec.startswith('pipe:'):
+        target = spec[len('pipe:'):]
+        if target == '-':
+            stream = sys.stdout.buffer
+            sys.stdout = sys.stderr
+            return PipeSink(stream)
+        return PipeSink(target)
+    raise ValueError(f"Unknown display {spec!r}, expected window, null, queue or pipe:PATH")
+
+
+class DisplayStage:
+    """
+    Shows the newest submitted frame on sink from a 'Display' thread.
+
+    max_fps     caps how often a frame is shown (None: every new frame)
+    poll_hz     how often the sink is polled for keys while no frame comes
+    threaded    False shows frames from submit() on the caller's thread;
+                by default only sinks that are main_thread_only are
+    """
+    def __init__(self, sink, max_fps=None, poll_hz=60.0, threaded=None):
+        self.sink = sink
+        self.max_fps = max_fps
+        self.poll_interval = 1.0 / poll_hz
+        if threaded is None:
+            threaded = not getattr(sink, 'main_thread_only', False)
+        self.threaded = threaded
+        # Triple buffer: submit() fills back, the thread shows front and
+        # middle holds the newest frame between the two
+        self._back = self._middle = self._front = None
+        self._fresh = False
+        self._next_show = 0.0
+        self._cond = threading.Condition()
+        self._keys = deque()
+        self._bindings = {}
+        self._thread = None
+        self._running = False
+        self.quit = False
+        self.error = None
+
+        # Counters
+        self.frames_submitted = 0
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.show_time = 0.0
+        # perf_counter when the first frame was shown
+        self.first_shown_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running or not self.threaded:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='Display', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the thread and closes the sink."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.sink.close()
+
+    # ------------------------------------------------------------------
+    # Frame loop side
+    # ------------------------------------------------------------------
+    def submit(self, frame):
+        """Hands over a composed frame; it is copied, so the caller may reuse it."""
+        if not self.threaded:
+            self._submit_now(frame)
+            return
+        with tracer.span('display.submit'):
+            if self._back is None or self._back.shape != frame.shape or self._back.dtype != frame.dtype:
+                self._back = np.empty_like(frame)
+            np.copyto(self._back, frame)
+            with self._cond:
+                self._back, self._middle = self._middle, self._back
+                if self._fresh:
+                    self.frames_dropped += 1
+                self._fresh = True
+                self.frames_submitted += 1
+                self._cond.notify_all()
+
+    def _submit_now(self, frame):
+        """Shows frame (unless max_fps says it is too early) and polls, on this thread."""
+        if self.error is not None:
+            return
+        self.frames_submitted += 1
+        try:
+            if time.perf_counter() >= self._next_show:
+                self._show(frame)
+            else:
+                self.frames_dropped += 1
+            key = self.sink.poll()
+        except Exception as e:
+            self.error = e
+            print(f"Display stopped: {e}")
+            return
+        if key >= 0:
+            self._keys.append(key)
+
+    def bind(self, key, handler):
+        """Runs handler() from handle_keys() when key (a char or key code) is pressed."""
+        self._bindings[ord(key) if isinstance(key, str) else key] = handler
+
+    def keys(self):
+        """Key codes pressed since the last call, oldest first."""
+        keys = []
+        while self._keys:
+            keys.append(self._keys.popleft())
+        return keys
+
+    def handle_keys(self):
+        """
+        Runs the handlers of the keys pressed since the last call. Returns
+        False once the program should stop: Q or ESC was pressed, the
+        window was closed or the sink failed.
+        """
+        for key in self.keys():
+            if key in QUIT_KEYS:
+                self.quit = True
+            elif key in self._bindings:
+                self._bindings[key]()
+        if getattr(self.sink, 'closed', False) or self.error is not None:
+            self.quit = True
+        return not self.quit
+
+    # ------------------------------------------------------------------
+    # Display thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        self._next_show = time.perf_counter()
+        while True:
+            frame = None
+            with self._cond:
+                # Sleep until a frame is due, but wake up to poll for keys
+                now = time.perf_counter()
+                if not self._fresh:
+                    self._cond.wait(self.poll_interval)
+                elif now < self._next_show:
+                    self._cond.wait(min(self.poll_interval, self._next_show - now))
+                if not self._running:
+                    break
+                if self._fresh and time.perf_counter() >= self._next_show:
+                    self._front, self._middle = self._middle, self._front
+                    self._fresh = False
+                    frame = self._front
+            try:
+                if frame is not None:
+                    self._show(frame)
+                key = self.sink.poll()
+            except Exception as e:
+                # e.g. OpenCV built without GUI support
+                self.error = e
+                print(f"Display stopped: {e}")
+                break
+            if key >= 0:
+                self._keys.append(key)
+
+    def _show(self, frame):
+        start = time.perf_counter()
+        with tracer.span('display.show'):
+            self.sink.show(frame)
+        self.show_time += time.perf_counter() - start
+        if self.first_shown_at is None:
+            self.first_shown_at = time.perf_counter()
+        self.frames_shown += 1
+        if self.max_fps:
+            self._next_show = max(self._next_show + 1.0 / self.max_fps, start)
+
+    def stats(self):
+        return {
+            'submitted': self.frames_submitted,
+            'shown': self.frames_shown,
+            'dropped': self.frames_dropped,
+            'show_ms': self.show_time / self.frames_shown * 1000.0 if self.frames_shown else None,
+            'error': None if self.error is None else repr(self.error),
+        }
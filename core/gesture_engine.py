@@ -1,25 +1,284 @@
 import cv2
-import mediapipe as mp
 import math
+import time
+import numpy as np
+
+from core.hand_tracker import HandTracker
+from core.hands_loader import BackgroundHands
+from core.state_machine import ALL_STAGES, FINGERS, LANDMARKS, PINCH, SKELETON, SWIPES
+from core.landmarks import (
+    hands_from_results, fingers_up, fingers_to_dict, landmarks_to_array, results_from_arrays,
+    stack_hands,
+)
+from ui.skeleton import SkeletonRenderer
+from utils.gesture_detector import GestureDetector
+from utils.logger import tracer
+
+_solutions = None
+
+def mediapipe_solutions():
+    """
+    mp.solutions, or None without MediaPipe (replayed sessions and tests).
+    MediaPipe is imported on first use: the import alone takes about half a
+    second, which should not delay the first frame.
+    """
+    global _solutions
+    if _solutions is None:
+        try:
+            import mediapipe as mp
+        except ImportError:
+            mp = None
+        _solutions = getattr(mp, 'solutions', None) or False
+    return _solutions or None
 
 class GestureEngine:
     """
     Central engine for processing hand landmarks and recognizing gestures.
+
+    Inference cost can be cut in two ways, both invisible to callers because
+    landmarks always come back normalized to the full frame:
+      * inference_scale < 1.0 runs MediaPipe on a downscaled copy of the frame;
+      * roi_tracking runs it on a crop around the last known hand and falls
+        back to the whole (scaled) frame when the crop loses the hand. While
+        the crop holds fewer than max_hands hands, the whole frame is also
+        searched every roi_rescan_interval frames, so a new hand entering
+        outside the crop is found.
+
+    hands may be any object with a MediaPipe-like process(rgb_frame), for
+    example core.recorder.ReplayHands; by default MediaPipe Hands is used.
+    With background_load=True the default model is imported, built and
+    warmed up on a core.hands_loader.BackgroundHands thread, and frames
+    processed before it is ready come back without hands.
+    A core.detection_scheduler.DetectionScheduler passed as scheduler skips
+    detection on frames without hand or motion while nobody is gesturing.
+    core.inference_worker.InferenceWorker runs the backend in a separate
+    process. A utils.smoothing.HandSmoother passed as smoother filters the
+    landmarks of detected_hands (recordings and ROI tracking keep the raw
+    ones).
+    Assigning a core.recorder.LandmarkRecorder to recorder records every
+    processed frame. Gestures of every frame are classified by gestures, a
+    utils.gesture_detector.GestureDetector that modules read or subscribe to.
+
+    tracker, a core.hand_tracker.HandTracker, gives every hand a stable
+    Hand.id and detected_hands is ordered by it, so with max_hands > 1
+    per-hand module state follows the same hand from frame to frame.
+
+    stages (see core.state_machine) says which parts of the pipeline run:
+    without LANDMARKS no detection runs at all, the gesture stages are
+    passed on to gestures, and without SKELETON draw_landmarks() draws
+    nothing. Everything runs by default. Skeletons are drawn by skeleton, a
+    ui.skeleton.SkeletonRenderer, whose 'off' style disables them for good.
     """
-    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7):
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
+    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                 inference_scale=1.0, roi_tracking=False, roi_margin=0.3, hands=None,
+                 scheduler=None, smoother=None, background_load=False, roi_rescan_interval=10):
+        self.max_hands = max_hands
+        self.inference_scale = min(max(inference_scale, 0.1), 1.0)
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin
+        self.roi_rescan_interval = max(1, roi_rescan_interval)
+        self.last_roi = None
+        self.roi_misses = 0
+        self.roi_rescans = 0
+        # Crop-only frames since the last full-frame pass
+        self._roi_frames = 0
+        self.scheduler = scheduler
+        self.smoother = smoother
+        self.gestures = GestureDetector()
+        self.tracker = HandTracker()
+        self.stages = ALL_STAGES
+        self.skeleton = SkeletonRenderer()
+        # Hands of the last processed frame as (21, 3) arrays, see core.landmarks
+        self.detected_hands = []
+        self.recorder = None
+
+        # Cost of the per-frame work after inference (tracking, smoothing,
+        # gestures) and the number of hands it was spent on
+        self.post_cost = 0.0
+        self.post_frames = 0
+        self.post_hands = 0
+
+        self.background_load = background_load
+        # Only a model created here can be rebuilt by reload_hands()
+        self.owns_hands = hands is None
+        if hands is None:
+            hands = self._create_hands(max_hands, min_detection_confidence, min_tracking_confidence)
+        self.hands = hands
+
+    @property
+    def mp_hands(self):
+        solutions = mediapipe_solutions()
+        return solutions.hands if solutions else None
+
+    @property
+    def mp_drawing(self):
+        solutions = mediapipe_solutions()
+        return solutions.drawing_utils if solutions else None
+
+    def _create_hands(self, max_hands, min_detection_confidence, min_tracking_confidence):
+        if self.background_load:
+            return BackgroundHands(lambda: self._build_hands(
+                max_hands, min_detection_confidence, min_tracking_confidence))
+        return self._build_hands(max_hands, min_detection_confidence, min_tracking_confidence)
+
+    def _build_hands(self, max_hands, min_detection_confidence, min_tracking_confidence):
+        if self.mp_hands is None:
+            raise ImportError("MediaPipe with the 'solutions' API is required for live hand tracking")
+        return self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=max_hands,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
 
-    def process_frame(self, frame):
-        """Processes an RGB frame and returns the results."""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return self.hands.process(rgb_frame)
+    def reload_hands(self, max_hands, min_detection_confidence, min_tracking_confidence):
+        """
+        Rebuilds the MediaPipe model with new settings. Returns False when
+        the backend was passed in (replay, worker) and cannot be rebuilt.
+        """
+        if not self.owns_hands:
+            return False
+        hands = self._create_hands(max_hands, min_detection_confidence, min_tracking_confidence)
+        self.hands.close()
+        self.hands = hands
+        self.max_hands = max_hands
+        self.tracker.reset()
+        return True
+
+    def set_stages(self, stages):
+        """Runs only the given pipeline stages from the next frame on."""
+        self.stages = frozenset(stages)
+        self.gestures.enable(fingers=FINGERS in self.stages, pinch=PINCH in self.stages,
+                             swipes=SWIPES in self.stages)
+
+    def process_frame(self, frame, timestamp=None):
+        """
+        Processes a BGR frame and returns the results. timestamp is the
+        capture time (time.perf_counter), used for recordings.
+        """
+        height, width = frame.shape[:2]
+        results = None
+
+        if LANDMARKS not in self.stages:
+            # The active mode reads no hands; end the gestures still active
+            if self.detected_hands or self.gestures.active:
+                self.detected_hands = []
+                self.gestures.update(self.detected_hands, width, height, timestamp)
+            return results_from_arrays(())
+
+        if self.scheduler is not None and not self.scheduler.should_detect(frame, timestamp):
+            # Idle and nothing moved: no hand, same as an empty detection
+            self.detected_hands = []
+            if self.recorder is not None:
+                self.recorder.write(time.perf_counter() if timestamp is None else timestamp, [])
+            self.gestures.update(self.detected_hands, width, height, timestamp)
+            return results_from_arrays(())
+
+        rescan = (self.roi_tracking and self.last_roi is not None
+                  and len(self.detected_hands) < self.max_hands
+                  and self._roi_frames >= self.roi_rescan_interval)
+        if rescan:
+            # Room for more hands than the crop holds: look for new ones
+            self.roi_rescans += 1
+        elif self.roi_tracking and self.last_roi is not None:
+            self._roi_frames += 1
+            x0, y0, x1, y1 = self.last_roi
+            results = self._infer(frame[y0:y1, x0:x1], scale=1.0)
+            if results.multi_hand_landmarks:
+                self.map_landmarks_from_roi(results.multi_hand_landmarks, self.last_roi, width, height)
+            else:
+                # The crop lost the hand, look at the whole frame again
+                self.roi_misses += 1
+                results = None
+
+        if results is None:
+            self._roi_frames = 0
+            results = self._infer(frame, scale=self.inference_scale)
+
+        start = time.perf_counter()
+        self.detected_hands = self.tracker.assign(hands_from_results(results))
+        if self.scheduler is not None:
+            self.scheduler.update(bool(self.detected_hands), timestamp)
+        if self.recorder is not None:
+            self.recorder.write(time.perf_counter() if timestamp is None else timestamp, self.detected_hands)
+
+        if self.roi_tracking:
+            self.last_roi = None
+            if self.detected_hands:
+                roi = self.hand_roi(stack_hands(self.detected_hands), width, height, self.roi_margin)
+                # A crop is only worth it when it is smaller than the full-frame input
+                x0, y0, x1, y1 = roi
+                if (x1 - x0) * (y1 - y0) < width * height * self.inference_scale ** 2:
+                    self.last_roi = roi
+
+        if self.smoother is not None:
+            self.smoother.apply(self.detected_hands, timestamp)
+        self.gestures.update(self.detected_hands, width, height, timestamp)
+
+        self.post_cost += time.perf_counter() - start
+        self.post_frames += 1
+        self.post_hands += len(self.detected_hands)
+        return results
+
+    def stats(self):
+        """Mean post-inference cost per frame and per hand, in microseconds."""
+        return {
+            'frames': self.post_frames,
+            'hands_per_frame': self.post_hands / self.post_frames if self.post_frames else 0.0,
+            'per_frame_us': self.post_cost / self.post_frames * 1e6 if self.post_frames else 0.0,
+            'per_hand_us': self.post_cost / self.post_hands * 1e6 if self.post_hands else 0.0,
+            'tracker': self.tracker.stats(),
+        }
+
+    def _infer(self, image, scale):
+        """Runs MediaPipe on image, optionally downscaled first."""
+        if scale < 1.0:
+            height, width = image.shape[:2]
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            with tracer.span('engine.resize'):
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        # Normalized landmarks do not depend on the input resolution,
+        # so a uniformly scaled frame needs no remapping afterwards.
+        with tracer.span('engine.cvtColor'):
+            if hasattr(self.hands, 'input_buffer'):
+                # Convert straight into the backend's (shared-memory) input
+                rgb_frame = self.hands.input_buffer(image.shape)
+                cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            else:
+                rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with tracer.span('engine.hands.process'):
+            return self.hands.process(rgb_frame)
+
+    @staticmethod
+    def hand_roi(landmarks, width, height, margin):
+        """
+        Returns a square pixel box (x0, y0, x1, y1) around all hands of a
+        (..., 21, 3) landmark array, grown by margin.
+        """
+        points = landmarks.reshape(-1, 3)
+        min_x, min_y = points[:, :2].min(axis=0) * (width, height)
+        max_x, max_y = points[:, :2].max(axis=0) * (width, height)
+
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        side = max(max_x - min_x, max_y - min_y) * (1 + 2 * margin)
+        half = side / 2
+        x0 = int(max(0, cx - half))
+        y0 = int(max(0, cy - half))
+        x1 = int(min(width, cx + half))
+        y1 = int(min(height, cy + half))
+        return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
+
+    @staticmethod
+    def map_landmarks_from_roi(multi_hand_landmarks, roi, width, height):
+        """Converts landmarks normalized to the roi crop into full-frame normalized coordinates."""
+        x0, y0, x1, y1 = roi
+        crop_w, crop_h = x1 - x0, y1 - y0
+        for hand in multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = (lm.x * crop_w + x0) / width
+                lm.y = (lm.y * crop_h + y0) / height
+                # z shares the x scale in MediaPipe
+                lm.z = lm.z * crop_w / width
 
     @staticmethod
     def calculate_distance(point1, point2, width, height):
@@ -35,39 +294,35 @@ class GestureEngine:
         pip = hand_landmarks.landmark[finger_pip_id]
         return tip.y < pip.y
 
-    def count_fingers_up(self, hand_landmarks):
-        """Counts how many fingers are up."""
-        fingers = {
-            'thumb': False,
-            'index': False,
-            'middle': False,
-            'ring': False,
-            'pinky': False
-        }
-        
-        # Thumb (special case, checking horizontal movement relative to IP joint)
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        # Using a simple heuristic for thumb (horizontal distance on flipped frame)
-        # Note: This may need calibration depending on hand orientation
-        fingers['thumb'] = abs(thumb_tip.x - thumb_ip.x) > 0.03
-        
-        # Other fingers
-        fingers['index'] = self.is_finger_up(hand_landmarks, 
-                                             self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
-                                             self.mp_hands.HandLandmark.INDEX_FINGER_PIP)
-        fingers['middle'] = self.is_finger_up(hand_landmarks,
-                                              self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
-                                              self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP)
-        fingers['ring'] = self.is_finger_up(hand_landmarks,
-                                            self.mp_hands.HandLandmark.RING_FINGER_TIP,
-                                            self.mp_hands.HandLandmark.RING_FINGER_PIP)
-        fingers['pinky'] = self.is_finger_up(hand_landmarks,
-                                             self.mp_hands.HandLandmark.PINKY_TIP,
-                                             self.mp_hands.HandLandmark.PINKY_PIP)
-        
-        return fingers
+    def count_fingers_up(self, hand):
+        """
+        Counts how many fingers are up. Accepts a Hand, a (21, 3) landmark
+        array or a MediaPipe landmark list.
+        """
+        if hasattr(hand, 'landmarks'):
+            landmarks = hand.landmarks
+        elif isinstance(hand, np.ndarray):
+            landmarks = hand
+        else:
+            landmarks = landmarks_to_array(hand)
+        # Note: the thumb heuristic (horizontal distance on flipped frame)
+        # may need calibration depending on hand orientation
+        return fingers_to_dict(fingers_up(landmarks))
+
+    def draw_landmarks(self, frame, hand, style=None):
+        """Draws the skeleton of a Hand; style names a ui.skeleton preset."""
+        self.draw_hands(frame, [hand], style)
+
+    def draw_hands(self, frame, hands=None, style=None):
+        """Draws the skeletons of hands (default: detected_hands) in one batch."""
+        hands = self.detected_hands if hands is None else hands
+        if SKELETON not in self.stages or not hands or not self.skeleton.enabled:
+            return
+        with tracer.span('engine.draw_landmarks'):
+            self.skeleton.draw(frame, stack_hands(hands), style)
 
     def close(self):
         """Releases MediaPipe resources."""
         self.hands.close()
+        if self.recorder is not None:
+            self.recorder.close()
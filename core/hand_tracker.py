@@ -0,0 +1,114 @@
+"""
+Stable hand identities across frames.
+
+MediaPipe returns the hands of a frame in no particular order, so "hand 0"
+can be a different person from one frame to the next. HandTracker matches
+the hands of every frame to the tracks of the previous frames and gives each
+Hand a persistent id. The cost of pairing a hand with a track is the mean
+landmark distance between them (normalized frame units), computed for all
+pairs at once on the stacked (N, 21, 3) batch, plus a penalty when both
+handedness labels are known and differ. Pairs are taken cheapest first;
+hands without a track closer than max_distance start a new one.
+"""
+import time
+
+import numpy as np
+
+from core.landmarks import stack_hands
+
+
+class HandTracker:
+    """
+    Assigns Hand.id and orders hands by id (oldest track first).
+
+    max_distance        mean landmark distance above which a hand is new
+    handedness_penalty  cost added when the handedness labels disagree
+    max_missing         frames a track survives without its hand, so a
+                        briefly lost hand gets its id back
+    """
+    def __init__(self, max_distance=0.15, handedness_penalty=0.1, max_missing=5):
+        self.max_distance = max_distance
+        self.handedness_penalty = handedness_penalty
+        self.max_missing = max_missing
+
+        self.track_ids = []
+        self.track_landmarks = np.empty((0, 21, 3), dtype=np.float32)
+        self.track_handedness = []
+        self.track_missing = []
+        self.next_id = 0
+
+        # Metrics
+        self.frames = 0
+        self.hands_seen = 0
+        self.new_tracks = 0
+        self.total_cost = 0.0
+
+    def costs(self, landmarks, handedness):
+        """(N, T) matching cost of N hands against the T current tracks."""
+        diff = landmarks[:, None, :, :2] - self.track_landmarks[None, :, :, :2]
+        cost = np.sqrt((diff * diff).sum(axis=-1)).mean(axis=-1)
+        labels = np.array(handedness, dtype=object)
+        tracked = np.array(self.track_handedness, dtype=object)
+        known = (labels[:, None] != 'Unknown') & (tracked[None, :] != 'Unknown')
+        cost += self.handedness_penalty * (known & (labels[:, None] != tracked[None, :]))
+        return cost
+
+    def assign(self, hands):
+        """Sets hand.id on every hand and returns the hands sorted by id."""
+        start = time.perf_counter()
+        self.frames += 1
+        self.hands_seen += len(hands)
+        ids = [None] * len(hands)
+        landmarks = stack_hands(hands)
+
+        matched = set()
+        if hands and self.track_ids:
+            cost = self.costs(landmarks, [hand.handedness for hand in hands])
+            # Cheapest pairs first
+            for flat in np.argsort(cost, axis=None):
+                h, t = divmod(int(flat), cost.shape[1])
+                if cost[h, t] > self.max_distance:
+                    break
+                if ids[h] is not None or t in matched:
+                    continue
+                ids[h] = self.track_ids[t]
+                matched.add(t)
+
+        # Update the tracks: matched ones take the new pose, the rest age
+        keep = [t for t in range(len(self.track_ids))
+                if t in matched or self.track_missing[t] < self.max_missing]
+        poses = {self.track_ids[t]: self.track_landmarks[t] for t in keep}
+        labels = {self.track_ids[t]: self.track_handedness[t] for t in keep}
+        missing = {self.track_ids[t]: (0 if t in matched else self.track_missing[t] + 1) for t in keep}
+        for h, hand in enumerate(hands):
+            if ids[h] is None:
+                ids[h] = self.next_id
+                self.next_id += 1
+                self.new_tracks += 1
+                missing[ids[h]] = 0
+            hand.id = ids[h]
+            poses[hand.id] = landmarks[h]
+            labels[hand.id] = hand.handedness
+
+        self.track_ids = sorted(poses)
+        self.track_landmarks = np.stack([poses[i] for i in self.track_ids]) if poses \
+            else np.empty((0, 21, 3), dtype=np.float32)
+        self.track_handedness = [labels[i] for i in self.track_ids]
+        self.track_missing = [missing[i] for i in self.track_ids]
+
+        self.total_cost += time.perf_counter() - start
+        return sorted(hands, key=lambda hand: hand.id)
+
+    def reset(self):
+        self.track_ids = []
+        self.track_landmarks = np.empty((0, 21, 3), dtype=np.float32)
+        self.track_handedness = []
+        self.track_missing = []
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'tracks': len(self.track_ids),
+            'new_tracks': self.new_tracks,
+            'mean_us': self.total_cost / self.frames * 1e6 if self.frames else 0.0,
+        }
@@ -0,0 +1,97 @@
+"""
+Background loading of the hands model.
+
+Importing MediaPipe and building its Hands graph takes the better part of a
+second, and the first process() call pays again for graph initialization.
+BackgroundHands does all of that on a loader thread while the camera opens
+and the first frames are shown. Until the model is ready it acts as a hands
+backend that sees no hands, so GestureEngine and the modules run unchanged:
+
+    engine = GestureEngine(hands=BackgroundHands(factory))
+
+The warm-up runs one dummy (black) frame through the model, so the first
+real frame is not the one paying for lazy initialization.
+"""
+import threading
+import time
+
+import numpy as np
+
+from core.landmarks import results_from_arrays
+
+
+class BackgroundHands:
+    """
+    Hands backend whose model is created by factory() on a loader thread.
+
+    warmup_shape    shape of the dummy RGB frame processed once after
+                    loading; None skips the warm-up
+    """
+    def __init__(self, factory, warmup_shape=(480, 640, 3)):
+        self.factory = factory
+        self.warmup_shape = warmup_shape
+        self.error = None
+        self.ready = threading.Event()
+        self.started = time.perf_counter()
+        # Seconds spent creating the model and on the warm-up frame, and
+        # from construction until the model was ready
+        self.load_time = None
+        self.warmup_time = None
+        self.ready_time = None
+        self.skipped = 0
+        self._hands = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._load, name='HandsLoader', daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            hands = self.factory()
+            loaded = time.perf_counter()
+            self.load_time = loaded - start
+            if self.warmup_shape is not None:
+                hands.process(np.zeros(self.warmup_shape, dtype=np.uint8))
+                self.warmup_time = time.perf_counter() - loaded
+            self._hands = hands
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready_time = time.perf_counter() - self.started
+            self.ready.set()
+
+    @property
+    def loaded(self):
+        """True once the model is ready to run inference."""
+        return self._hands is not None
+
+    def wait(self, timeout=None):
+        """Blocks until loading finished (or failed); returns whether it did."""
+        return self.ready.wait(timeout)
+
+    def process(self, rgb_frame):
+        """
+        Runs the model, or returns results without hands while it is still
+        loading. A model that failed to load raises its error here.
+        """
+        if self._hands is None:
+            if self.error is not None:
+                raise self.error
+            self.skipped += 1
+            return results_from_arrays(())
+        return self._hands.process(rgb_frame)
+
+    def close(self):
+        """Waits for the loader and releases the model."""
+        self._thread.join()
+        if self._hands is not None and not self._closed:
+            self._closed = True
+            self._hands.close()
+
+    def stats(self):
+        return {
+            'load_ms': None if self.load_time is None else self.load_time * 1000.0,
+            'warmup_ms': None if self.warmup_time is None else self.warmup_time * 1000.0,
+            'ready_ms': None if self.ready_time is None else self.ready_time * 1000.0,
+            'frames_before_ready': self.skipped,
+        }
@@ -0,0 +1,297 @@
+"""
+Out-of-process hand inference.
+
+InferenceWorker runs MediaPipe Hands (or any hands backend) in a separate
+process and is itself a drop-in hands backend for GestureEngine:
+
+    engine = GestureEngine(hands=InferenceWorker(width, height))
+
+Frames travel through a multiprocessing.shared_memory ring of RGB slots;
+GestureEngine converts each frame straight into the next free slot, so no
+frame is ever pickled or copied on its way to the worker. Results come back
+through a second shared-memory array of fixed-size records (the same record
+layout as core.recorder) and only a slot number and sequence number go over
+the pipes.
+
+With pipelined=True process() submits the new frame and returns the results
+of the previous one, so the worker runs inference on frame N while the main
+process renders frame N-1: one frame of extra latency buys overlap of
+inference with capture and drawing on separate cores.
+
+If the worker dies or hangs it is restarted (up to max_restarts times); the
+frames it was working on come back without hands.
+"""
+import multiprocessing
+import queue
+import time
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.landmarks import HANDEDNESS_LABELS, landmarks_to_array, results_from_arrays
+from core.recorder import record_dtype
+
+
+class MediaPipeHandsFactory:
+    """Creates mp.solutions.hands.Hands inside the worker process."""
+    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7):
+        self.kwargs = dict(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+
+    def __call__(self):
+        import mediapipe as mp
+        return mp.solutions.hands.Hands(**self.kwargs)
+
+
+def _worker_main(frames_name, results_name, slots, slot_size, max_hands,
+                 backend_factory, requests, responses):
+    # The worker shares the parent's resource tracker, the parent unlinks
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    frames = np.ndarray((slots, slot_size), dtype=np.uint8, buffer=frames_shm.buf)
+    results = np.ndarray((slots,), dtype=record_dtype(max_hands), buffer=results_shm.buf)
+
+    hands = backend_factory()
+    responses.put(('ready', None, None))
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            responses.put(_run_request(hands, frames, results, request, max_hands))
+    finally:
+        hands.close()
+        del frames, results
+        frames_shm.close()
+        results_shm.close()
+
+
+def _run_request(hands, frames, results, request, max_hands):
+    """Runs inference on one slot and writes the result record."""
+    slot, seq, height, width = request
+    rgb = frames[slot, :height * width * 3].reshape(height, width, 3)
+    record = results[slot]
+    try:
+        output = hands.process(rgb)
+        multi_hand_landmarks = output.multi_hand_landmarks or []
+        multi_handedness = getattr(output, 'multi_handedness', None) or []
+        count = min(len(multi_hand_landmarks), max_hands)
+        record['num_hands'] = count
+        for i in range(count):
+            landmarks_to_array(multi_hand_landmarks[i], out=record['landmarks'][i])
+            label, score = 'Unknown', 1.0
+            if i < len(multi_handedness):
+                classification = multi_handedness[i].classification[0]
+                label, score = classification.label, classification.score
+            record['handedness'][i] = HANDEDNESS_LABELS.index(label) if label in HANDEDNESS_LABELS else 0
+            record['score'][i] = score
+        return ('ok', slot, seq)
+    except Exception as e:
+        record['num_hands'] = 0
+        return ('error', slot, seq, repr(e))
+
+
+def _release(process, requests, blocks):
+    """Stops the worker and frees the shared memory (also runs at exit)."""
+    if process is not None and process.is_alive():
+        try:
+            requests.put(None)
+        except (OSError, ValueError):
+            pass
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout=1.0)
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            # Views are still alive at interpreter exit; unlinking is enough
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class InferenceWorker:
+    """
+    Hands backend running inference in a worker process.
+
+    width, height   largest frame that will be processed
+    slots           frames in the shared ring (at least 2)
+    backend_factory picklable callable creating the hands backend inside the
+                    worker; MediaPipe Hands by default
+    timeout         seconds to wait for one result before the worker is
+                    considered hung and restarted
+    """
+    def __init__(self, width, height, slots=3, max_hands=1, backend_factory=None,
+                 pipelined=False, timeout=5.0, max_restarts=3, start_method='spawn', **hands_kwargs):
+        self.width = width
+        self.height = height
+        self.slots = max(2, slots)
+        self.max_hands = max_hands
+        self.backend_factory = backend_factory or MediaPipeHandsFactory(max_hands=max_hands, **hands_kwargs)
+        self.pipelined = pipelined
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.errors = 0
+
+        self._context = multiprocessing.get_context(start_method)
+        self._slot_size = width * height * 3
+        self._frames_shm = shared_memory.SharedMemory(create=True, size=self.slots * self._slot_size)
+        dtype = record_dtype(max_hands)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=self.slots * dtype.itemsize)
+        self._frames = np.ndarray((self.slots, self._slot_size), dtype=np.uint8, buffer=self._frames_shm.buf)
+        self._results = np.ndarray((self.slots,), dtype=dtype, buffer=self._results_shm.buf)
+
+        self._next_slot = 0
+        self._seq = 0
+        self._reserved = None
+        self._pending = []  # (slot, seq) in submission order
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._finalizer = None
+        self._start()
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+    def _start(self):
+        self._requests = self._context.Queue()
+        self._responses = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker_main, name='InferenceWorker', daemon=True,
+            args=(self._frames_shm.name, self._results_shm.name, self.slots, self._slot_size,
+                  self.max_hands, self.backend_factory, self._requests, self._responses))
+        self._process.start()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _release, self._process, self._requests,
+                                           (self._frames_shm, self._results_shm))
+        self._wait_ready()
+
+    def _wait_ready(self):
+        deadline = time.perf_counter() + max(self.timeout, 30.0)
+        while True:
+            try:
+                message = self._responses.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(f"Inference worker failed to start (exit code {self._process.exitcode})")
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("Inference worker did not start in time")
+                continue
+            if message[0] == 'ready':
+                return
+
+    def _restart(self):
+        """Replaces a dead or hung worker; in-flight frames are lost."""
+        if self.restarts >= self.max_restarts:
+            self.close()
+            raise RuntimeError(f"Inference worker crashed {self.restarts + 1} times, giving up")
+        self.restarts += 1
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1.0)
+        self._pending.clear()
+        self._start()
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def close(self):
+        """Stops the worker and releases the shared memory."""
+        if self._finalizer is not None:
+            self._frames = self._results = None
+            self._finalizer()
+            self._finalizer = None
+            self._process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Hands backend interface
+    # ------------------------------------------------------------------
+    def input_buffer(self, shape):
+        """
+        Reserves the next free slot and returns it as an RGB array of shape
+        (height, width, 3) for the caller to fill; the following process()
+        call then sends it without copying.
+        """
+        height, width = shape[:2]
+        if height * width * 3 > self._slot_size:
+            raise ValueError(f"Frame {width}x{height} is larger than the worker's {self.width}x{self.height}")
+        slot = self._next_slot
+        self._reserved = (slot, height, width)
+        return self._frames[slot, :height * width * 3].reshape(height, width, 3)
+
+    def process(self, rgb_frame):
+        """Runs inference on rgb_frame and returns MediaPipe-like results."""
+        height, width = rgb_frame.shape[:2]
+        reserved, self._reserved = self._reserved, None
+        if reserved is not None and reserved[1:] == (height, width) \
+                and np.may_share_memory(self._frames[reserved[0]], rgb_frame):
+            slot = reserved[0]
+        else:
+            # Frame did not come from input_buffer(): one copy into the ring
+            slot = self._next_slot
+            np.copyto(self.input_buffer(rgb_frame.shape), rgb_frame)
+            self._reserved = None
+        self._next_slot = (slot + 1) % self.slots
+
+        if not self.is_alive():
+            self._restart()
+        self._seq += 1
+        self._pending.append((slot, self._seq))
+        self._requests.put((slot, self._seq, height, width))
+
+        if self.pipelined and len(self._pending) < 2:
+            # First frame of a pipeline: nothing finished yet
+            return results_from_arrays(())
+        # Keep at most one frame in flight (pipelined) or none (synchronous)
+        return self._collect(self._pending[0])
+
+    def _collect(self, wanted):
+        """Waits for the result of (slot, seq) and turns it into results."""
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                message = self._responses.get(timeout=max(0.0, min(remaining, 0.1)))
+            except queue.Empty:
+                if not self._process.is_alive() or time.perf_counter() > deadline:
+                    self._restart()
+                    return results_from_arrays(())
+                continue
+
+            status, slot, seq = message[:3]
+            if status == 'ready':
+                continue
+            self._pending = [p for p in self._pending if p[1] != seq]
+            if status == 'error':
+                self.errors += 1
+            if seq == wanted[1]:
+                return self._read_results(slot)
+
+    def _read_results(self, slot):
+        record = self._results[slot]
+        count = int(record['num_hands'])
+        if count == 0:
+            return results_from_arrays(())
+        labels = [HANDEDNESS_LABELS[h] for h in record['handedness'][:count]]
+        return results_from_arrays(record['landmarks'][:count].copy(), labels, record['score'][:count].copy())
+
+    def stats(self):
+        return {'restarts': self.restarts, 'errors': self.errors, 'in_flight': len(self._pending)}
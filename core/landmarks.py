@@ -0,0 +1,214 @@
+"""
+Compact NumPy representation of MediaPipe hand landmarks.
+
+Every detected hand is converted once per frame into a (21, 3) float32 array
+of normalized (x, y, z) coordinates. All gesture math below is vectorized and
+works on a single hand (21, 3) or on a stacked batch (N, 21, 3), so the hot
+path never touches protobuf objects attribute by attribute.
+"""
+import numpy as np
+
+# Landmark indices (same numbering as mp.solutions.hands.HandLandmark)
+WRIST = 0
+THUMB_CMC = 1
+THUMB_MCP = 2
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_FINGER_MCP = 5
+INDEX_FINGER_PIP = 6
+INDEX_FINGER_DIP = 7
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_MCP = 9
+MIDDLE_FINGER_PIP = 10
+MIDDLE_FINGER_DIP = 11
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_MCP = 13
+RING_FINGER_PIP = 14
+RING_FINGER_DIP = 15
+RING_FINGER_TIP = 16
+PINKY_MCP = 17
+PINKY_PIP = 18
+PINKY_DIP = 19
+PINKY_TIP = 20
+
+NUM_LANDMARKS = 21
+
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+FINGER_TIPS = np.array([THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP])
+# For the thumb the IP joint plays the role of the PIP joint
+FINGER_PIPS = np.array([THUMB_IP, INDEX_FINGER_PIP, MIDDLE_FINGER_PIP, RING_FINGER_PIP, PINKY_PIP])
+
+# Horizontal tip-to-IP distance above which the thumb counts as extended
+THUMB_THRESHOLD = 0.03
+# Pixel distance between thumb and index tips below which we have a pinch
+PINCH_THRESHOLD = 50.0
+
+
+class Hand:
+    """
+    A detected hand: (21, 3) float32 landmarks plus handedness and score.
+    id is a stable identity across frames, assigned by core.hand_tracker.
+    """
+    __slots__ = ('landmarks', 'handedness', 'score', 'source', 'id')
+
+    def __init__(self, landmarks, handedness='Unknown', score=1.0, source=None, hand_id=None):
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.score = score
+        # The original MediaPipe landmark list, if the hand came from MediaPipe
+        self.source = source
+        self.id = hand_id
+
+    def __repr__(self):
+        return f"Hand({self.handedness}, id={self.id}, score={self.score:.2f})"
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Converts a MediaPipe NormalizedLandmarkList into a (21, 3) float32 array."""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, lm in enumerate(hand_landmarks.landmark):
+        out[i] = (lm.x, lm.y, lm.z)
+    return out
+
+
+def hands_from_results(results):
+    """Converts MediaPipe Hands results into a list of Hand objects."""
+    multi_hand_landmarks = results.multi_hand_landmarks
+    if not multi_hand_landmarks:
+        return []
+
+    multi_handedness = getattr(results, 'multi_handedness', None) or []
+    hands = []
+    for i, hand_landmarks in enumerate(multi_hand_landmarks):
+        handedness, score = 'Unknown', 1.0
+        if i < len(multi_handedness):
+            classification = multi_handedness[i].classification[0]
+            handedness, score = classification.label, classification.score
+        hands.append(Hand(landmarks_to_array(hand_landmarks), handedness, score, hand_landmarks))
+    return hands
+
+
+def stack_hands(hands):
+    """Stacks the landmarks of several hands into a (N, 21, 3) batch."""
+    if not hands:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    return np.stack([hand.landmarks for hand in hands])
+
+
+def fingers_up(landmarks, thumb_threshold=THUMB_THRESHOLD):
+    """
+    Returns a boolean array (..., 5) telling which fingers are up, in
+    FINGER_NAMES order. A finger is up when its tip is above its PIP joint;
+    the thumb is up when its tip is far enough sideways from its IP joint.
+    """
+    tips = landmarks[..., FINGER_TIPS, :]
+    pips = landmarks[..., FINGER_PIPS, :]
+    states = tips[..., 1] < pips[..., 1]
+    states[..., 0] = np.abs(tips[..., 0, 0] - pips[..., 0, 0]) > thumb_threshold
+    return states
+
+
+def fingers_to_dict(states):
+    """Converts a (5,) finger state array into the {'thumb': bool, ...} form."""
+    return {name: bool(state) for name, state in zip(FINGER_NAMES, states)}
+
+
+def landmark_distance(landmarks, a, b, width=1, height=1):
+    """Pixel distance (...) between landmarks a and b."""
+    dx = (landmarks[..., a, 0] - landmarks[..., b, 0]) * width
+    dy = (landmarks[..., a, 1] - landmarks[..., b, 1]) * height
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def pairwise_distances(landmarks, width=1, height=1):
+    """Pixel distances (..., 21, 21) between every pair of landmarks."""
+    points = landmarks[..., :2] * np.array([width, height], dtype=np.float32)
+    diff = points[..., :, None, :] - points[..., None, :, :]
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+
+def is_pinch(landmarks, width, height, threshold=PINCH_THRESHOLD,
+             a=THUMB_TIP, b=INDEX_FINGER_TIP):
+    """True (...) where the tips a and b are closer than threshold pixels."""
+    return landmark_distance(landmarks, a, b, width, height) < threshold
+
+
+def to_pixels(landmarks, index, width, height):
+    """Integer pixel position of a single landmark of one hand."""
+    point = landmarks[index]
+    return int(point[0] * width), int(point[1] * height)
+
+
+# ----------------------------------------------------------------------------
+# MediaPipe-compatible results built from arrays (replay, worker processes)
+# ----------------------------------------------------------------------------
+
+class NormalizedLandmark:
+    """Plain stand-in for the MediaPipe NormalizedLandmark message."""
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, name):
+        # Replayed landmarks carry no visibility/presence information
+        return False
+
+
+class NormalizedLandmarkList:
+    __slots__ = ('landmark',)
+
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+
+class Classification:
+    __slots__ = ('index', 'label', 'score')
+
+    def __init__(self, index, label, score):
+        self.index = index
+        self.label = label
+        self.score = score
+
+
+class ClassificationList:
+    __slots__ = ('classification',)
+
+    def __init__(self, classification):
+        self.classification = classification
+
+
+class HandResults:
+    """Quacks like the results of mp.solutions.hands.Hands.process()."""
+    __slots__ = ('multi_hand_landmarks', 'multi_handedness')
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+HANDEDNESS_LABELS = ('Unknown', 'Left', 'Right')
+
+
+def results_from_arrays(landmarks, handedness=(), scores=()):
+    """
+    Builds HandResults from a (N, 21, 3) landmark array plus per-hand
+    handedness labels and scores. No hands gives empty (None) results,
+    like MediaPipe does.
+    """
+    if len(landmarks) == 0:
+        return HandResults()
+    multi_hand_landmarks = []
+    multi_handedness = []
+    for i, hand in enumerate(landmarks):
+        multi_hand_landmarks.append(NormalizedLandmarkList(
+            [NormalizedLandmark(float(x), float(y), float(z)) for x, y, z in hand]))
+        label = handedness[i] if i < len(handedness) else 'Unknown'
+        score = float(scores[i]) if i < len(scores) else 1.0
+        # MediaPipe indexes Left as 0 and Right as 1
+        multi_handedness.append(ClassificationList(
+            [Classification(1 if label == 'Right' else 0, label, score)]))
+    return HandResults(multi_hand_landmarks, multi_handedness)
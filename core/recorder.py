@@ -0,0 +1,252 @@
+"""
+Compact landmark recording and replay.
+
+A recording is a 16-byte header followed by fixed-size little-endian
+records, one per processed frame:
+
+    timestamp    float64     seconds (time.perf_counter of the capture)
+    frame_index  uint32
+    num_hands    uint8
+    handedness   uint8[H]    0 = unknown, 1 = left, 2 = right
+    score        float32[H]
+    landmarks    float32[H, 21, 3]
+
+where H is the max_hands stored in the header. Fixed-size records make the
+file appendable (a crash loses at most the last partial record) and
+memory-mappable as a NumPy structured array.
+
+Recording a live session:
+
+    engine.recorder = LandmarkRecorder('session.lmrec', width, height)
+
+Replaying it without a camera or MediaPipe:
+
+    engine = GestureEngine(hands=ReplayHands('session.lmrec'))
+"""
+import os
+import struct
+import time
+
+import cv2
+import numpy as np
+
+from core.landmarks import HANDEDNESS_LABELS, NUM_LANDMARKS, results_from_arrays
+
+MAGIC = b'GPLM'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIHH')
+
+
+def record_dtype(max_hands):
+    """The structured dtype of one frame record."""
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('frame_index', '<u4'),
+        ('num_hands', 'u1'),
+        ('handedness', 'u1', (max_hands,)),
+        ('score', '<f4', (max_hands,)),
+        ('landmarks', '<f4', (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+def read_header(f):
+    """Reads and validates a header, returns (max_hands, width, height)."""
+    data = f.read(HEADER.size)
+    if len(data) != HEADER.size:
+        raise ValueError("Not a landmark recording: file too short")
+    magic, version, max_hands, record_size, width, height = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a landmark recording: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported landmark recording version {version}")
+    if record_size != record_dtype(max_hands).itemsize:
+        raise ValueError("Corrupt landmark recording: record size mismatch")
+    return max_hands, width, height
+
+
+class LandmarkRecorder:
+    """
+    Appends the per-frame output of GestureEngine.process_frame to a file.
+    Opening an existing recording appends to it. Hands beyond max_hands in
+    a frame cannot be stored: they are counted in hands_dropped and the
+    first time it happens a warning is printed.
+    """
+    def __init__(self, path, width=0, height=0, max_hands=2, flush_every=30):
+        self.path = path
+        self.flush_every = flush_every
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            with open(path, 'rb') as f:
+                max_hands, width, height = read_header(f)
+            self.file = open(path, 'r+b')
+            # Drop a partial record left by a crash
+            record_size = record_dtype(max_hands).itemsize
+            count = (os.path.getsize(path) - HEADER.size) // record_size
+            self.file.truncate(HEADER.size + count * record_size)
+            self.file.seek(0, os.SEEK_END)
+            self.frames_written = count
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(HEADER.pack(MAGIC, VERSION, max_hands, record_dtype(max_hands).itemsize,
+                                        width, height))
+            self.frames_written = 0
+
+        self.max_hands = max_hands
+        self.width = width
+        self.height = height
+        self.hands_dropped = 0
+        # One reusable record buffer
+        self._record = np.zeros(1, dtype=record_dtype(max_hands))
+
+    def write(self, timestamp, hands, frame_index=None):
+        """Appends one frame: a list of core.landmarks.Hand (may be empty)."""
+        record = self._record[0]
+        record['timestamp'] = timestamp
+        record['frame_index'] = self.frames_written if frame_index is None else frame_index
+        count = min(len(hands), self.max_hands)
+        if count < len(hands):
+            if not self.hands_dropped:
+                print(f"Warning: {self.path} stores at most {self.max_hands} hands per frame, "
+                      f"extra hands are not recorded")
+            self.hands_dropped += len(hands) - count
+        record['num_hands'] = count
+        record['handedness'] = 0
+        record['score'] = 0
+        record['landmarks'] = 0
+        for i in range(count):
+            hand = hands[i]
+            label = hand.handedness
+            record['handedness'][i] = HANDEDNESS_LABELS.index(label) if label in HANDEDNESS_LABELS else 0
+            record['score'][i] = hand.score
+            record['landmarks'][i] = hand.landmarks
+        self.file.write(self._record.tobytes())
+        self.frames_written += 1
+        if self.flush_every and self.frames_written % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class LandmarkRecording:
+    """Read-only, memory-mapped view of a recording."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.max_hands, self.width, self.height = read_header(f)
+        dtype = record_dtype(self.max_hands)
+        count = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=dtype, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records['timestamp']
+
+    def landmarks(self, index):
+        """(num_hands, 21, 3) landmarks of frame index."""
+        record = self.records[index]
+        return record['landmarks'][:record['num_hands']]
+
+    def results(self, index):
+        """MediaPipe-compatible results of frame index."""
+        record = self.records[index]
+        count = record['num_hands']
+        labels = [HANDEDNESS_LABELS[h] for h in record['handedness'][:count]]
+        return results_from_arrays(record['landmarks'][:count], labels, record['score'][:count])
+
+
+class ReplayHands:
+    """
+    Drop-in replacement for mp.solutions.hands.Hands that returns recorded
+    results instead of running a model. With realtime=True process() waits
+    so that frames come out at the recorded pace, otherwise as fast as they
+    are asked for. Once the recording is exhausted process() returns empty
+    results (or starts over when loop=True) and finished becomes True.
+    """
+    def __init__(self, recording, realtime=False, loop=False):
+        if isinstance(recording, str):
+            recording = LandmarkRecording(recording)
+        self.recording = recording
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.finished = len(recording) == 0
+        self._start_wall = None
+        self._start_recorded = None
+
+    def process(self, rgb_frame=None):
+        if self.position >= len(self.recording):
+            if not self.loop or len(self.recording) == 0:
+                self.finished = True
+                return results_from_arrays(())
+            self.position = 0
+            self._start_wall = None
+
+        index = self.position
+        self.position += 1
+
+        if self.realtime:
+            recorded = float(self.recording.timestamps[index])
+            now = time.perf_counter()
+            if self._start_wall is None:
+                self._start_wall, self._start_recorded = now, recorded
+            delay = (recorded - self._start_recorded) - (now - self._start_wall)
+            if delay > 0:
+                time.sleep(delay)
+
+        return self.recording.results(index)
+
+    def close(self):
+        pass
+
+
+class BlankCapture:
+    """
+    A cv2.VideoCapture-like source of black frames for replay sessions,
+    paced at fps (0 = as fast as they are read).
+    """
+    def __init__(self, width, height, fps=30, count=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.count = count
+        self.produced = 0
+        self._next_time = None
+
+    def read(self):
+        if self.count is not None and self.produced >= self.count:
+            return False, None
+        if self.fps:
+            now = time.perf_counter()
+            if self._next_time is None:
+                self._next_time = now
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(self._next_time, now - 1.0 / self.fps) + 1.0 / self.fps
+        self.produced += 1
+        return True, np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0
+
+    def release(self):
+        pass
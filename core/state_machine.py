@@ -0,0 +1,116 @@
+"""
+Mode switching and a per-mode frame pipeline.
+
+Every mode is a module (Painter, VirtualKeyboard, ...) with an
+update(frame, results, engine) method and a set of stages, the inputs it
+reads from the engine:
+
+    LANDMARKS   hand detection, tracking and smoothing (engine.detected_hands)
+    FINGERS     finger-state gestures (point, fist, open_palm, ...)
+    PINCH       the thumb/index pinch gesture
+    SWIPES      motion gestures from the primary hand's history
+    SKELETON    the hand skeleton drawn over the frame
+
+A module declares them as a class attribute (Painter.stages) or they are
+given when the mode is added. StateMachine hands the active mode's stages to
+the engine (GestureEngine.set_stages), so a frame computes only what the
+active module reads, and calls only that module's update(), so a mode never
+pays for another mode's rendering. Modules are created once and kept, so
+switching back to a mode finds its state (canvas, typed text) as it was; the
+optional on_enter() and on_exit() hooks of a module run on switches.
+"""
+import time
+from collections import namedtuple
+
+LANDMARKS = 'landmarks'
+FINGERS = 'fingers'
+PINCH = 'pinch'
+SWIPES = 'swipes'
+SKELETON = 'skeleton'
+
+ALL_STAGES = frozenset((LANDMARKS, FINGERS, PINCH, SWIPES, SKELETON))
+
+Mode = namedtuple('Mode', ['name', 'module', 'stages'])
+
+
+class StateMachine:
+    """
+    Active mode and the modes that can be switched to.
+
+    engine      the GestureEngine whose stages follow the active mode
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.modes = {}
+        self.current = None
+        self.switches = 0
+        self.last_switch_ms = None
+
+    @property
+    def active(self):
+        """The active Mode, or None before the first one is added."""
+        return self.modes.get(self.current)
+
+    def add(self, name, module, stages=None):
+        """
+        Adds a mode (or replaces the module of an existing one). stages
+        defaults to module.stages; the first mode added becomes active.
+        """
+        if stages is None:
+            stages = getattr(module, 'stages', ALL_STAGES)
+        stages = frozenset(stages)
+        unknown = stages - ALL_STAGES
+        if unknown:
+            raise ValueError(f"Unknown stages {sorted(unknown)} for mode {name}")
+        # A stage that reads hands needs the hands
+        if stages - {SKELETON}:
+            stages |= {LANDMARKS}
+        self.modes[name] = Mode(name, module, stages)
+        if self.current is None:
+            self.switch(name)
+        elif name == self.current:
+            self.engine.set_stages(stages)
+        return self.modes[name]
+
+    def switch(self, name):
+        """Makes name the active mode. Returns False if it already was."""
+        if name not in self.modes:
+            raise KeyError(f"Unknown mode {name}, expected one of {list(self.modes)}")
+        if name == self.current:
+            return False
+        start = time.perf_counter()
+        previous = self.active
+        if previous is not None:
+            hook = getattr(previous.module, 'on_exit', None)
+            if hook is not None:
+                hook()
+        mode = self.modes[name]
+        self.current = name
+        self.engine.set_stages(mode.stages)
+        hook = getattr(mode.module, 'on_enter', None)
+        if hook is not None:
+            hook()
+        self.switches += 1
+        self.last_switch_ms = (time.perf_counter() - start) * 1000.0
+        return True
+
+    def cycle(self, step=1):
+        """Switches to the next (or previous) mode in the order they were added."""
+        names = list(self.modes)
+        if not names:
+            return None
+        index = names.index(self.current) if self.current in names else -step
+        self.switch(names[(index + step) % len(names)])
+        return self.current
+
+    def update(self, frame, results):
+        """Runs the active module on a processed frame, returns its output frame."""
+        return self.active.module.update(frame, results, self.engine)
+
+    def stats(self):
+        return {
+            'mode': self.current,
+            'stages': sorted(self.active.stages) if self.active else [],
+            'switches': self.switches,
+            'last_switch_ms': self.last_switch_ms,
+        }
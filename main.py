@@ -1,69 +1,356 @@
 import os
+import time
+# Taken before the heavy imports so the startup report includes them
+LAUNCHED = time.perf_counter()
 # Fix for Protobuf/MediaPipe compatibility issues
 os.environ['PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION'] = 'python'
 
-import cv2
-import sys
+import argparse
+from core.camera_manager import CameraManager
+from core.config_manager import ConfigManager, changed_sections
+from core.detection_scheduler import DetectionScheduler
+from core.display import DisplayStage, create_sink
 from core.gesture_engine import GestureEngine
+from core.state_machine import StateMachine
+from modules.keyboard import VirtualKeyboard
+from modules.mouse_control import MouseControl
 from modules.painter import Painter
+from modules.presentation_control import PresentationControl
+from utils.smoothing import FILTERS, HandSmoother
+from utils.logger import StartupTimer, tracer
+# MediaPipe is imported by the model loader thread, the recorder and the
+# inference worker only when their options are used
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+def make_smoother(smoothing):
+    if smoothing.filter == 'off':
+        return None
+    return HandSmoother(smoothing.filter, lead=smoothing.predict_ms / 1000.0)
+
+def model_settings(detection):
+    """The detection settings baked into the MediaPipe model, as reload_hands() keywords."""
+    return {
+        'max_hands': detection.max_hands,
+        'min_detection_confidence': detection.min_detection_confidence,
+        'min_tracking_confidence': detection.min_tracking_confidence,
+    }
+
+def apply_config(engine, cap, old, new, machine):
+    """
+    Applies the sections of a reloaded config that changed, at a frame
+    boundary. Returns the capture to use from now on: only camera changes
+    reopen it, only model settings reload MediaPipe.
+    """
+    changed = changed_sections(old, new)
+    if not changed:
+        return cap
+    if 'recognition' in changed:
+        engine.gestures.configure(**new.recognition._asdict())
+    if 'smoothing' in changed:
+        engine.smoother = make_smoother(new.smoothing)
+    if 'detection' in changed:
+        engine.inference_scale = min(max(new.detection.inference_scale, 0.1), 1.0)
+        if (new.detection.roi_tracking, new.detection.roi_margin) != (old.detection.roi_tracking,
+                                                                       old.detection.roi_margin):
+            engine.roi_tracking = new.detection.roi_tracking
+            engine.roi_margin = new.detection.roi_margin
+            # The next frame searches the whole frame again
+            engine.last_roi = None
+        settings = model_settings(new.detection)
+        if settings != model_settings(old.detection):
+            if not engine.reload_hands(**settings):
+                print("Detection settings apply to the live MediaPipe model only, restart to use them")
+    if 'display' in changed:
+        try:
+            engine.skeleton.set_style(new.display.skeleton)
+        except ValueError as e:
+            print(f"Display settings not applied: {e}")
+    if 'mouse' in changed and 'mouse' in machine.modes:
+        machine.modes['mouse'].module.configure(new.mouse)
+    if 'gestures' in changed and 'presentation' in machine.modes:
+        try:
+            machine.modes['presentation'].module.set_bindings(new.gestures)
+        except ValueError as e:
+            print(f"Gesture bindings not applied: {e}")
+    if 'camera' in changed and isinstance(cap.source, int):
+        camera = new.camera
+        reopened = CameraManager(camera.index, camera.width, camera.height, camera.fps, mirror=True)
+        if reopened.start():
+            cap.release()
+            cap = reopened
+        else:
+            print(f"Could not open camera {camera.index}, keeping the current one")
+    print(f"Config reloaded: {', '.join(changed)}")
+    return cap
+
+# Modes in the order Tab cycles through them
+MODES = ('painter', 'keyboard', 'mouse', 'presentation')
+
+def create_modules(machine, config, width, height):
+    """Adds (or replaces) a module of every mode, sized for width x height frames."""
+    factories = {
+        'painter': lambda: Painter(width, height),
+        'keyboard': lambda: VirtualKeyboard(width, height),
+        'mouse': lambda: MouseControl(width, height, config.mouse),
+        'presentation': lambda: PresentationControl(width, height, config.gestures),
+    }
+    for name in MODES:
+        try:
+            module = factories[name]()
+        except Exception as e:
+            # e.g. no PyAutoGUI or no display to move a cursor on
+            print(f"Mode {name} unavailable: {e}")
+            continue
+        old = machine.modes.get(name)
+        machine.add(name, module)
+        if old is not None and hasattr(old.module, 'close'):
+            old.module.close()
+
+def apply_overrides(config, args):
+    """The config with the command line options, which win over the file, applied."""
+    if args.hands is not None:
+        config = config._replace(detection=config.detection._replace(max_hands=args.hands))
+    if args.roi:
+        config = config._replace(detection=config.detection._replace(roi_tracking=True))
+    if args.smoothing is not None:
+        config = config._replace(smoothing=config.smoothing._replace(filter=args.smoothing))
+    if args.predict is not None:
+        config = config._replace(smoothing=config.smoothing._replace(predict_ms=args.predict))
+    return config
+
+def create_engine(config, hands, scheduler, background_load=False):
+    engine = GestureEngine(**config.detection._asdict(), hands=hands, scheduler=scheduler,
+                           smoother=make_smoother(config.smoothing), background_load=background_load)
+    engine.gestures.configure(**config.recognition._asdict())
+    engine.skeleton.set_style(config.display.skeleton)
+    return engine
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GesturePro: Professional Gesture Control System")
+    parser.add_argument('source', nargs='?', default=None,
+                        help="video file to use instead of the webcam")
+    parser.add_argument('--config', metavar='FILE', default=CONFIG_PATH,
+                        help="configuration file, reloaded while running (default: config.yaml)")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record detected landmarks to FILE")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="replay recorded landmarks from FILE instead of camera + MediaPipe")
+    parser.add_argument('--worker', nargs='?', const='sync', choices=('sync', 'pipelined'),
+                        help="run MediaPipe in a separate process (pipelined: overlap it with drawing)")
+    parser.add_argument('--hands', type=int, metavar='N',
+                        help="track up to N hands, each with its own drawing state (default: from the config)")
+    parser.add_argument('--always-detect', action='store_true',
+                        help="run hand detection on every frame, even while nobody is gesturing")
+    parser.add_argument('--roi', action='store_true',
+                        help="detect hands in a crop around the last one (default: detection.roi_tracking)")
+    parser.add_argument('--smoothing', choices=sorted(FILTERS) + ['off'],
+                        help="landmark smoothing filter (default: from the config)")
+    parser.add_argument('--predict', type=float, metavar='MS',
+                        help="extrapolate smoothed landmarks MS milliseconds ahead to hide latency")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="trace every frame stage and write a Chrome/Perfetto trace to FILE")
+    parser.add_argument('--stats', action='store_true',
+                        help="show rolling per-stage timings on screen (toggle with 'P')")
+    parser.add_argument('--mode', choices=MODES, default=MODES[0],
+                        help="mode to start in (switch with Tab)")
+    parser.add_argument('--display', metavar='SINK', default='window',
+                        help="where frames go: window, null or pipe:PATH (raw BGR24, pipe:- for stdout)")
+    parser.add_argument('--headless', dest='display', action='store_const', const='null',
+                        help="no window, frames are discarded (same as --display null)")
+    parser.add_argument('--wait-model', action='store_true',
+                        help="load the hand model before showing frames instead of in the background")
+    return parser.parse_args()
 
 def main():
+    startup = StartupTimer(LAUNCHED)
+    startup.mark('imports')
+    args = parse_args()
+    config_manager = ConfigManager(args.config)
+    config = apply_overrides(config_manager.config, args)
+    show_stats = args.stats
+    try:
+        # Before any output: with pipe:- the frames own stdout
+        sink = create_sink(args.display)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return
+    if args.trace or args.stats:
+        tracer.enable()
+    startup.mark('config')
+
     print("=" * 50)
     print("GESTUREPRO: Professional Gesture Control System")
     print("=" * 50)
     
     # Initialization
     try:
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
-            print("Error: Could not open webcam.")
+        # The hand model loads on a background thread from here on, while
+        # the camera opens and the first frames are shown (without hands).
+        camera = config.camera
+        replay = None
+        if args.replay:
+            from core.recorder import ReplayHands
+            replay = ReplayHands(args.replay, realtime=True)
+        # Recorded landmarks are replayed one per detection, so never gate them
+        scheduler = None if (replay is not None or args.always_detect) else DetectionScheduler()
+        engine = None
+        if not args.worker:
+            engine = create_engine(config, replay, scheduler, background_load=not args.wait_model)
+        startup.mark('engine')
+
+        # Frames are captured (and mirrored, so landmarks line up with the
+        # display) on a background thread; we always get the newest one.
+        # An optional video file path replaces the webcam.
+        source = camera.index if args.source is None else args.source
+        if replay is not None:
+            from core.recorder import BlankCapture
+            recording = replay.recording
+            source = BlankCapture(recording.width or camera.width, recording.height or camera.height)
+        cap = CameraManager(source, camera.width, camera.height, camera.fps, mirror=replay is None)
+        if not cap.start():
+            print(f"Error: Could not open video source {source}.")
+            return
+        startup.mark('camera')
+
+        ret, frame = cap.read()
+        if not ret:
+            print("Error: Could not read from webcam.")
             return
+        startup.mark('first_capture')
 
         # Get frame dimensions
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        height, width = frame.shape[:2]
         print(f"Camera initialized: {width}x{height}")
 
-        engine = GestureEngine()
-        painter = Painter(width, height)
-        
-        print("\nSystem started. Press 'Q' to quit.")
+        if engine is None:
+            from core.inference_worker import InferenceWorker
+            # The worker's shared frame slots are sized for the real frame;
+            # it loads the model in its own process before returning
+            detection = config.detection
+            worker = InferenceWorker(width, height, max_hands=detection.max_hands,
+                                     pipelined=args.worker == 'pipelined',
+                                     min_detection_confidence=detection.min_detection_confidence,
+                                     min_tracking_confidence=detection.min_tracking_confidence)
+            engine = create_engine(config, worker, scheduler)
+        loader = engine.hands if engine.owns_hands and engine.background_load else None
+
+        if args.record:
+            from core.recorder import LandmarkRecorder
+            engine.recorder = LandmarkRecorder(args.record, width, height,
+                                               max_hands=config.detection.max_hands)
+            if engine.recorder.max_hands < config.detection.max_hands:
+                print(f"Warning: {args.record} was recorded with at most {engine.recorder.max_hands} hands")
+        # Every mode's module is created once and kept, so switching back
+        # finds it as it was; only the active one runs each frame
+        machine = StateMachine(engine)
+        create_modules(machine, config, width, height)
+        if args.mode in machine.modes:
+            machine.switch(args.mode)
+        painter = machine.modes['painter'].module
+
+        # Frames are shown by a display thread at its own pace (on macOS the
+        # window is driven from submit() on this thread); keys are read
+        # there and their handlers run here, between frames
+        display = DisplayStage(sink)
+        display.bind('\t', lambda: print(f"Mode: {machine.cycle()}"))
+        display.bind('s', lambda: painter.save_canvas(
+            callback=lambda job: print(f"Canvas save {job.status}: {job.filename}")))
+        display.bind('x', lambda: painter.clear_canvas())
+        display.bind('z', lambda: painter.undo())
+        display.bind('y', lambda: painter.redo())
+
+        def toggle_stats():
+            nonlocal show_stats
+            show_stats = not show_stats
+            if show_stats:
+                tracer.enable()
+        display.bind('p', toggle_stats)
+        display.start()
+
+        quit_hint = "Press 'Q' to quit" if args.display == 'window' else "Press Ctrl+C to stop"
+        print(f"\nSystem started. {quit_hint}.")
+        frames = 0
+        loop_start = time.perf_counter()
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
+        while display.handle_keys():
+            with tracer.span('main.capture_wait'):
+                packet = cap.read_packet()
+            if packet is None or (replay is not None and replay.finished):
                 break
+            frame = packet.frame
             
-            # Mirror the frame BEFORE processing to align landmarks with display
-            frame = cv2.flip(frame, 1)
+            # Config file changes are applied between frames, the command
+            # line options still winning over them
+            new_config = config_manager.poll()
+            if new_config is not None:
+                new_config = apply_overrides(new_config, args)
+                cap = apply_config(engine, cap, config, new_config, machine)
+                config = new_config
+            if frame.shape[:2] != (painter.frame_height, painter.frame_width):
+                # The camera was reopened at another resolution
+                create_modules(machine, config, frame.shape[1], frame.shape[0])
+                painter = machine.modes['painter'].module
             
             # Process hand landmarks
-            results = engine.process_frame(frame)
+            with tracer.span('main.process_frame'):
+                results = engine.process_frame(frame, packet.timestamp)
+            if loader is None or loader.loaded:
+                startup.mark('first_inference')
+            if engine.detected_hands:
+                startup.mark('first_hand')
             
-            # Current active module: Painter
-            # (In the future, StateMachine will handle switching)
-            display_frame = painter.update(frame, results, engine)
+            # Only the active mode's module runs
+            with tracer.span('main.module_update'):
+                display_frame = machine.update(frame, results)
+            if show_stats:
+                tracer.draw_overlay(display_frame)
             
-            # Show output
-            cv2.imshow('GesturePro', display_frame)
-            
-            # Global keyboard handling
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == 27:
-                break
-            elif key == ord('s'):
-                painter.save_canvas()
-            elif key == ord('x'):
-                painter.canvas.fill(0)
+            # Hand the frame to the display thread, without waiting for it
+            display.submit(display_frame)
+            frames += 1
 
+    except KeyboardInterrupt:
+        print("Interrupted")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
     finally:
         if 'cap' in locals():
             cap.release()
-        cv2.destroyAllWindows()
-        if 'engine' in locals():
+            print(f"Capture stats: {cap.stats()}")
+        if 'display' in locals():
+            display.close()
+            print(f"Display stats: {display.stats()}")
+            if display.first_shown_at is not None:
+                startup.mark('first_frame_shown', display.first_shown_at)
+            # frames and loop_start are only set once the frame loop starts
+            if locals().get('frames'):
+                elapsed = time.perf_counter() - loop_start
+                if elapsed > 0:
+                    print(f"Processed {frames} frames at {frames / elapsed:.1f} FPS")
+        if 'machine' in locals():
+            for mode in machine.modes.values():
+                if hasattr(mode.module, 'close'):
+                    mode.module.close()
+        if locals().get('engine') is not None:
+            if engine.scheduler is not None:
+                print(f"Detection stats: {engine.scheduler.stats()}")
+            print(f"Hand stats: {engine.stats()}")
+            if 'machine' in locals():
+                print(f"Mode stats: {machine.stats()}")
+                if 'mouse' in machine.modes:
+                    print(f"Cursor stats: {machine.modes['mouse'].module.stats()}")
+                if 'presentation' in machine.modes:
+                    print(f"Presentation stats: {machine.modes['presentation'].module.stats()}")
             engine.close()
+            loader = locals().get('loader')
+            if loader is not None:
+                print(f"Model loader stats: {loader.stats()}")
+                startup.mark('model_ready', loader.started + loader.ready_time)
+        print(startup.report())
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+            print(f"Trace written to {args.trace} (open it in https://ui.perfetto.dev)")
         print("\nSystem shutdown gracefully.")
 
 if __name__ == "__main__":
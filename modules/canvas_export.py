@@ -0,0 +1,161 @@
+"""
+Background PNG export of the painter canvas.
+
+Saving used to composite and PNG-encode the canvas inside the frame loop,
+causing a visible hitch on every save. CanvasExporter moves that work to a
+writer thread fed by a small bounded queue. A save does not even copy the
+canvas: it hands over a CanvasSnapshot that refers to the live canvas and is
+copied only when one side needs it to stop changing, either by the writer
+when it picks up the job or by the painter right before it draws over the
+canvas, whichever comes first. The frame loop therefore never waits for more
+than one memcpy of the canvas.
+"""
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from utils.logger import tracer
+
+
+class CanvasSnapshot:
+    """
+    Copy-on-write view of a canvas. The owner calls freeze() before it
+    modifies the canvas; the reader calls freeze() to get a stable array.
+    """
+    def __init__(self, canvas):
+        self._array = canvas
+        self._live = True
+        self._lock = threading.Lock()
+
+    @property
+    def live(self):
+        return self._live
+
+    def freeze(self):
+        """Copies the canvas if that has not happened yet, returns the copy."""
+        with self._lock:
+            if self._live:
+                self._array = self._array.copy()
+                self._live = False
+            return self._array
+
+
+class ExportJob:
+    """
+    One save request. status is 'queued', 'writing', 'done', 'failed' or
+    'dropped' (the queue was full); done is set once it is final.
+    """
+    def __init__(self, snapshot, filename, compression, transparent, callback):
+        self.snapshot = snapshot
+        self.filename = filename
+        self.compression = compression
+        self.transparent = transparent
+        self.callback = callback
+        self.status = 'queued'
+        self.error = None
+        self.submitted = time.perf_counter()
+        self.duration = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+def compose_export(canvas, transparent=False):
+    """
+    The canvas ready for saving: ink on white (BGR) or ink on a transparent
+    background (BGRA).
+    """
+    gray = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
+    if transparent:
+        output = cv2.cvtColor(canvas, cv2.COLOR_BGR2BGRA)
+        np.multiply(gray != 0, 255, out=output[:, :, 3], casting='unsafe')
+        return output
+    output = np.full_like(canvas, 255)
+    cv2.copyTo(canvas, gray, output)
+    return output
+
+
+class CanvasExporter:
+    """
+    Writer thread saving canvas snapshots as PNG.
+
+    max_pending     saves that may wait in the queue; further saves are
+                    dropped instead of blocking the frame loop
+    writer          writer(filename, image, params) -> success, cv2.imwrite
+                    by default
+    """
+    def __init__(self, max_pending=2, writer=cv2.imwrite):
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = None
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='CanvasExporter', daemon=True)
+                self._thread.start()
+
+    def submit(self, snapshot, filename, compression=3, transparent=False, callback=None):
+        """
+        Queues a save of snapshot to filename and returns its ExportJob.
+        callback(job) runs on the writer thread when the job is final.
+        """
+        job = ExportJob(snapshot, filename, compression, transparent, callback)
+        self._start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+            self._finish(job, 'dropped')
+        return job
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            job.status = 'writing'
+            try:
+                with tracer.span('painter.export'):
+                    output = compose_export(job.snapshot.freeze(), job.transparent)
+                    if not self.writer(job.filename, output,
+                                       [cv2.IMWRITE_PNG_COMPRESSION, int(job.compression)]):
+                        raise OSError(f"Could not write {job.filename}")
+                self.saved += 1
+                self._finish(job, 'done')
+            except Exception as e:
+                job.error = e
+                self.failed += 1
+                self._finish(job, 'failed')
+
+    def _finish(self, job, status):
+        job.status = status
+        job.duration = time.perf_counter() - job.submitted
+        # Release the canvas copy
+        job.snapshot = None
+        job.done.set()
+        if job.callback is not None:
+            try:
+                job.callback(job)
+            except Exception as e:
+                print(f"Export callback failed: {e}")
+
+    def close(self, timeout=10.0):
+        """Writes the queued saves and stops the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self):
+        return {'saved': self.saved, 'failed': self.failed, 'dropped': self.dropped,
+                'pending': self._queue.qsize()}
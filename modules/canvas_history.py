@@ -0,0 +1,153 @@
+"""
+Memory-bounded undo/redo for the painter canvas.
+
+Instead of full-canvas copies (2.7 MB per step at 1280x720) every action is
+stored as the set of canvas tiles it changed, with their contents before and
+after. Painter calls touch() with the pixel box it is about to draw into;
+the first touch of a tile in an action saves its old contents, and commit()
+keeps only the tiles that really changed. Undo and redo write back just
+those tiles, so their cost depends on the size of the action and not on how
+deep the history is.
+
+Tiles are zlib-compressed by default: strokes are mostly empty canvas, so a
+64x64 tile of 12 KB usually shrinks to a few hundred bytes. The history
+drops its oldest actions once it holds more than max_bytes.
+"""
+import zlib
+from collections import deque
+
+import numpy as np
+
+
+class CanvasHistory:
+    """
+    Undo and redo stacks of tile deltas of a (height, width, 3) canvas.
+
+    tile_size   side of the square tiles, the painter's ink tile grid
+    max_bytes   memory cap of the stored tiles (undo and redo together)
+    compress    zlib-compress the stored tiles
+    """
+    def __init__(self, canvas, tile_size, max_bytes=64 * 2**20, compress=True):
+        self.canvas = canvas
+        self.tile_size = tile_size
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.tile_rows = -(-canvas.shape[0] // tile_size)
+        self.tile_cols = -(-canvas.shape[1] // tile_size)
+
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.bytes = 0
+        self.evicted = 0
+        # Tiles touched by the action in progress: (row, col) -> contents before
+        self._pending = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def _tile(self, row, col):
+        ts = self.tile_size
+        return self.canvas[row * ts:(row + 1) * ts, col * ts:(col + 1) * ts]
+
+    def touch(self, x0, y0, x1, y1):
+        """Saves the tiles of the pixel box [x0, x1) x [y0, y1) before they are drawn on."""
+        ts = self.tile_size
+        for row in range(max(0, y0 // ts), min(self.tile_rows, -(-y1 // ts))):
+            for col in range(max(0, x0 // ts), min(self.tile_cols, -(-x1 // ts))):
+                if (row, col) not in self._pending:
+                    self._pending[(row, col)] = self._tile(row, col).copy()
+
+    def touch_tiles(self, tiles):
+        """Saves the tiles flagged in a (tile_rows, tile_cols) boolean array."""
+        for row, col in zip(*np.nonzero(tiles)):
+            key = (int(row), int(col))
+            if key not in self._pending:
+                self._pending[key] = self._tile(*key).copy()
+
+    def commit(self):
+        """Ends the action in progress; returns True if it changed the canvas."""
+        if not self._pending:
+            return False
+        tiles = []
+        size = 0
+        for (row, col), before in self._pending.items():
+            after = self._tile(row, col)
+            if np.array_equal(before, after):
+                continue
+            entry = (row, col, before.shape, self._pack(before), self._pack(after))
+            size += len(entry[3]) + len(entry[4])
+            tiles.append(entry)
+        self._pending = {}
+        if not tiles:
+            return False
+
+        self._clear_redo()
+        self.undo_stack.append((tiles, size))
+        self.bytes += size
+        # Oldest actions go first
+        while self.bytes > self.max_bytes and self.undo_stack:
+            _, old_size = self.undo_stack.popleft()
+            self.bytes -= old_size
+            self.evicted += 1
+        return True
+
+    def _pack(self, tile):
+        data = tile.tobytes()
+        return zlib.compress(data, 1) if self.compress else data
+
+    def _unpack(self, data, shape):
+        if self.compress:
+            data = zlib.decompress(data)
+        return np.frombuffer(data, dtype=np.uint8).reshape(shape)
+
+    def _clear_redo(self):
+        for _, size in self.redo_stack:
+            self.bytes -= size
+        self.redo_stack.clear()
+
+    # ------------------------------------------------------------------
+    # Undo / redo
+    # ------------------------------------------------------------------
+    def _apply(self, tiles, which):
+        """Writes the before (3) or after (4) contents back, returns the pixel boxes."""
+        ts = self.tile_size
+        boxes = []
+        for tile in tiles:
+            row, col, shape = tile[:3]
+            self._tile(row, col)[...] = self._unpack(tile[which], shape)
+            boxes.append((col * ts, row * ts, col * ts + shape[1], row * ts + shape[0]))
+        return boxes
+
+    def undo(self):
+        """Reverts the last action; returns the changed pixel boxes (empty if none)."""
+        self.commit()
+        if not self.undo_stack:
+            return []
+        action = self.undo_stack.pop()
+        self.redo_stack.append(action)
+        return self._apply(action[0], 3)
+
+    def redo(self):
+        """Reapplies the last undone action; returns the changed pixel boxes."""
+        if self._pending:
+            # Drawing after an undo starts a new branch
+            self.commit()
+        if not self.redo_stack:
+            return []
+        action = self.redo_stack.pop()
+        self.undo_stack.append(action)
+        return self._apply(action[0], 4)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._pending = {}
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'undo': len(self.undo_stack),
+            'redo': len(self.redo_stack),
+            'bytes': self.bytes,
+            'evicted': self.evicted,
+        }
@@ -0,0 +1,637 @@
+"""
+Виртуальная клавиатура с управлением жестами (модуль GesturePro).
+
+Весь интерфейс клавиатуры (клавиши, строка поиска, меню поисковиков)
+рендерится один раз в кэшированные слои ui.overlay.OverlayLayer и
+накладывается на кадр одной операцией. Слои перерисовываются только при
+смене раскладки, языка, поисковика или введённого текста.
+
+Геометрия клавиш считается один раз на раскладку и размер кадра и
+растеризуется в карту попаданий ui.hit_map.HitMap: клавиша под пальцем
+находится одним чтением из массива, поэтому наведение проверяется каждый
+кадр, а не только при щипке.
+"""
+import cv2
+import time
+import webbrowser
+from urllib.parse import quote
+
+from core.landmarks import INDEX_FINGER_TIP, to_pixels
+from core.state_machine import LANDMARKS, PINCH, SKELETON
+from ui.hit_map import HitMap
+from ui.overlay import OverlayLayer
+
+# ============================================================================
+# НАСТРОЙКИ КЛАВИАТУРЫ
+# ============================================================================
+
+# Раскладки клавиатуры
+KEYBOARD_LAYOUTS = {
+    'en_main': [
+        ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0'],
+        ['q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p'],
+        ['a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l'],
+        ['z', 'x', 'c', 'v', 'b', 'n', 'm', 'Delete']
+    ],
+    'sym_main': [
+        ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0'],
+        ['#', '%', ':', ',', '.', ';', '(', ')', '_'],
+        ['@', '#', '$', '&', '*', '-', '+', '=', '/'],
+        ['[', ']', '{', '}', '<', '>', '?', '!', 'Delete']
+    ]
+}
+
+# ============================================================================
+# ПОИСКОВЫЕ СИСТЕМЫ С АВТООТПРАВКОЙ
+# ============================================================================
+SEARCH_ENGINES = {
+    'Google': {
+        'url': 'https://www.google.com/search?q=',
+        'color': (66, 133, 244)
+    },
+    'YouTube': {
+        'url': 'https://www.youtube.com/results?search_query=',
+        'color': (0, 0, 255)
+    },
+    'Yandex': {
+        'url': 'https://yandex.ru/search/?text=',
+        'color': (255, 0, 0)
+    },
+    'Perplexity': {
+        'url': 'https://www.perplexity.ai/search?q=',
+        'color': (32, 201, 172)
+    }
+}
+
+# ============================================================================
+# ФУНКЦИИ РИСОВАНИЯ
+# ============================================================================
+
+def draw_rounded_rectangle(img, pt1, pt2, color, thickness=-1, radius=12):
+    """Рисует скругленный прямоугольник в стиле Apple"""
+    x1, y1 = pt1
+    x2, y2 = pt2
+
+    if thickness == -1:
+        cv2.rectangle(img, (x1 + radius, y1), (x2 - radius, y2), color, -1)
+        cv2.rectangle(img, (x1, y1 + radius), (x2, y2 - radius), color, -1)
+
+        cv2.circle(img, (x1 + radius, y1 + radius), radius, color, -1)
+        cv2.circle(img, (x2 - radius, y1 + radius), radius, color, -1)
+        cv2.circle(img, (x1 + radius, y2 - radius), radius, color, -1)
+        cv2.circle(img, (x2 - radius, y2 - radius), radius, color, -1)
+    else:
+        cv2.line(img, (x1 + radius, y1), (x2 - radius, y1), color, thickness)
+        cv2.line(img, (x1 + radius, y2), (x2 - radius, y2), color, thickness)
+        cv2.line(img, (x1, y1 + radius), (x1, y2 - radius), color, thickness)
+        cv2.line(img, (x2, y1 + radius), (x2, y2 - radius), color, thickness)
+
+        cv2.ellipse(img, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, color, thickness)
+        cv2.ellipse(img, (x1 + radius, y2 - radius), (radius, radius), 90, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y2 - radius), (radius, radius), 0, 0, 90, color, thickness)
+
+
+# ============================================================================
+# ГЕОМЕТРИЯ
+# ============================================================================
+
+# Нижний ряд: (клавиша, ширина)
+BOTTOM_KEYS = (('SEARCH_SEL', 140), ('LANG', 100), ('SPACE', 350), ('.', 80), ('SEND', 120))
+
+
+def keyboard_geometry(layout_key, frame_width, y_start):
+    """
+    Прямоугольники (x, y, w, h) всех клавиш раскладки. Зависят только от
+    раскладки и размера кадра, поэтому считаются один раз, а не каждый кадр.
+    """
+    layout = KEYBOARD_LAYOUTS[layout_key]
+
+    key_height = 70
+    key_margin = 10
+    row_margin = 12
+
+    key_positions = {}
+    current_y = y_start
+
+    for row in layout:
+        num_keys = len(row)
+
+        total_margin_width = (num_keys - 1) * key_margin
+        available_width = frame_width * 0.95
+        current_key_width = int((available_width - total_margin_width) / num_keys)
+        current_key_width = min(current_key_width, 100)
+
+        total_width = num_keys * current_key_width + (num_keys - 1) * key_margin
+        start_x = (frame_width - total_width) // 2
+
+        for key_idx, key in enumerate(row):
+            x = start_x + key_idx * (current_key_width + key_margin)
+
+            if key == 'Delete':
+                # Delete шире остальных и растёт влево
+                draw_width = int(current_key_width * 1.2)
+                x -= draw_width - current_key_width
+            else:
+                draw_width = current_key_width
+
+            key_positions[key] = (x, current_y, draw_width, key_height)
+
+        current_y += key_height + row_margin
+
+    bottom_row_y = current_y + 5
+    bottom_key_height = key_height + 10
+
+    total_bottom_width = sum(w for _, w in BOTTOM_KEYS) + (len(BOTTOM_KEYS) - 1) * key_margin
+    bottom_x = (frame_width - total_bottom_width) // 2
+
+    for key_name, width in BOTTOM_KEYS:
+        key_positions[key_name] = (bottom_x, bottom_row_y, width, bottom_key_height)
+        bottom_x += width + key_margin
+
+    return key_positions
+
+
+def dropdown_geometry(anchor_rect):
+    """Прямоугольники пунктов меню поисковиков над кнопкой anchor_rect"""
+    anchor_x, anchor_y, _, _ = anchor_rect
+
+    dropdown_width = 220
+    item_height = 50
+    dropdown_y = anchor_y - len(SEARCH_ENGINES) * item_height - 10
+
+    return {engine_name: (anchor_x, dropdown_y + idx * item_height, dropdown_width, item_height)
+            for idx, engine_name in enumerate(SEARCH_ENGINES)}
+
+
+class VirtualKeyboard:
+    """
+    Виртуальная клавиатура: нажатие клавиш "щипком" (указательный + большой палец).
+
+    Клавиша под указательным пальцем подсвечивается каждый кадр. При
+    dwell_time (секунды) клавиша нажимается и без щипка, если палец
+    задержался на ней это время.
+    """
+    # Стадии конвейера, которые читает update() (см. core.state_machine):
+    # пальцы не классифицируются, нужен только щипок
+    stages = frozenset((LANDMARKS, PINCH, SKELETON))
+
+    def __init__(self, frame_width, frame_height, dwell_time=None):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.keyboard_y_start = frame_height - 500
+
+        # Состояние приложения
+        self.current_layout = 'en_main'
+        self.current_language = 'EN'
+        self.current_search_engine = 'Google'
+        self.text_input = ""
+        self.last_click_time = 0
+        self.click_delay = 0.5
+        self.show_dropdown = False
+        self.pinch_was_active = False
+
+        # Наведение и нажатие задержкой
+        self.dwell_time = dwell_time
+        self.hover_key = None
+        self._hover_since = None
+        self._dwell_fired = False
+
+        # Геометрия и карты попаданий: (ключ геометрии, карта)
+        self.key_positions = {}
+        self.dropdown_positions = {}
+        self._key_map = (None, None)
+        self._dropdown_map = (None, None)
+
+        # Кэш слоёв: (ключ состояния, слой)
+        self._keyboard_cache = (None, None)
+        self._search_bar_cache = (None, None)
+        self._dropdown_cache = (None, None)
+        self.layer_renders = 0
+
+    # ------------------------------------------------------------------
+    # Кэшированные слои
+    # ------------------------------------------------------------------
+    def _render_layer(self, rows, draw):
+        """
+        Рисует draw(img) на холсте высотой rows (координаты как у кадра)
+        и возвращает (слой, результат draw).
+        """
+        self.layer_renders += 1
+        shape = (max(1, min(rows, self.frame_height)), self.frame_width, 3)
+        return OverlayLayer.render(shape, draw)
+
+    def keyboard_layer(self):
+        """Слой клавиатуры, перерисовывается при смене раскладки, языка или поисковика"""
+        key = (self.current_layout, self.current_language, self.current_search_engine,
+               self.frame_width, self.frame_height)
+        if self._keyboard_cache[0] != key:
+            def draw(img):
+                self.draw_keyboard(img, self.current_layout, self.keyboard_y_start)
+                self.draw_instructions(img)
+            layer, _ = self._render_layer(self.frame_height, draw)
+            self._keyboard_cache = (key, layer)
+        return self._keyboard_cache[1]
+
+    # ------------------------------------------------------------------
+    # Геометрия
+    # ------------------------------------------------------------------
+    def key_map(self):
+        """
+        Карта попаданий клавиш, пересчитывается только при смене раскладки
+        или размера кадра.
+        """
+        key = (self.current_layout, self.frame_width, self.frame_height, self.keyboard_y_start)
+        if self._key_map[0] != key:
+            self.key_positions = keyboard_geometry(self.current_layout, self.frame_width,
+                                                   self.keyboard_y_start)
+            self._key_map = (key, HitMap(self.key_positions, self.frame_width, self.frame_height))
+        return self._key_map[1]
+
+    def dropdown_map(self):
+        """Карта попаданий пунктов меню поисковиков"""
+        anchor_rect = self.key_map().rect('SEARCH_SEL')
+        key = (anchor_rect, self.frame_width, self.frame_height)
+        if self._dropdown_map[0] != key:
+            self.dropdown_positions = dropdown_geometry(anchor_rect)
+            self._dropdown_map = (key, HitMap(self.dropdown_positions, self.frame_width, self.frame_height))
+        return self._dropdown_map[1]
+
+    def search_bar_layer(self):
+        """Слой строки поиска, перерисовывается при изменении текста"""
+        key = (self.text_input, self.frame_width)
+        if self._search_bar_cache[0] != key:
+            layer, _ = self._render_layer(200, self.draw_search_bar)
+            self._search_bar_cache = (key, layer)
+        return self._search_bar_cache[1]
+
+    def dropdown_layer(self, anchor_rect):
+        """Слой меню поисковиков, перерисовывается при смене поисковика"""
+        key = (self.current_search_engine, anchor_rect)
+        if self._dropdown_cache[0] != key:
+            def draw(img):
+                return self.draw_dropdown_menu(img, anchor_rect)
+            layer, _ = self._render_layer(anchor_rect[1], draw)
+            self._dropdown_cache = (key, layer)
+        return self._dropdown_cache[1]
+
+    # ------------------------------------------------------------------
+    # Рисование
+    # ------------------------------------------------------------------
+    def draw_dropdown_menu(self, img, anchor_rect):
+        """Рисует выпадающее меню выбора поисковой системы (вверх от кнопки)"""
+        dropdown_positions = dropdown_geometry(anchor_rect)
+        dropdown_x, dropdown_y, dropdown_width, item_height = next(iter(dropdown_positions.values()))
+        dropdown_height = len(dropdown_positions) * item_height
+
+        # Фон меню
+        draw_rounded_rectangle(img,
+                              (dropdown_x, dropdown_y),
+                              (dropdown_x + dropdown_width, dropdown_y + dropdown_height),
+                              (255, 255, 255), -1, 10)
+
+        # Граница
+        draw_rounded_rectangle(img,
+                              (dropdown_x, dropdown_y),
+                              (dropdown_x + dropdown_width, dropdown_y + dropdown_height),
+                              (204, 204, 204), 2, 10)
+
+        # Элементы меню
+        for idx, (engine_name, engine_data) in enumerate(SEARCH_ENGINES.items()):
+            item_y = dropdown_y + idx * item_height
+
+            # Подсветка выбранного
+            if engine_name == self.current_search_engine:
+                draw_rounded_rectangle(img,
+                                      (dropdown_x + 5, item_y + 5),
+                                      (dropdown_x + dropdown_width - 5, item_y + item_height - 5),
+                                      (0, 122, 255), -1, 8)
+                text_color = (255, 255, 255)
+            else:
+                text_color = (0, 0, 0)
+
+            # Цветной индикатор
+            cv2.circle(img, (dropdown_x + 20, item_y + item_height // 2), 6,
+                      engine_data['color'], -1)
+
+            # Название
+            cv2.putText(img, engine_name,
+                       (dropdown_x + 40, item_y + item_height // 2 + 7),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 2)
+
+            # Разделитель
+            if idx < len(SEARCH_ENGINES) - 1:
+                cv2.line(img,
+                        (dropdown_x + 10, item_y + item_height),
+                        (dropdown_x + dropdown_width - 10, item_y + item_height),
+                        (230, 230, 230), 1)
+
+        return dropdown_positions
+
+    def draw_keyboard(self, img, layout_key, y_start):
+        """Рисует клавиатуру в минималистичном стиле Apple"""
+        key_positions = keyboard_geometry(layout_key, self.frame_width, y_start)
+
+        search_selector_color = SEARCH_ENGINES[self.current_search_engine]['color']
+        bottom_keys = {
+            'SEARCH_SEL': (search_selector_color, self.current_search_engine.split(' ')[0]),
+            'LANG': ((255, 255, 255), self.current_language),
+            'SPACE': ((255, 255, 255), 'space'),
+            '.': ((255, 255, 255), '.'),
+            'SEND': ((0, 122, 255), 'Send'),
+        }
+
+        for key, (x, y, draw_width, key_height) in key_positions.items():
+            if key in bottom_keys:
+                continue
+
+            if key == 'Delete':
+                key_color = (120, 60, 60)
+            else:
+                key_color = (255, 255, 255)
+
+            draw_rounded_rectangle(img,
+                                  (x, y),
+                                  (x + draw_width, y + key_height),
+                                  key_color, -1, 8)
+
+            draw_rounded_rectangle(img,
+                                  (x, y),
+                                  (x + draw_width, y + key_height),
+                                  (224, 224, 224), 2, 8)
+
+            display_text = key
+            text_size = cv2.getTextSize(display_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+            text_x = x + (draw_width - text_size[0]) // 2
+            text_y = y + (key_height + text_size[1]) // 2
+
+            text_color = (255, 255, 255) if key == 'Delete' else (0, 0, 0)
+            cv2.putText(img, display_text, (text_x, text_y),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.9, text_color, 2)
+
+        # Нижний ряд с крупными кнопками
+        for key_name, (color, display) in bottom_keys.items():
+            bottom_x, bottom_row_y, width, bottom_key_height = key_positions[key_name]
+
+            draw_rounded_rectangle(img,
+                                  (bottom_x, bottom_row_y),
+                                  (bottom_x + width, bottom_row_y + bottom_key_height),
+                                  color, -1, 10)
+
+            border_color = (224, 224, 224) if key_name not in ['SEND', 'SEARCH_SEL'] else color
+            draw_rounded_rectangle(img,
+                                  (bottom_x, bottom_row_y),
+                                  (bottom_x + width, bottom_row_y + bottom_key_height),
+                                  border_color, 2, 10)
+
+            if key_name == 'SEARCH_SEL':
+                r, g, b = color
+                if (r*0.299 + g*0.587 + b*0.114) > 186:
+                    text_color = (0, 0, 0)
+                else:
+                    text_color = (255, 255, 255)
+            elif key_name == 'SEND':
+                text_color = (255, 255, 255)
+            else:
+                text_color = (0, 0, 0)
+
+            text_size = cv2.getTextSize(display, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
+            text_x = bottom_x + (width - text_size[0]) // 2
+            text_y = bottom_row_y + (bottom_key_height + text_size[1]) // 2
+
+            cv2.putText(img, display, (text_x, text_y),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, text_color, 2)
+
+        return key_positions
+
+    def draw_search_bar(self, img):
+        """Рисует строку поиска в минималистичном стиле"""
+        frame_width = self.frame_width
+        bar_height = 80
+        bar_y = 40
+
+        shadow_offset = 2
+        draw_rounded_rectangle(img,
+                              (20 + shadow_offset, bar_y + shadow_offset),
+                              (frame_width - 20 + shadow_offset, bar_y + bar_height + shadow_offset),
+                              (200, 200, 200), -1, 12)
+
+        draw_rounded_rectangle(img,
+                              (20, bar_y),
+                              (frame_width - 20, bar_y + bar_height),
+                              (255, 255, 255), -1, 12)
+
+        draw_rounded_rectangle(img,
+                              (20, bar_y),
+                              (frame_width - 20, bar_y + bar_height),
+                              (204, 204, 204), 2, 12)
+
+        input_x = 40
+
+        if self.text_input:
+            display_text = self.text_input
+            text_color = (0, 0, 0)
+        else:
+            display_text = "Enter search text..."
+            text_color = (150, 150, 150)
+
+        max_chars = 80
+        if len(display_text) > max_chars:
+            display_text = "..." + display_text[-(max_chars-3):]
+
+        cv2.putText(img, display_text, (input_x + 15, bar_y + bar_height // 2 + 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, text_color, 2)
+
+        return {
+            'input': (input_x, bar_y + 10, frame_width - 80, bar_height - 20)
+        }
+
+    def draw_instructions(self, img):
+        """Подсказка внизу кадра"""
+        instruction_text = " Pinch to press"
+        text_size = cv2.getTextSize(instruction_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+        cv2.putText(img, instruction_text,
+                   ((self.frame_width - text_size[0]) // 2, self.frame_height - 20),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+    # ------------------------------------------------------------------
+    # Логика
+    # ------------------------------------------------------------------
+    def check_key_press(self, x, y):
+        """Проверяет, какая клавиша нажата"""
+        return self.key_map().lookup(x, y)
+
+    def check_dropdown_click(self, x, y):
+        """Проверяет клик по dropdown меню"""
+        return self.dropdown_map().lookup(x, y)
+
+    def perform_search(self):
+        """Выполняет поиск в выбранной системе с автоотправкой"""
+        if not self.text_input.strip():
+            print("⚠️ Текст пуст, нечего искать")
+            return
+
+        engine = SEARCH_ENGINES[self.current_search_engine]
+
+        print(f"🔎 Поиск в {self.current_search_engine}: {self.text_input}")
+
+        try:
+            url = engine['url'] + quote(self.text_input)
+            print(f"🌐 URL: {url}")
+            webbrowser.open(url)
+            print("✅ Браузер открыт!")
+
+        except Exception as e:
+            print(f"❌ Ошибка открытия браузера: {e}")
+
+        self.text_input = ""
+
+    def handle_key_press(self, key):
+        """Обрабатывает нажатие клавиши"""
+        current_time = time.time()
+
+        if current_time - self.last_click_time < self.click_delay:
+            return
+
+        self.last_click_time = current_time
+
+        if key == 'SPACE':
+            self.text_input += ' '
+            print("⌨️  Пробел")
+        elif key == 'Delete':
+            self.text_input = self.text_input[:-1]
+            print("⌨️  Удаление")
+        elif key == 'LANG':
+            if self.current_language == 'EN':
+                self.current_language = 'SYM'
+                self.current_layout = 'sym_main'
+                print("⌨️  Режим: Символы")
+            else:
+                self.current_language = 'EN'
+                self.current_layout = 'en_main'
+                print("⌨️  Language: English")
+        elif key == 'SEND':
+            self.perform_search()
+        elif key == 'SEARCH_SEL':
+            pass
+        else:
+            self.text_input += key
+            print(f"⌨️  Нажата: '{key}' | Текст: {self.text_input}")
+
+    def activate(self, target, frame, current_time):
+        """Нажимает клавишу или пункт меню target (щипком или задержкой)"""
+        if self.show_dropdown:
+            if target:
+                self.current_search_engine = target
+                self.show_dropdown = False
+                self.last_click_time = current_time
+                print(f"🔄 Выбран поисковик: {self.current_search_engine}")
+            return
+
+        if target == 'SEARCH_SEL':
+            self.show_dropdown = True
+            self.last_click_time = current_time
+            print("📋 Dropdown меню открыто")
+
+        elif target:
+            kx, ky, kw, kh = self.key_positions[target]
+
+            # Подсветка нажатой клавиши рисуется поверх слоя прямо на кадре
+            draw_rounded_rectangle(frame, (kx-2, ky-2), (kx + kw+2, ky + kh+2),
+                        (0, 255, 0), 4, 10)
+
+            self.handle_key_press(target)
+
+    def hover(self, x, y):
+        """Обновляет клавишу (или пункт меню) под пальцем, возвращает её"""
+        if x is None:
+            target = None
+        elif self.show_dropdown:
+            target = self.check_dropdown_click(x, y)
+        else:
+            target = self.check_key_press(x, y)
+
+        if target != self.hover_key:
+            self.hover_key = target
+            self._hover_since = time.time()
+            self._dwell_fired = False
+        return target
+
+    def on_exit(self):
+        """Сбрасывает щипок и наведение при переключении в другой режим"""
+        self.pinch_was_active = False
+        self.hover(None, None)
+
+    def dwell_progress(self, current_time):
+        """Доля dwell_time, которую палец провёл на текущей клавише (0..1)"""
+        if not self.dwell_time or self.hover_key is None or self._dwell_fired:
+            return 0.0
+        return min(1.0, (current_time - self._hover_since) / self.dwell_time)
+
+    def draw_hover(self, frame, current_time):
+        """Контур клавиши под пальцем и индикатор задержки"""
+        positions = self.dropdown_positions if self.show_dropdown else self.key_positions
+        rect = positions.get(self.hover_key)
+        if rect is None:
+            return
+        kx, ky, kw, kh = rect
+        draw_rounded_rectangle(frame, (kx-1, ky-1), (kx + kw+1, ky + kh+1),
+                               (0, 122, 255), 2, 10)
+        progress = self.dwell_progress(current_time)
+        if progress > 0:
+            cv2.ellipse(frame, (kx + kw - 14, ky + 14), (9, 9), -90, 0, int(360 * progress),
+                        (0, 122, 255), 3)
+
+    def update(self, frame, results, gesture_engine):
+        """Обрабатывает кадр: рисует интерфейс и обрабатывает щипки"""
+        self.key_map()
+        self.search_bar_layer().blend(frame)
+        self.keyboard_layer().blend(frame)
+        if self.show_dropdown:
+            self.dropdown_map()
+            self.dropdown_layer(self.key_positions['SEARCH_SEL']).blend(frame)
+
+        current_time = time.time()
+        pinch_active = False
+
+        # Наведение: указательный палец первой руки, одно чтение из карты попаданий
+        tip = None
+        if gesture_engine.detected_hands:
+            tip = to_pixels(gesture_engine.detected_hands[0].landmarks, INDEX_FINGER_TIP,
+                            self.frame_width, self.frame_height)
+        self.hover(*(tip or (None, None)))
+
+        gesture_engine.draw_hands(frame, style='keyboard')
+        for i, hand in enumerate(gesture_engine.detected_hands):
+            # Щипок определяет GestureDetector движка
+            if 'pinch' not in gesture_engine.gestures.active[i]:
+                continue
+
+            pinch_active = True
+            x, y = to_pixels(hand.landmarks, INDEX_FINGER_TIP, self.frame_width, self.frame_height)
+
+            cv2.circle(frame, (x, y), 25, (0, 255, 255), 3)
+            cv2.circle(frame, (x, y), 12, (0, 255, 255), -1)
+
+            if self.pinch_was_active:
+                continue
+
+            if current_time - self.last_click_time < self.click_delay:
+                continue
+
+            if self.show_dropdown:
+                self.activate(self.check_dropdown_click(x, y), frame, current_time)
+            else:
+                self.activate(self.check_key_press(x, y), frame, current_time)
+            # Щипок уже нажал клавишу под пальцем, задержка не нужна
+            self._dwell_fired = True
+
+        # Нажатие задержкой: палец dwell_time на одной клавише без щипка
+        if not pinch_active and self.dwell_progress(current_time) >= 1.0 \
+                and current_time - self.last_click_time >= self.click_delay:
+            self._dwell_fired = True
+            self.activate(self.hover_key, frame, current_time)
+
+        self.draw_hover(frame, current_time)
+        self.pinch_was_active = pinch_active
+        return frame
@@ -0,0 +1,353 @@
+"""
+Gesture mouse: the index fingertip moves the system cursor and a pinch holds
+the left button (a click, or a drag while the pinch is held).
+
+Hands arrive at camera rate (about 30 Hz), while displays refresh at 60 to
+144 Hz, so moving the cursor once per frame looks like stutter. The frame
+loop therefore only hands the smoothed fingertip target to a CursorDriver,
+whose own thread moves the cursor at display rate (mouse.rate_hz). Between
+hand updates it extrapolates the newest target along its velocity, for at
+most mouse.predict_ms, and eases the cursor towards that point, so the
+cursor glides through the camera frames instead of jumping at every one.
+
+Mapping from the frame to the screen (mouse.* in config.yaml):
+  dead_zone         edge strip of the frame, on every side, that is not used
+                    (hands are lost near the edges)
+  sensitivity       the rest of the frame is shrunk around its centre by
+                    this factor, so less hand travel crosses the screen
+  precision_scale   while the precision gesture (V sign) is held the cursor
+                    moves relative to where precision started, this much
+                    slower, for fine targeting
+
+The cursor is injected through a backend: PyAutoGUIBackend by default, or
+RecordingBackend, which records timestamped moves and button events so
+cursor timing and smoothness can be measured headless
+(benchmarks.cursor_benchmark).
+"""
+import math
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from core.config_manager import MouseConfig
+from core.landmarks import INDEX_FINGER_TIP
+from core.state_machine import FINGERS, LANDMARKS, PINCH, SKELETON
+
+# Gestures (see utils.gesture_detector) of the primary hand
+CLICK_GESTURE = 'pinch'
+PRECISION_GESTURE = 'peace'
+
+
+class RecordingBackend:
+    """Backend that records cursor output instead of moving anything."""
+    def __init__(self, width=1920, height=1080):
+        self.width = width
+        self.height = height
+        # (perf_counter, x, y) and (perf_counter, 'press' or 'release', button)
+        self.moves = []
+        self.buttons = []
+
+    def screen_size(self):
+        return self.width, self.height
+
+    def move(self, x, y):
+        self.moves.append((time.perf_counter(), x, y))
+
+    def press(self, button='left'):
+        self.buttons.append((time.perf_counter(), 'press', button))
+
+    def release(self, button='left'):
+        self.buttons.append((time.perf_counter(), 'release', button))
+
+
+class PyAutoGUIBackend:
+    """The system cursor through PyAutoGUI (imported on creation)."""
+    def __init__(self):
+        import pyautogui
+        # PyAutoGUI sleeps after every call by default
+        pyautogui.PAUSE = 0
+        self._gui = pyautogui
+
+    def screen_size(self):
+        width, height = self._gui.size()
+        return int(width), int(height)
+
+    def move(self, x, y):
+        self._gui.moveTo(x, y, _pause=False)
+
+    def press(self, button='left'):
+        self._gui.mouseDown(button=button, _pause=False)
+
+    def release(self, button='left'):
+        self._gui.mouseUp(button=button, _pause=False)
+
+
+class CursorTrack:
+    """
+    Newest cursor target (screen pixels) pushed by the frame loop and its
+    velocity. target(t) extrapolates it to time t, at most max_extrapolation
+    seconds ahead. Safe to push and read from different threads.
+    """
+    def __init__(self, max_extrapolation=0.08):
+        self.max_extrapolation = max_extrapolation
+        self._lock = threading.Lock()
+        self._sample = None
+        self._velocity = (0.0, 0.0)
+
+    def push(self, timestamp, x, y, jump=False):
+        """
+        Adds a target. jump=True starts a new motion (the mapping changed),
+        so no velocity is measured across it.
+        """
+        with self._lock:
+            last = self._sample
+            if last is None or jump or timestamp <= last[0]:
+                self._velocity = (0.0, 0.0)
+            else:
+                dt = timestamp - last[0]
+                self._velocity = ((x - last[1]) / dt, (y - last[2]) / dt)
+            self._sample = (timestamp, x, y)
+
+    def clear(self):
+        """No target (the hand is gone): the cursor stays where it is."""
+        with self._lock:
+            self._sample = None
+            self._velocity = (0.0, 0.0)
+
+    def target(self, timestamp):
+        with self._lock:
+            if self._sample is None:
+                return None
+            t, x, y = self._sample
+            vx, vy = self._velocity
+        ahead = min(max(timestamp - t, 0.0), self.max_extrapolation)
+        return x + vx * ahead, y + vy * ahead
+
+
+class CursorDriver:
+    """
+    Cursor thread: every 1/rate_hz seconds it eases the cursor towards the
+    extrapolated target of track and sends the new pixel to backend. Button
+    events are queued and sent by the same thread, after the move.
+
+    smoothing   share of the remaining distance kept after 1/60 s, so the
+                feel does not depend on rate_hz; 0 jumps straight to the
+                target
+
+    Easing trails a moving target by its time constant, so the target is
+    extrapolated that much further (lead()); at constant hand speed the
+    cursor then sits on the extrapolated fingertip instead of behind it.
+    """
+    def __init__(self, backend, rate_hz=120.0, smoothing=0.7, max_extrapolation=0.08):
+        self.backend = backend
+        self.rate_hz = rate_hz
+        self.smoothing = smoothing
+        self.track = CursorTrack(max_extrapolation)
+        self.width, self.height = backend.screen_size()
+        self.position = None
+        self.pixel = None
+        self.error = None
+        self._buttons = deque()
+        self._last_tick = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.ticks = 0
+        self.moves = 0
+        self.late_ticks = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._last_tick = None
+        self._thread = threading.Thread(target=self._run, name='CursorDriver', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the thread after sending the queued button events."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._send_buttons()
+
+    def press(self, button='left'):
+        self._buttons.append(('press', button))
+
+    def release(self, button='left'):
+        self._buttons.append(('release', button))
+
+    def lead(self):
+        """Time constant of the easing in seconds."""
+        if self.smoothing <= 0.0:
+            return 0.0
+        return -1.0 / (60.0 * math.log(self.smoothing))
+
+    def step(self, now):
+        """One tick at time now (perf_counter); returns the cursor pixel or None."""
+        target = self.track.target(now + self.lead())
+        if target is not None:
+            tx = min(max(target[0], 0.0), self.width - 1.0)
+            ty = min(max(target[1], 0.0), self.height - 1.0)
+            if self.position is None or self._last_tick is None:
+                self.position = (tx, ty)
+            else:
+                keep = self.smoothing ** ((now - self._last_tick) * 60.0)
+                x, y = self.position
+                self.position = (tx + (x - tx) * keep, ty + (y - ty) * keep)
+            pixel = (int(round(self.position[0])), int(round(self.position[1])))
+            if pixel != self.pixel:
+                self.backend.move(*pixel)
+                self.pixel = pixel
+                self.moves += 1
+        self._last_tick = now
+        self._send_buttons()
+        self.ticks += 1
+        return self.pixel
+
+    def _send_buttons(self):
+        while self._buttons:
+            action, button = self._buttons.popleft()
+            getattr(self.backend, action)(button)
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            try:
+                self.step(now)
+            except Exception as e:
+                # e.g. PyAutoGUI's fail-safe (cursor in a screen corner)
+                self.error = e
+                print(f"Cursor stopped: {e}")
+                break
+            period = 1.0 / self.rate_hz
+            next_tick += period
+            if next_tick < now:
+                # Fell behind: skip the missed ticks instead of bursting
+                self.late_ticks += 1
+                next_tick = now + period
+            self._stop.wait(max(0.0, next_tick - time.perf_counter()))
+
+    def stats(self):
+        return {'ticks': self.ticks, 'moves': self.moves, 'late_ticks': self.late_ticks,
+                'rate_hz': self.rate_hz, 'error': None if self.error is None else repr(self.error)}
+
+
+class MouseControl:
+    """
+    Mouse mode. The cursor thread runs while the mode is active (see
+    core.state_machine); config is a core.config_manager.MouseConfig.
+    """
+    stages = frozenset((LANDMARKS, FINGERS, PINCH, SKELETON))
+
+    def __init__(self, frame_width, frame_height, config=None, backend=None):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.backend = PyAutoGUIBackend() if backend is None else backend
+        self.driver = CursorDriver(self.backend)
+        self.configure(MouseConfig() if config is None else config)
+        self.precision = False
+        self.button_down = False
+        # (hand x, hand y, cursor x, cursor y) where precision started
+        self._anchor = None
+
+    def configure(self, config):
+        """Applies a MouseConfig, also while running (config reload)."""
+        self.config = config
+        self.sensitivity = max(config.sensitivity, 0.1)
+        self.dead_zone = min(max(config.dead_zone, 0.0), 0.45)
+        self.precision_scale = config.precision_scale
+        self.driver.rate_hz = max(config.rate_hz, 1.0)
+        self.driver.smoothing = min(max(config.smoothing, 0.0), 0.99)
+        self.driver.track.max_extrapolation = max(config.predict_ms, 0.0) / 1000.0
+
+    def active_area(self):
+        """Normalized (x0, y0, x1, y1) of the frame area mapped onto the screen."""
+        half = (0.5 - self.dead_zone) / self.sensitivity
+        return 0.5 - half, 0.5 - half, 0.5 + half, 0.5 + half
+
+    def to_screen(self, x, y):
+        """Normalized hand position to screen pixels (not clamped)."""
+        x0, y0, x1, y1 = self.active_area()
+        return ((x - x0) / (x1 - x0) * (self.driver.width - 1),
+                (y - y0) / (y1 - y0) * (self.driver.height - 1))
+
+    def target(self, x, y, precision):
+        """
+        Cursor target for the fingertip at normalized (x, y). Returns
+        (x, y, jump); jump is True when the mapping just changed.
+        """
+        jump = precision != self.precision
+        self.precision = precision
+        if not precision:
+            self._anchor = None
+            return (*self.to_screen(x, y), jump)
+        if self._anchor is None:
+            cursor = self.driver.position or self.to_screen(x, y)
+            self._anchor = (x, y, *cursor)
+        hx, hy, cx, cy = self._anchor
+        sx, sy = self.to_screen(x, y)
+        ax, ay = self.to_screen(hx, hy)
+        return cx + (sx - ax) * self.precision_scale, cy + (sy - ay) * self.precision_scale, jump
+
+    def on_enter(self):
+        self.driver.start()
+
+    def on_exit(self):
+        self._set_button(False)
+        self.driver.track.clear()
+        self.driver.close()
+
+    def update(self, frame, results, gesture_engine):
+        """Feeds the primary hand's fingertip to the cursor thread and draws the mode."""
+        if not self.driver.running and self.driver.error is None:
+            self.driver.start()
+        now = time.perf_counter()
+        hands = gesture_engine.detected_hands
+        if hands:
+            hand = hands[0]
+            active = gesture_engine.gestures.active[0]
+            gesture_engine.draw_landmarks(frame, hand)
+            x, y = hand.landmarks[INDEX_FINGER_TIP, :2].tolist()
+            tx, ty, jump = self.target(x, y, PRECISION_GESTURE in active)
+            self.driver.track.push(now, tx, ty, jump=jump)
+            self._set_button(CLICK_GESTURE in active)
+            tip = (int(x * self.frame_width), int(y * self.frame_height))
+            cv2.circle(frame, tip, 10, (0, 255, 255) if self.button_down else (255, 0, 255), -1)
+        else:
+            # A lost hand lets go of the button and parks the cursor
+            self.driver.track.clear()
+            self._set_button(False)
+            self.precision = False
+            self._anchor = None
+
+        x0, y0, x1, y1 = self.active_area()
+        cv2.rectangle(frame, (int(x0 * self.frame_width), int(y0 * self.frame_height)),
+                      (int(x1 * self.frame_width), int(y1 * self.frame_height)), (255, 0, 255), 2)
+        label = "MOUSE: PRECISION" if self.precision else "MOUSE"
+        cv2.putText(frame, label, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 255), 2)
+        return frame
+
+    def _set_button(self, down):
+        if down != self.button_down:
+            self.button_down = down
+            if down:
+                self.driver.press()
+            else:
+                self.driver.release()
+
+    def close(self):
+        self.on_exit()
+
+    def stats(self):
+        return self.driver.stats()
@@ -3,6 +3,14 @@ import numpy as np
 import math
 import time
 
+from core.landmarks import INDEX_FINGER_TIP, THUMB_TIP, to_pixels
+from core.state_machine import FINGERS, LANDMARKS, SKELETON
+from modules.canvas_export import CanvasExporter, CanvasSnapshot
+from modules.canvas_history import CanvasHistory
+from modules.vector_canvas import KIND_CIRCLE, KIND_RECT, KIND_TRIANGLE, VectorCanvas
+from ui.overlay import Compositor
+from utils.logger import tracer
+
 # Constants for Modes
 MODE_DRAW = "DRAW"
 MODE_ERASE = "ERASE"
@@ -10,21 +18,74 @@ MODE_CLEAR = "CLEAR"
 MODE_SHAPE = "SHAPE"
 MODE_IDLE = "IDLE"
 
+# Gesture (see utils.gesture_detector) to mode, the first active one wins
+GESTURE_MODES = (
+    ('open_palm', MODE_CLEAR),
+    ('thumb', MODE_ERASE),
+    ('point', MODE_DRAW),
+)
+
 # Constants for Shapes
 SHAPE_CIRCLE = "CIRCLE"
 SHAPE_RECT = "RECT"
 SHAPE_SQUARE = "SQUARE"
 SHAPE_TRIANGLE = "TRIANGLE"
 
+# Side of the square tiles used to track which parts of the canvas hold ink
+TILE_SIZE = 64
+
+# Height of the info panel below the video
+INFO_PANEL_HEIGHT = 140
+
+class HandState:
+    """Drawing state of one hand."""
+    __slots__ = ('mode', 'prev', 'clear_start_time', 'shape_start', 'shape_end')
+
+    def __init__(self):
+        self.mode = MODE_IDLE
+        self.prev = None
+        self.clear_start_time = None
+        self.shape_start = None
+        self.shape_end = None
+
 class Painter:
     """
     Virtual drawing module with gesture control and shape support.
+
+    Every stroke, shape, erase and clear is one undo step; history_bytes caps
+    the memory of the undo/redo history. With vector=True everything drawn is
+    also recorded in self.vector (see modules.vector_canvas), from which the
+    raster canvas can be rebuilt at any resolution.
     """
-    def __init__(self, frame_width=1280, frame_height=720):
+    # Pipeline stages read by update(), see core.state_machine
+    stages = frozenset((LANDMARKS, FINGERS, SKELETON))
+
+    def __init__(self, frame_width=1280, frame_height=720, history_bytes=64 * 2**20, vector=False):
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.canvas = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
         
+        # Compositing state: a persistent ink mask updated only where we draw,
+        # and a per-tile flag telling which tiles have any ink at all
+        self.canvas_mask = np.zeros((frame_height, frame_width), dtype=np.uint8)
+        self.tile_rows = -(-frame_height // TILE_SIZE)
+        self.tile_cols = -(-frame_width // TILE_SIZE)
+        self.ink_tiles = np.zeros((self.tile_rows, self.tile_cols), dtype=bool)
+        
+        # Undo/redo as tile deltas on the same tile grid
+        self.history = CanvasHistory(self.canvas, TILE_SIZE, max_bytes=history_bytes)
+        self.vector = VectorCanvas(frame_width, frame_height) if vector else None
+        
+        # Background saving: the writer thread starts on the first save and
+        # pending saves hold copy-on-write snapshots of the canvas
+        self.exporter = None
+        self.last_export = None
+        self._snapshots = []
+        
+        # Output frames (video + info panel) are composed in reused buffers
+        self.compositor = Compositor(frame_width, frame_height, INFO_PANEL_HEIGHT)
+        self._panel_state = None
+        
         # Drawing Settings
         self.colors = {
             'red': (0, 0, 255),
@@ -42,31 +103,21 @@ class Painter:
         self.brush_thickness = 5
         self.eraser_thickness = 30
         
-        # State
+        # State: mode of the primary hand, and per-hand stroke state keyed by
+        # Hand.id (or index, for hands without one)
         self.current_mode = MODE_IDLE
         self.current_shape = None
-        self.prev_x, self.prev_y = None, None
+        self.hands = {}
         
         # Clearing logic
-        self.clear_start_time = None
         self.clear_delay = 1.5
-        
-        # Shape logic
-        self.shape_start = None
-        self.shape_end = None
 
-    def detect_mode(self, fingers):
-        """Maps fingers up to modes."""
-        fingers_up_count = sum(fingers.values())
-        
-        if fingers_up_count == 5:
-            return MODE_CLEAR
-        elif fingers['thumb'] and fingers_up_count == 1:
-            return MODE_ERASE
-        elif fingers['index'] and fingers_up_count == 1:
-            return MODE_DRAW
-        else:
-            return MODE_IDLE
+    def detect_mode(self, gestures):
+        """Maps the active gestures of a hand to a mode."""
+        for gesture, mode in GESTURE_MODES:
+            if gesture in gestures:
+                return mode
+        return MODE_IDLE
 
     def draw_shapes_preview(self, frame, start, end, shape, color):
         """Draws a preview of the selected shape on the current frame."""
@@ -91,139 +142,310 @@ class Painter:
             cv2.circle(frame, start, 5, (0, 255, 0), -1)
 
     def draw_shapes_final(self, start, end, shape, color, thickness):
-        """Draws the final shape on the persistent canvas."""
+        """Draws the final shape on the persistent canvas as one undo step."""
         if shape == SHAPE_CIRCLE:
             radius = int(math.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2))
-            cv2.circle(self.canvas, start, radius, color, thickness)
-        elif shape == SHAPE_RECT:
-            cv2.rectangle(self.canvas, start, end, color, thickness)
+            corners = [(start[0] - radius, start[1] - radius), (start[0] + radius, start[1] + radius)]
         elif shape == SHAPE_SQUARE:
             dx, dy = end[0] - start[0], end[1] - start[1]
             side = max(abs(dx), abs(dy))
-            end_x = start[0] + side * (1 if dx > 0 else -1)
-            end_y = start[1] + side * (1 if dy > 0 else -1)
-            cv2.rectangle(self.canvas, start, (end_x, end_y), color, thickness)
-        elif shape == SHAPE_TRIANGLE:
+            end = (start[0] + side * (1 if dx > 0 else -1), start[1] + side * (1 if dy > 0 else -1))
+            corners = [start, end]
+        elif shape in (SHAPE_RECT, SHAPE_TRIANGLE):
+            corners = [start, end]
+        else:
+            return
+        self.commit_action()
+        box = self._points_box(corners, thickness)
+        self._before_change()
+        self.history.touch(*box)
+        if self.vector is not None:
+            kind = KIND_CIRCLE if shape == SHAPE_CIRCLE else KIND_TRIANGLE if shape == SHAPE_TRIANGLE else KIND_RECT
+            self.vector.add_shape(kind, start, end, color, thickness, time.time())
+
+        if shape == SHAPE_CIRCLE:
+            cv2.circle(self.canvas, start, radius, color, thickness)
+        elif shape in (SHAPE_RECT, SHAPE_SQUARE):
+            cv2.rectangle(self.canvas, start, end, color, thickness)
+        else:
             cv2.line(self.canvas, start, (end[0], start[1]), color, thickness)
             cv2.line(self.canvas, (end[0], start[1]), end, color, thickness)
             cv2.line(self.canvas, end, start, color, thickness)
+        self.mark_dirty(*box)
+        self.commit_action()
+
+    def draw_line(self, start, end, color, thickness):
+        """
+        Draws a line segment on the persistent canvas. Segments drawn until
+        the next commit_action() form one undo step (a stroke).
+        """
+        box = self._points_box([start, end], thickness)
+        self._before_change()
+        self.history.touch(*box)
+        if self.vector is not None:
+            self.vector.add_segment(start, end, color, thickness, time.time())
+        cv2.line(self.canvas, start, end, color, thickness)
+        self.mark_dirty(*box)
+
+    def clear_canvas(self):
+        """Erases the whole canvas as one undo step."""
+        self.commit_action()
+        self._before_change()
+        # Tiles without ink are black already and need no saving
+        self.history.touch_tiles(self.ink_tiles)
+        if self.vector is not None:
+            self.vector.add_clear(time.time())
+        self.canvas.fill(0)
+        self.canvas_mask.fill(0)
+        self.ink_tiles.fill(False)
+        self.commit_action()
+
+    def commit_action(self):
+        """Ends the stroke in progress as one undo step."""
+        changed = self.history.commit()
+        if self.vector is not None:
+            self.vector.end_action(keep=changed)
+
+    def undo(self):
+        """Reverts the last stroke, shape, erase or clear."""
+        self.commit_action()
+        self._before_change()
+        boxes = self.history.undo()
+        if boxes and self.vector is not None:
+            self.vector.undo()
+        for box in boxes:
+            self.mark_dirty(*box)
+
+    def redo(self):
+        """Reapplies the last undone action."""
+        self.commit_action()
+        self._before_change()
+        boxes = self.history.redo()
+        if boxes and self.vector is not None:
+            self.vector.redo()
+        for box in boxes:
+            self.mark_dirty(*box)
+
+    def rebuild_canvas(self):
+        """
+        Re-renders the raster canvas from the vector record, e.g. after
+        loading saved annotations. Clears the undo history.
+        """
+        if self.vector is None:
+            return
+        self.commit_action()
+        self._before_change()
+        self.vector.render(self.frame_width, self.frame_height, canvas=self.canvas)
+        self.history.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuilds the ink mask after self.canvas was modified directly."""
+        self.mark_dirty(0, 0, self.frame_width, self.frame_height)
+
+    def _points_box(self, points, thickness):
+        """Pixel box [x0, x1) x [y0, y1) covering points drawn with thickness."""
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        pad = thickness // 2 + 2
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """Recomputes the ink mask and tile flags inside the pixel box [x0, x1) x [y0, y1)."""
+        # Snap the box to whole tiles so the tile flags can be recomputed exactly
+        tx0 = max(0, x0 // TILE_SIZE)
+        ty0 = max(0, y0 // TILE_SIZE)
+        tx1 = min(self.tile_cols, -(-x1 // TILE_SIZE))
+        ty1 = min(self.tile_rows, -(-y1 // TILE_SIZE))
+        if tx0 >= tx1 or ty0 >= ty1:
+            return
+        px0, py0 = tx0 * TILE_SIZE, ty0 * TILE_SIZE
+        px1 = min(tx1 * TILE_SIZE, self.frame_width)
+        py1 = min(ty1 * TILE_SIZE, self.frame_height)
+
+        gray = cv2.cvtColor(self.canvas[py0:py1, px0:px1], cv2.COLOR_BGR2GRAY)
+        mask = self.canvas_mask[py0:py1, px0:px1]
+        np.greater(gray, 1, out=mask)
+
+        row_any = np.maximum.reduceat(mask, np.arange(0, py1 - py0, TILE_SIZE), axis=0)
+        self.ink_tiles[ty0:ty1, tx0:tx1] = np.maximum.reduceat(
+            row_any, np.arange(0, px1 - px0, TILE_SIZE), axis=1)
 
     def update(self, frame, results, gesture_engine):
         """Processes a frame, updates the canvas, and overlays UI elements."""
+        seen = []
+        gesture_engine.draw_hands(frame)
+        for i, hand in enumerate(gesture_engine.detected_hands):
+            key = i if hand.id is None else hand.id
+            seen.append(key)
+            state = self.hands.get(key)
+            if state is None:
+                state = self.hands[key] = HandState()
+            with tracer.span('painter.hand'):
+                self._update_hand(frame, hand, state, self.detect_mode(gesture_engine.gestures.active[i]))
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                gesture_engine.mp_drawing.draw_landmarks(
-                    frame, hand_landmarks, gesture_engine.mp_hands.HAND_CONNECTIONS
-                )
-                
-                fingers = gesture_engine.count_fingers_up(hand_landmarks)
-                detected_mode = self.detect_mode(fingers)
-                
-                # Index finger for drawing/shapes
-                index_tip = hand_landmarks.landmark[gesture_engine.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                x = int(index_tip.x * self.frame_width)
-                y = int(index_tip.y * self.frame_height)
-                
-                # CLEAR MODE
-                if detected_mode == MODE_CLEAR:
-                    self.current_mode = MODE_CLEAR
-                    self.shape_start = None
-                    if self.clear_start_time is None:
-                        self.clear_start_time = time.time()
-                    elapsed = time.time() - self.clear_start_time
-                    if elapsed > self.clear_delay:
-                        self.canvas = np.zeros((self.frame_height, self.frame_width, 3), dtype=np.uint8)
-                        self.clear_start_time = None
-                    else:
-                        remaining = self.clear_delay - elapsed
-                        cv2.putText(frame, f"Clearing in {remaining:.1f} sec", 
-                                    (x + 10, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                    0.7, (0, 0, 255), 2)
-                    self.prev_x, self.prev_y = None, None
-                
-                # SHAPE MODE
-                elif self.current_shape is not None and detected_mode == MODE_DRAW:
-                    self.current_mode = MODE_SHAPE
-                    self.clear_start_time = None
-                    if self.shape_start is None:
-                        self.shape_start = (x, y)
-                    else:
-                        self.draw_shapes_preview(frame, self.shape_start, (x, y), self.current_shape, self.current_color)
-                        self.shape_end = (x, y)
-                    self.prev_x, self.prev_y = None, None
-                
-                # DRAW MODE (Lines)
-                elif detected_mode == MODE_DRAW and self.current_shape is None:
-                    self.current_mode = MODE_DRAW
-                    self.clear_start_time = None
-                    cv2.circle(frame, (x, y), self.brush_thickness + 2, self.current_color, 2)
-                    if self.prev_x is not None and self.prev_y is not None:
-                        cv2.line(self.canvas, (self.prev_x, self.prev_y), (x, y), 
-                                 self.current_color, self.brush_thickness)
-                    self.prev_x, self.prev_y = x, y
-                
-                # ERASE MODE
-                elif detected_mode == MODE_ERASE:
-                    self.current_mode = MODE_ERASE
-                    self.clear_start_time = None
-                    self.shape_start = None
-                    thumb_tip = hand_landmarks.landmark[gesture_engine.mp_hands.HandLandmark.THUMB_TIP]
-                    tx, ty = int(thumb_tip.x * self.frame_width), int(thumb_tip.y * self.frame_height)
-                    cv2.circle(frame, (tx, ty), self.eraser_thickness, (200, 200, 200), 2)
-                    if self.prev_x is not None and self.prev_y is not None:
-                        cv2.line(self.canvas, (self.prev_x, self.prev_y), (tx, ty), (0, 0, 0), self.eraser_thickness)
-                    self.prev_x, self.prev_y = tx, ty
-                
-                # IDLE / FINALIZE SHAPE
-                else:
-                    if self.shape_start is not None and self.shape_end is not None:
-                        self.draw_shapes_final(self.shape_start, self.shape_end, self.current_shape, self.current_color, self.brush_thickness)
-                        self.shape_start = None
-                        self.shape_end = None
-                    self.current_mode = MODE_IDLE
-                    self.clear_start_time = None
-                    self.prev_x, self.prev_y = None, None
-        else:
-            # Handle final shape if hand lost
-            if self.shape_start is not None and self.shape_end is not None:
-                self.draw_shapes_final(self.shape_start, self.shape_end, self.current_shape, self.current_color, self.brush_thickness)
-            self.prev_x, self.prev_y = None, None
-            self.clear_start_time = None
-            self.shape_start = None
-            self.shape_end = None
-            self.current_mode = MODE_IDLE
+        # Hands that left finish their shapes
+        for key in [key for key in self.hands if key not in seen]:
+            self._finish_shape(self.hands.pop(key))
+        self.current_mode = self.hands[seen[0]].mode if seen else MODE_IDLE
+        
+        # A stroke or erase ends as soon as no finger is drawing
+        if all(state.prev is None for state in self.hands.values()):
+            self.commit_action()
 
         # UI Overlay
-        return self._render(frame)
+        with tracer.span('painter.render'):
+            return self._render(frame)
+
+    def on_exit(self):
+        """Ends what the hands were doing when another mode takes over."""
+        for state in self.hands.values():
+            self._finish_shape(state)
+        self.hands.clear()
+        self.current_mode = MODE_IDLE
+        self.commit_action()
+
+    def _update_hand(self, frame, hand, state, detected_mode):
+        """Applies the mode of one hand to the canvas and its own state."""
+        # Index finger for drawing/shapes
+        x, y = to_pixels(hand.landmarks, INDEX_FINGER_TIP, self.frame_width, self.frame_height)
+        
+        # CLEAR MODE
+        if detected_mode == MODE_CLEAR:
+            state.mode = MODE_CLEAR
+            state.shape_start = None
+            if state.clear_start_time is None:
+                state.clear_start_time = time.time()
+            elapsed = time.time() - state.clear_start_time
+            if elapsed > self.clear_delay:
+                self.clear_canvas()
+                state.clear_start_time = None
+            else:
+                remaining = self.clear_delay - elapsed
+                cv2.putText(frame, f"Clearing in {remaining:.1f} sec", 
+                            (x + 10, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 
+                            0.7, (0, 0, 255), 2)
+            state.prev = None
+        
+        # SHAPE MODE
+        elif self.current_shape is not None and detected_mode == MODE_DRAW:
+            state.mode = MODE_SHAPE
+            state.clear_start_time = None
+            if state.shape_start is None:
+                state.shape_start = (x, y)
+            else:
+                self.draw_shapes_preview(frame, state.shape_start, (x, y), self.current_shape, self.current_color)
+                state.shape_end = (x, y)
+            state.prev = None
+        
+        # DRAW MODE (Lines)
+        elif detected_mode == MODE_DRAW and self.current_shape is None:
+            state.mode = MODE_DRAW
+            state.clear_start_time = None
+            cv2.circle(frame, (x, y), self.brush_thickness + 2, self.current_color, 2)
+            if state.prev is not None:
+                self.draw_line(state.prev, (x, y), self.current_color, self.brush_thickness)
+            state.prev = (x, y)
+        
+        # ERASE MODE
+        elif detected_mode == MODE_ERASE:
+            state.mode = MODE_ERASE
+            state.clear_start_time = None
+            state.shape_start = None
+            tx, ty = to_pixels(hand.landmarks, THUMB_TIP, self.frame_width, self.frame_height)
+            cv2.circle(frame, (tx, ty), self.eraser_thickness, (200, 200, 200), 2)
+            if state.prev is not None:
+                self.draw_line(state.prev, (tx, ty), (0, 0, 0), self.eraser_thickness)
+            state.prev = (tx, ty)
+        
+        # IDLE / FINALIZE SHAPE
+        else:
+            self._finish_shape(state)
+            state.mode = MODE_IDLE
+            state.clear_start_time = None
+            state.prev = None
+
+    def _finish_shape(self, state):
+        """Draws the shape a hand was dragging, if any."""
+        if state.shape_start is not None and state.shape_end is not None:
+            self.draw_shapes_final(state.shape_start, state.shape_end, self.current_shape,
+                                   self.current_color, self.brush_thickness)
+        state.shape_start = None
+        state.shape_end = None
 
     def _render(self, frame):
-        """Combines the video frame with the drawing canvas and UI panel."""
-        gray_canvas = cv2.cvtColor(self.canvas, cv2.COLOR_BGR2GRAY)
-        _, mask = cv2.threshold(gray_canvas, 1, 255, cv2.THRESH_BINARY)
-        mask_inv = cv2.bitwise_not(mask)
-        frame_bg = cv2.bitwise_and(frame, frame, mask=mask_inv)
-        canvas_fg = cv2.bitwise_and(self.canvas, self.canvas, mask=mask)
-        combined = cv2.add(frame_bg, canvas_fg)
-        
-        # Info panel
-        info_panel = np.zeros((140, self.frame_width, 3), dtype=np.uint8)
+        """
+        Combines the video frame with the drawing canvas and UI panel.
+        The returned frame lives in a reused buffer of self.compositor.
+        """
+        combined = self.compositor.begin(frame)
+        self.composite(combined)
+        
+        # Info panel, redrawn only when what it shows changes
         mode_display = f"Mode: {self.current_shape if self.current_shape else self.current_mode}"
+        panel_state = (mode_display, self.current_color, self.brush_thickness, self.eraser_thickness)
+        if panel_state != self._panel_state:
+            self._draw_info_panel(self.compositor.panel(), mode_display)
+            self._panel_state = panel_state
+        
+        return self.compositor.finish()
+
+    def _draw_info_panel(self, info_panel, mode_display):
+        """Draws the mode, colour and brush information."""
+        info_panel.fill(0)
         cv2.putText(info_panel, mode_display, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         cv2.rectangle(info_panel, (10, 50), (70, 110), self.current_color, -1)
         cv2.rectangle(info_panel, (10, 50), (70, 110), (255, 255, 255), 2)
         cv2.putText(info_panel, f"Brush: {self.brush_thickness}px | Eraser: {self.eraser_thickness}px", 
                     (90, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        cv2.putText(info_panel, "Q-Exit | S-Save | X-Clear | 1-0:Colors | C,R,V,T:Shapes | D:Draw",
+        cv2.putText(info_panel, "Q-Exit | S-Save | X-Clear | Z,Y:Undo/Redo | 1-0:Colors | C,R,V,T:Shapes | D:Draw",
                     (10, 135), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (150, 150, 150), 1)
-        
-        return np.vstack([combined, info_panel])
 
-    def save_canvas(self):
-        """Saves the current canvas to a file."""
-        white_bg = np.ones((self.frame_height, self.frame_width, 3), dtype=np.uint8) * 255
-        mask = cv2.cvtColor(self.canvas, cv2.COLOR_BGR2GRAY)
-        output = np.where(mask[:, :, None] != 0, self.canvas, white_bg)
-        filename = f"paint_{int(time.time())}.png"
-        cv2.imwrite(filename, output)
+    def composite(self, frame):
+        """
+        Copies the ink of the canvas onto frame, in place. Only tiles that
+        hold ink are touched, so an empty canvas costs next to nothing.
+        """
+        for row in np.flatnonzero(self.ink_tiles.any(axis=1)):
+            # Merge runs of neighbouring inked tiles into one copy
+            flags = np.concatenate(([False], self.ink_tiles[row], [False]))
+            edges = np.flatnonzero(flags[1:] != flags[:-1])
+            y0 = row * TILE_SIZE
+            y1 = min(y0 + TILE_SIZE, self.frame_height)
+            for start, end in zip(edges[::2], edges[1::2]):
+                x0 = start * TILE_SIZE
+                x1 = min(end * TILE_SIZE, self.frame_width)
+                # Writes straight into the frame view
+                cv2.copyTo(self.canvas[y0:y1, x0:x1], self.canvas_mask[y0:y1, x0:x1],
+                           frame[y0:y1, x0:x1])
+        return frame
+
+    def _before_change(self):
+        """Lets pending saves copy the canvas before it is drawn over."""
+        if self._snapshots:
+            for snapshot in self._snapshots:
+                snapshot.freeze()
+            self._snapshots.clear()
+
+    def save_canvas(self, filename=None, compression=3, transparent=False, callback=None):
+        """
+        Saves the current canvas to a PNG file in the background and returns
+        the file name. The ink is saved on white, or on a transparent
+        background with transparent=True; compression is the PNG level
+        (0-9). callback(job) is called from the writer thread when the file
+        is written (job.status is 'done', 'failed' or 'dropped'); the job is
+        also kept in self.last_export.
+        """
+        if filename is None:
+            filename = f"paint_{int(time.time())}.png"
+        if self.exporter is None:
+            self.exporter = CanvasExporter()
+        snapshot = CanvasSnapshot(self.canvas)
+        self._snapshots = [s for s in self._snapshots if s.live] + [snapshot]
+        self.last_export = self.exporter.submit(snapshot, filename, compression, transparent, callback)
         return filename
+
+    def close(self):
+        """Finishes pending saves."""
+        if self.exporter is not None:
+            self.exporter.close()
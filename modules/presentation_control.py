@@ -0,0 +1,187 @@
+"""
+Presentation control: gestures fire slide actions.
+
+The gestures section of config.yaml binds gesture names (see
+utils.gesture_detector) to actions:
+
+    gestures:
+      - name: "swipe_right"
+        action: "next_slide"
+
+The project budget is at most 100 ms from gesture to action, so actions take
+the shortest path: PresentationControl subscribes to the engine's gesture
+events and dispatches from the callback, inside GestureEngine.process_frame,
+before any rendering of the frame. Swipes themselves fire early, as soon as
+the detector is sure of a fast swipe (swipe_early_distance and
+swipe_early_speed), not when the motion is over.
+
+Actions are debounced in time: an action does not fire again within
+debounce seconds of its last dispatch, however the gesture stream flickers
+(a fist lost for a frame and found again starts the gesture twice); the
+hand swinging back after a swipe is already held off by the detector's
+swipe_cooldown. Every dispatched
+action is recorded as an ActionRecord with its latency from the capture
+timestamp of the frame that triggered it to the return of the backend.
+
+Actions are sent through a backend: PyAutoGUIBackend presses the usual
+presentation keys, RecordingBackend only records them (tests, benchmarks).
+"""
+import time
+from collections import deque, namedtuple
+
+import cv2
+import numpy as np
+
+from core.config_manager import GestureBinding
+from core.state_machine import FINGERS, LANDMARKS, SKELETON, SWIPES
+
+# Gesture-to-action budget from the project targets, in seconds
+LATENCY_BUDGET = 0.1
+
+# Keys of the actions in PowerPoint, Google Slides, Keynote and PDF viewers
+ACTION_KEYS = {
+    'next_slide': 'right',
+    'previous_slide': 'left',
+    'first_slide': 'home',
+    'last_slide': 'end',
+    'black_screen': 'b',
+}
+# Toggles between these two keys
+START_KEY, STOP_KEY = 'f5', 'esc'
+ACTIONS = tuple(ACTION_KEYS) + ('start_stop_presentation',)
+
+# Used when the config binds no gestures (the project plan's table)
+DEFAULT_BINDINGS = (
+    GestureBinding('swipe_right', 'next_slide'),
+    GestureBinding('swipe_left', 'previous_slide'),
+    GestureBinding('swipe_up', 'first_slide'),
+    GestureBinding('swipe_down', 'last_slide'),
+    GestureBinding('fist', 'start_stop_presentation'),
+    GestureBinding('open_palm', 'black_screen'),
+)
+
+# captured and dispatched are time.perf_counter values, latency is in seconds
+ActionRecord = namedtuple('ActionRecord', ['action', 'gesture', 'captured', 'dispatched', 'latency'])
+
+
+class RecordingBackend:
+    """Backend that records (perf_counter, action) instead of pressing keys."""
+    def __init__(self):
+        self.actions = []
+
+    def dispatch(self, action):
+        self.actions.append((time.perf_counter(), action))
+
+
+class PyAutoGUIBackend:
+    """Presses the presentation keys with PyAutoGUI (imported on creation)."""
+    def __init__(self):
+        import pyautogui
+        # PyAutoGUI sleeps after every call by default
+        pyautogui.PAUSE = 0
+        self._gui = pyautogui
+        self.presenting = False
+
+    def dispatch(self, action):
+        if action == 'start_stop_presentation':
+            key = STOP_KEY if self.presenting else START_KEY
+            self.presenting = not self.presenting
+        else:
+            key = ACTION_KEYS[action]
+        self._gui.press(key, _pause=False)
+
+
+class PresentationControl:
+    """
+    Presentation mode. bindings is a sequence of GestureBinding (the config's
+    gestures, DEFAULT_BINDINGS when empty).
+
+    debounce    seconds an action stays quiet after it fired
+    """
+    stages = frozenset((LANDMARKS, FINGERS, SWIPES, SKELETON))
+
+    def __init__(self, frame_width, frame_height, bindings=None, backend=None, debounce=0.8):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.backend = PyAutoGUIBackend() if backend is None else backend
+        self.debounce = debounce
+        self.set_bindings(bindings)
+        self.records = deque(maxlen=1000)
+        self.suppressed = 0
+        self._last_fired = {}
+        self._gestures = None
+
+    def set_bindings(self, bindings):
+        """Replaces the gesture-to-action map; unknown actions raise ValueError."""
+        bindings = tuple(bindings or DEFAULT_BINDINGS)
+        unknown = sorted({b.action for b in bindings} - set(ACTIONS))
+        if unknown:
+            raise ValueError(f"Unknown presentation actions {unknown}, expected one of {list(ACTIONS)}")
+        self.bindings = {b.name: b.action for b in bindings}
+
+    def handle(self, event):
+        """GestureEvent callback: dispatches the bound action, if not debounced."""
+        action = self.bindings.get(event.name)
+        if action is None or event.phase == 'end':
+            return None
+        last = self._last_fired.get(action)
+        if last is not None and event.timestamp - last < self.debounce:
+            self.suppressed += 1
+            return None
+        self._last_fired[action] = event.timestamp
+        self.backend.dispatch(action)
+        dispatched = time.perf_counter()
+        record = ActionRecord(action, event.name, event.timestamp, dispatched, dispatched - event.timestamp)
+        self.records.append(record)
+        return record
+
+    def attach(self, gestures):
+        """Subscribes to a GestureDetector's events (done by update())."""
+        if self._gestures is not gestures:
+            self.detach()
+            gestures.subscribe(self.handle)
+            self._gestures = gestures
+
+    def detach(self):
+        if self._gestures is not None:
+            self._gestures.unsubscribe(self.handle)
+            self._gestures = None
+
+    def on_exit(self):
+        # Gestures made in other modes must not turn slides
+        self.detach()
+
+    def close(self):
+        self.detach()
+
+    def update(self, frame, results, gesture_engine):
+        """Draws the mode and the last action; actions are dispatched by the subscription."""
+        if self._gestures is not gesture_engine.gestures:
+            # First frame in this mode: its events were sent before we subscribed
+            for event in gesture_engine.gestures.events:
+                self.handle(event)
+            self.attach(gesture_engine.gestures)
+
+        gesture_engine.draw_hands(frame)
+
+        cv2.putText(frame, "PRESENTATION", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 200, 0), 2)
+        if self.records and time.perf_counter() - self.records[-1].dispatched < 1.5:
+            record = self.records[-1]
+            color = (0, 255, 0) if record.latency <= LATENCY_BUDGET else (0, 0, 255)
+            cv2.putText(frame, f"{record.action.replace('_', ' ').upper()}  {record.latency * 1000:.0f} ms",
+                        (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+        return frame
+
+    def stats(self):
+        """Dispatched actions and their latency distribution in milliseconds."""
+        latencies = np.array([r.latency for r in self.records]) * 1000.0
+        if not len(latencies):
+            return {'actions': 0, 'suppressed': self.suppressed}
+        return {
+            'actions': len(latencies),
+            'suppressed': self.suppressed,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p95_ms': float(np.percentile(latencies, 95)),
+            'latency_max_ms': float(latencies.max()),
+            'over_budget': int((latencies > LATENCY_BUDGET * 1000.0).sum()),
+        }
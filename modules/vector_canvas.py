@@ -0,0 +1,234 @@
+"""
+Resolution-independent vector record of what the painter draws.
+
+VectorCanvas keeps every stroke, erase, shape and clear as a row of a
+structured NumPy array with its points in a shared, growable point array.
+Coordinates are normalized to the frame (0..1) and thicknesses to the frame
+width, so the same annotations render at camera resolution for tracking and
+at projector resolution for display:
+
+    raster = painter.vector.render(1920, 1080)
+
+Each point carries its timestamp, so render(until=t) replays the drawing as
+it was at time t. to_bytes() serializes a session into a few kilobytes.
+
+Strokes are grouped into actions, the same units as the painter's undo
+history, and undo()/redo() move the visible end of the record.
+"""
+import io
+
+import cv2
+import numpy as np
+
+KIND_STROKE = 0
+KIND_ERASE = 1
+KIND_CIRCLE = 2
+KIND_RECT = 3
+KIND_TRIANGLE = 4
+KIND_CLEAR = 5
+
+STROKE_DTYPE = np.dtype([
+    ('kind', np.uint8),
+    ('color', np.uint8, 3),
+    ('thickness', np.float32),  # fraction of the frame width
+    ('start', np.uint32),       # first point
+    ('count', np.uint32),       # number of points
+    ('action', np.uint32),      # undo step the stroke belongs to
+])
+
+
+class VectorCanvas:
+    """
+    Vector strokes drawn on a width x height frame.
+
+    Pixel coordinates passed in are normalized with the frame size; render()
+    scales them to any output size.
+    """
+    def __init__(self, width, height, capacity=1024):
+        self.width = width
+        self.height = height
+        self.points = np.zeros((capacity, 2), dtype=np.float32)
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.strokes = np.zeros(capacity // 4, dtype=STROKE_DTYPE)
+        self.num_points = 0
+        self.num_strokes = 0
+        # Strokes of finished actions; undo() and redo() move visible_actions
+        self.actions = 0
+        self.visible_actions = 0
+        self._open = False
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _reserve_points(self, n):
+        if self.num_points + n > len(self.points):
+            size = max(2 * len(self.points), self.num_points + n)
+            self.points = np.resize(self.points, (size, 2))
+            self.times = np.resize(self.times, size)
+
+    def _add_points(self, points, timestamp):
+        n = len(points)
+        self._reserve_points(n)
+        self.points[self.num_points:self.num_points + n] = \
+            np.asarray(points, dtype=np.float32) / (self.width, self.height)
+        self.times[self.num_points:self.num_points + n] = timestamp
+        self.num_points += n
+
+    def _add_stroke(self, kind, color, thickness, count):
+        if self.num_strokes == len(self.strokes):
+            self.strokes = np.resize(self.strokes, 2 * len(self.strokes))
+        self.strokes[self.num_strokes] = (kind, color, thickness / self.width,
+                                          self.num_points - count, count, self.actions)
+        self.num_strokes += 1
+
+    def _truncate(self):
+        """Drops undone actions before something new is recorded."""
+        if self.visible_actions == self.actions:
+            return
+        keep = int(np.searchsorted(self.strokes['action'][:self.num_strokes], self.visible_actions))
+        self.num_points = int(self.strokes['start'][keep]) if keep < self.num_strokes else self.num_points
+        self.num_strokes = keep
+        self.actions = self.visible_actions
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def add_segment(self, start, end, color, thickness, timestamp):
+        """Adds a line segment, extending the open stroke when it continues it."""
+        self._truncate()
+        color = tuple(int(c) for c in color)
+        if self._open and self.num_strokes:
+            last = self.strokes[self.num_strokes - 1]
+            tail = self.points[self.num_points - 1] * (self.width, self.height)
+            if tuple(last['color'].tolist()) == color and last['thickness'] == np.float32(thickness / self.width) \
+                    and np.abs(tail - start).max() < 0.5:
+                self._add_points([end], timestamp)
+                self.strokes['count'][self.num_strokes - 1] += 1
+                return
+        kind = KIND_ERASE if color == (0, 0, 0) else KIND_STROKE
+        self._add_points([start, end], timestamp)
+        self._add_stroke(kind, color, thickness, 2)
+        self._open = True
+
+    def add_shape(self, kind, start, end, color, thickness, timestamp):
+        """Adds a KIND_CIRCLE (centre, point on the edge), KIND_RECT or KIND_TRIANGLE."""
+        self._truncate()
+        self._add_points([start, end], timestamp)
+        self._add_stroke(kind, tuple(int(c) for c in color), thickness, 2)
+        self._open = True
+
+    def add_clear(self, timestamp):
+        self._truncate()
+        self._add_points([(0, 0)], timestamp)
+        self._add_stroke(KIND_CLEAR, (0, 0, 0), 0, 1)
+        self._open = True
+
+    def end_action(self, keep=True):
+        """
+        Closes the strokes recorded since the last call into one undo step,
+        or drops them when keep is False (nothing visible changed).
+        """
+        if not self._open:
+            return
+        self._open = False
+        if keep:
+            self.actions += 1
+            self.visible_actions = self.actions
+            return
+        first = int(np.searchsorted(self.strokes['action'][:self.num_strokes], self.actions))
+        if first < self.num_strokes:
+            self.num_points = int(self.strokes['start'][first])
+            self.num_strokes = first
+
+    def undo(self):
+        if self.visible_actions > 0:
+            self.visible_actions -= 1
+
+    def redo(self):
+        if self.visible_actions < self.actions:
+            self.visible_actions += 1
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def visible(self, until=None):
+        """Strokes to draw: visible actions after the last clear, drawn before until."""
+        strokes = self.strokes[:self.num_strokes]
+        strokes = strokes[strokes['action'] < self.visible_actions + (1 if self._open else 0)]
+        if until is not None:
+            strokes = strokes[self.times[strokes['start']] <= until]
+        clears = np.flatnonzero(strokes['kind'] == KIND_CLEAR)
+        return strokes[clears[-1] + 1:] if len(clears) else strokes
+
+    def render(self, width=None, height=None, canvas=None, until=None):
+        """
+        Draws the visible strokes on a black (height, width, 3) canvas (new
+        or given) at any resolution; until replays the drawing up to a time.
+        """
+        width = width or self.width
+        height = height or self.height
+        if canvas is None:
+            canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        else:
+            canvas.fill(0)
+        scale = np.array([width, height], dtype=np.float32)
+        pixels = np.rint(self.points[:self.num_points] * scale).astype(np.int32)
+
+        for stroke in self.visible(until):
+            start, count = int(stroke['start']), int(stroke['count'])
+            points = pixels[start:start + count]
+            if until is not None:
+                points = points[self.times[start:start + count] <= until]
+            color = tuple(stroke['color'].tolist())
+            thickness = max(1, int(round(float(stroke['thickness']) * width)))
+            kind = stroke['kind']
+            if kind in (KIND_STROKE, KIND_ERASE):
+                cv2.polylines(canvas, [points], False, color, thickness)
+            elif kind == KIND_CIRCLE:
+                (cx, cy), (ex, ey) = points.tolist()
+                cv2.circle(canvas, (cx, cy), int(np.hypot(ex - cx, ey - cy)), color, thickness)
+            elif kind == KIND_RECT:
+                cv2.rectangle(canvas, tuple(points[0].tolist()), tuple(points[1].tolist()), color, thickness)
+            elif kind == KIND_TRIANGLE:
+                (sx, sy), (ex, ey) = points.tolist()
+                cv2.polylines(canvas, [np.array([(sx, sy), (ex, sy), (ex, ey)], dtype=np.int32)],
+                              True, color, thickness)
+        return canvas
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+    def to_bytes(self):
+        """Compressed .npz of the visible actions (undone ones are left out)."""
+        visible = self.visible_actions + (1 if self._open else 0)
+        num_strokes = int(np.searchsorted(self.strokes['action'][:self.num_strokes], visible))
+        num_points = int(self.strokes['start'][num_strokes]) if num_strokes < self.num_strokes else self.num_points
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, size=np.array([self.width, self.height]),
+                            points=self.points[:num_points], times=self.times[:num_points],
+                            strokes=self.strokes[:num_strokes])
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data)) as archive:
+            width, height = archive['size'].tolist()
+            vector = cls(width, height)
+            points, times, strokes = archive['points'], archive['times'], archive['strokes']
+        vector._reserve_points(len(points))
+        vector.points[:len(points)] = points
+        vector.times[:len(times)] = times
+        vector.num_points = len(points)
+        vector.strokes = np.resize(strokes, max(len(strokes), 1))
+        vector.num_strokes = len(strokes)
+        vector.actions = vector.visible_actions = int(strokes['action'].max()) + 1 if len(strokes) else 0
+        return vector
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
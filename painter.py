@@ -1,22 +1,68 @@
 import cv2
+from core.config_manager import load_config
+from core.display import DisplayStage, WindowSink
 from core.gesture_engine import GestureEngine
 from modules.painter import Painter, SHAPE_CIRCLE, SHAPE_RECT, SHAPE_SQUARE, SHAPE_TRIANGLE
 
+def report_save(job):
+    if job.status == 'done':
+        print(f"Saved to {job.filename}")
+    else:
+        print(f"Saving {job.filename} {job.status}: {job.error}")
+
 def main():
     print("Initializing Refactored Painter...")
     
+    config = load_config('config.yaml')
+    camera = config.camera
+    
+    # The hand model loads in the background while the camera opens
+    engine = GestureEngine(**config.detection._asdict(), background_load=True)
+    engine.gestures.configure(**config.recognition._asdict())
+    engine.skeleton.set_style(config.display.skeleton)
+    
     # Initialize Camera
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    cap = cv2.VideoCapture(camera.index)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, camera.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, camera.height)
     
-    # Initialize Engine and Module
-    engine = GestureEngine()
-    painter = Painter(1280, 720)
+    # Initialize Module
+    painter = Painter(camera.width, camera.height)
     
+    # Frames are shown by a display thread; keys are read there and
+    # handled here, between frames
+    display = DisplayStage(WindowSink('Refactored Gesture Painter'))
+    color_keys = '1234567890'
+    color_names = ('red', 'green', 'blue', 'yellow', 'white', 'pink', 'orange', 'cyan', 'purple', 'black')
+    for key, name in zip(color_keys, color_names):
+        display.bind(key, lambda name=name: setattr(painter, 'current_color', painter.colors[name]))
+    shapes = {'c': SHAPE_CIRCLE, 'r': SHAPE_RECT, 'v': SHAPE_SQUARE, 't': SHAPE_TRIANGLE, 'd': None}
+    for key, shape in shapes.items():
+        display.bind(key, lambda shape=shape: setattr(painter, 'current_shape', shape))
+
+    def clear():
+        painter.clear_canvas()
+        print("Canvas Cleared")
+
+    def brush(step):
+        painter.brush_thickness = min(max(painter.brush_thickness + step, 1), 50)
+
+    def eraser(step):
+        painter.eraser_thickness = min(max(painter.eraser_thickness + step, 10), 100)
+
+    display.bind('s', lambda: painter.save_canvas(callback=report_save))
+    display.bind('x', clear)
+    for key in '+=':
+        display.bind(key, lambda: brush(2))
+    for key in '-_':
+        display.bind(key, lambda: brush(-2))
+    display.bind('[', lambda: eraser(-5))
+    display.bind(']', lambda: eraser(5))
+    display.start()
+
     print("Painter Ready. Press 'Q' to exit.")
 
-    while True:
+    while display.handle_keys():
         ret, frame = cap.read()
         if not ret:
             break
@@ -26,48 +72,12 @@ def main():
         
         # Update Painter
         display_frame = painter.update(frame, results, engine)
-        
-        # Keyboard handling (transferred from old painter.py)
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q') or key == 27:
-            break
-        elif key == ord('1'): painter.current_color = painter.colors['red']
-        elif key == ord('2'): painter.current_color = painter.colors['green']
-        elif key == ord('3'): painter.current_color = painter.colors['blue']
-        elif key == ord('4'): painter.current_color = painter.colors['yellow']
-        elif key == ord('5'): painter.current_color = painter.colors['white']
-        elif key == ord('6'): painter.current_color = painter.colors['pink']
-        elif key == ord('7'): painter.current_color = painter.colors['orange']
-        elif key == ord('8'): painter.current_color = painter.colors['cyan']
-        elif key == ord('9'): painter.current_color = painter.colors['purple']
-        elif key == ord('0'): painter.current_color = painter.colors['black']
-        
-        elif key == ord('c'): painter.current_shape = SHAPE_CIRCLE
-        elif key == ord('r'): painter.current_shape = SHAPE_RECT
-        elif key == ord('v'): painter.current_shape = SHAPE_SQUARE
-        elif key == ord('t'): painter.current_shape = SHAPE_TRIANGLE
-        elif key == ord('d'): painter.current_shape = None
-        
-        elif key == ord('s'): 
-            fname = painter.save_canvas()
-            print(f"Saved to {fname}")
-        elif key == ord('x'): 
-            painter.canvas.fill(0)
-            print("Canvas Cleared")
-        elif key == ord('+') or key == ord('='):
-            painter.brush_thickness = min(painter.brush_thickness + 2, 50)
-        elif key == ord('-') or key == ord('_'):
-            painter.brush_thickness = max(painter.brush_thickness - 2, 1)
-        elif key == ord('['):
-            painter.eraser_thickness = max(painter.eraser_thickness - 5, 10)
-        elif key == ord(']'):
-            painter.eraser_thickness = min(painter.eraser_thickness + 5, 100)
-
-        cv2.imshow('Refactored Gesture Painter', display_frame)
+        display.submit(display_frame)
 
     cap.release()
-    cv2.destroyAllWindows()
+    display.close()
     engine.close()
+    painter.close()
     print("Finished.")
 
 if __name__ == "__main__":
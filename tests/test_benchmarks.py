@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+
+import numpy as np
+
+from benchmarks import cursor_benchmark, pipeline_benchmark, skeleton_benchmark
+from benchmarks.synthetic import POSE_DRAW, SyntheticHands, hand_pose
+from core.config_manager import MouseConfig
+from core.gesture_engine import GestureEngine
+from core.landmarks import fingers_up
+from modules.mouse_control import CursorDriver, RecordingBackend
+from modules.painter import Painter, MODE_DRAW, MODE_IDLE
+from ui.skeleton import STYLES, SkeletonRenderer
+
+
+class TestSyntheticHands(unittest.TestCase):
+    def test_cycle_exercises_draw_idle_and_no_hand(self):
+        hands = SyntheticHands(draw_frames=3, idle_frames=2, empty_frames=1)
+        engine = GestureEngine(hands=hands)
+        painter = Painter(320, 240)
+
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        modes, counts, index_up = [], [], []
+        for _ in range(6):
+            engine.process_frame(frame)
+            counts.append(len(engine.detected_hands))
+            for hand in engine.detected_hands:
+                index_up.append(bool(fingers_up(hand.landmarks)[1]))
+            painter.update(frame, None, engine)
+            modes.append(painter.current_mode)
+
+        self.assertEqual(counts, [1, 1, 1, 1, 1, 0])
+        self.assertEqual(index_up, [True, True, True, False, False])
+        self.assertEqual(modes, [MODE_DRAW] * 3 + [MODE_IDLE] * 3)
+        self.assertTrue(painter.ink_tiles.any())
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    def test_headless_run_writes_report(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'run.json')
+        pipeline_benchmark.main(['--headless', '--frames', '20', '--warmup', '5',
+                                 '--width', '320', '--height', '240', '--output', path])
+        with open(path) as f:
+            report = json.load(f)
+
+        self.assertEqual(report['frames'], 20)
+        self.assertEqual(report['config']['resolution'], [320, 240])
+        self.assertEqual(set(report['stages_ms']), {'capture', 'inference', 'painter', 'keyboard'})
+        for stats in report['stages_ms'].values():
+            self.assertLessEqual(stats['p50'], stats['p95'])
+            self.assertLessEqual(stats['p95'], stats['p99'])
+        self.assertGreater(report['fps'], 0)
+        self.assertEqual(set(report['targets']), set(pipeline_benchmark.TARGETS))
+        self.assertEqual(report['capture']['dropped'], 0)
+
+
+class TestCursorBenchmark(unittest.TestCase):
+    # The driver is stepped on synthetic timestamps; the real thread run is
+    # left to the benchmark itself
+    def simulate(self, rate_hz, smoothing, predict_ms, args, seconds=2.0):
+        backend = RecordingBackend(args.width, args.height)
+        driver = CursorDriver(backend, rate_hz=rate_hz, smoothing=smoothing,
+                              max_extrapolation=predict_ms / 1000.0)
+        moves, pixel, frame = [], None, 0
+        for tick in range(int(seconds * rate_hz)):
+            now = tick / rate_hz
+            while frame / args.fps <= now:
+                # Hand updates at camera rate, delayed by the pipeline latency
+                due = frame / args.fps
+                driver.track.push(due, *cursor_benchmark.circle(due - args.latency_ms / 1000.0,
+                                                                args.width, args.height))
+                frame += 1
+            new = driver.step(now)
+            if new != pixel:
+                moves.append((now, *new))
+                pixel = new
+        return cursor_benchmark.score(moves, 0.0, args)
+
+    def test_display_rate_moves_more_often_in_smaller_steps(self):
+        args = Namespace(fps=30.0, latency_ms=50.0, width=1920, height=1080)
+        config = MouseConfig()
+        camera = self.simulate(args.fps, 0.0, 0.0, args)
+        display = self.simulate(config.rate_hz, config.smoothing, config.predict_ms, args)
+
+        self.assertAlmostEqual(camera['updates_hz'], 30.0, delta=1.0)
+        self.assertGreater(display['updates_hz'], 2 * camera['updates_hz'])
+        self.assertLess(display['step_rms_px'], camera['step_rms_px'])
+        # Extrapolation makes up for the easing: no more lag than per-frame moves
+        self.assertLess(display['error_rms_px'], camera['error_rms_px'] * 1.1)
+
+
+class TestSkeletonBenchmark(unittest.TestCase):
+    # Timing is left to the benchmark itself, here only the output is checked
+    def test_vectorized_draws_the_same_pixels_as_per_call_drawing(self):
+        hands = np.stack([hand_pose(POSE_DRAW, 0.3, 0.8, 1.5), hand_pose(POSE_DRAW, 0.7, 0.9, 1.5)])
+        for style in ('default', 'keyboard', 'thin'):
+            expected = np.zeros((720, 1280, 3), dtype=np.uint8)
+            skeleton_benchmark.per_call(expected, hands, STYLES[style])
+            frame = np.zeros_like(expected)
+            SkeletonRenderer(style).draw(frame, hands)
+            np.testing.assert_array_equal(frame, expected, err_msg=style)
+
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        skeleton_benchmark.renderers()['off'](frame, hands)
+        self.assertFalse(frame.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from core.camera_manager import CameraManager
+
+
+class FakeCapture:
+    """Produces numbered frames at a fixed rate, like a webcam would."""
+    def __init__(self, count, interval=0.0):
+        self.count = count
+        self.interval = interval
+        self.produced = 0
+
+    def read(self):
+        if self.produced >= self.count:
+            return False, None
+        if self.interval:
+            time.sleep(self.interval)
+        frame = np.full((4, 4, 3), self.produced % 256, dtype=np.uint8)
+        self.produced += 1
+        return True, frame
+
+
+class TestCameraManager(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def test_latest_frame_wins(self):
+        cam = CameraManager(FakeCapture(20, interval=0.005), buffer_size=2, fps=200)
+        self.assertTrue(cam.start())
+        # A slow consumer: wait until the stream has ended, then read
+        time.sleep(0.3)
+        packet = cam.read_packet(timeout=0.5)
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.index, 19)
+        self.assertEqual(cam.frames_dropped, 19)
+        self.assertEqual(cam.frames_late, 1)
+        self.assertIsNone(cam.read_packet(timeout=0.1))
+        cam.stop()
+
+    def test_lossless_file_mode_keeps_every_frame(self):
+        path = os.path.join(self.tmp, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        if not writer.isOpened():
+            self.skipTest("MJPG video writer is not available")
+        for i in range(15):
+            writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+        with CameraManager(path, realtime=False, buffer_size=2) as cam:
+            self.assertEqual((cam.width, cam.height), (64, 48))
+            indices = []
+            while True:
+                packet = cam.read_packet(timeout=1.0)
+                if packet is None:
+                    break
+                time.sleep(0.002)
+                indices.append(packet.index)
+
+        self.assertEqual(indices, list(range(15)))
+        self.assertEqual(cam.stats()['dropped'], 0)
+
+    def test_numeric_string_is_a_camera_index(self):
+        cam = CameraManager('0')
+        self.assertEqual(cam.source, 0)
+        self.assertFalse(cam.is_file)
+        self.assertTrue(cam.realtime)
+        self.assertTrue(CameraManager('clip.avi').is_file)
+
+    def test_mirror(self):
+        frame = np.zeros((2, 3, 3), dtype=np.uint8)
+        frame[:, 0] = 255
+
+        class OneFrame:
+            def __init__(self):
+                self.done = False
+
+            def read(self):
+                if self.done:
+                    return False, None
+                self.done = True
+                return True, frame.copy()
+
+        with CameraManager(OneFrame(), mirror=True) as cam:
+            ret, mirrored = cam.read()
+        self.assertTrue(ret)
+        self.assertTrue((mirrored[:, 2] == 255).all())
+        self.assertTrue((mirrored[:, 0] == 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import cv2
+import numpy as np
+
+from modules.canvas_export import CanvasExporter, CanvasSnapshot, compose_export
+from modules.painter import Painter
+
+
+def reference_export(canvas):
+    """The original synchronous Painter.save_canvas compositing."""
+    white_bg = np.ones(canvas.shape, dtype=np.uint8) * 255
+    mask = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
+    return np.where(mask[:, :, None] != 0, canvas, white_bg)
+
+
+class TestCanvasExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.painter = Painter(320, 200)
+        self.painter.draw_line((10, 10), (300, 190), (255, 0, 0), 5)
+        self.painter.commit_action()
+
+    def tearDown(self):
+        self.painter.close()
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_compose_matches_original(self):
+        self.assertTrue((compose_export(self.painter.canvas) == reference_export(self.painter.canvas)).all())
+        bgra = compose_export(self.painter.canvas, transparent=True)
+        self.assertEqual(bgra.shape, (200, 320, 4))
+        self.assertEqual(int(bgra[0, 319, 3]), 0)
+        self.assertEqual(int(bgra[10, 10, 3]), 255)
+
+    def test_save_writes_snapshot_in_background(self):
+        expected = reference_export(self.painter.canvas)
+        done = []
+        filename = self.painter.save_canvas(self.path('a.png'), compression=1, callback=done.append)
+        # Drawing right after the save does not end up in the file
+        self.painter.draw_line((0, 100), (319, 100), (0, 255, 0), 9)
+        job = self.painter.last_export
+        self.assertTrue(job.wait(5.0))
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(done, [job])
+        self.assertTrue((cv2.imread(filename) == expected).all())
+
+    def test_transparent_export(self):
+        self.painter.save_canvas(self.path('b.png'), transparent=True)
+        self.assertTrue(self.painter.last_export.wait(5.0))
+        image = cv2.imread(self.path('b.png'), cv2.IMREAD_UNCHANGED)
+        self.assertEqual(image.shape[2], 4)
+
+    def test_snapshot_copies_only_once(self):
+        canvas = np.zeros((4, 4, 3), dtype=np.uint8)
+        snapshot = CanvasSnapshot(canvas)
+        self.assertTrue(snapshot.live)
+        frozen = snapshot.freeze()
+        canvas[...] = 7
+        self.assertIs(snapshot.freeze(), frozen)
+        self.assertFalse(frozen.any())
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writing = threading.Event()
+        release = threading.Event()
+
+        def slow_writer(filename, image, params):
+            writing.set()
+            release.wait(5.0)
+            return cv2.imwrite(filename, image, params)
+
+        exporter = CanvasExporter(max_pending=1, writer=slow_writer)
+        jobs = [exporter.submit(CanvasSnapshot(self.painter.canvas), self.path('c.png'))]
+        # Keep the writer busy with the first job
+        self.assertTrue(writing.wait(5.0))
+        jobs += [exporter.submit(CanvasSnapshot(self.painter.canvas), self.path(f'd{i}.png')) for i in range(3)]
+        self.assertEqual([job.status for job in jobs[2:]], ['dropped', 'dropped'])
+        release.set()
+        exporter.close()
+        self.assertEqual(exporter.stats()['saved'], 2)
+        self.assertEqual(exporter.stats()['dropped'], 2)
+
+    def test_failed_write_is_reported(self):
+        self.painter.save_canvas(self.path('missing/dir/e.png'))
+        job = self.painter.last_export
+        self.assertTrue(job.wait(5.0))
+        self.assertEqual(job.status, 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
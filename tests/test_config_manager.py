@@ -0,0 +1,149 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+
+import main
+from core.config_manager import (
+    DEFAULT_CONFIG, ConfigManager, GestureBinding, changed_sections, load_config, parse_config,
+)
+from utils.gesture_detector import GestureDetector
+
+REPO_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
+
+
+class TestConfigParsing(unittest.TestCase):
+    def test_repository_config(self):
+        config = load_config(REPO_CONFIG)
+        self.assertEqual((config.camera.width, config.camera.height), (1280, 720))
+        self.assertIsInstance(config.mouse.smoothing, float)
+        self.assertIn(GestureBinding('swipe_right', 'next_slide'), config.gestures)
+
+    def test_defaults_and_conversion(self):
+        config = parse_config("camera:\n  width: 640\nrecognition:\n  pinch_threshold: 40\n")
+        self.assertEqual(config.camera.width, 640)
+        self.assertEqual(config.camera.height, DEFAULT_CONFIG.camera.height)
+        self.assertIsInstance(config.recognition.pinch_threshold, float)
+        self.assertEqual(parse_config(""), DEFAULT_CONFIG)
+        self.assertEqual(load_config('/nonexistent/config.yaml'), DEFAULT_CONFIG)
+
+    def test_bad_values_name_the_key(self):
+        for text, key in [("camera:\n  width: wide\n", 'camera.width'),
+                          ("camera:\n  width: 640.5\n", 'camera.width'),
+                          ("mouse:\n  speed: 2\n", 'mouse'),
+                          ("sound: {}\n", 'sound'),
+                          ("gestures:\n  - name: fist\n", 'gestures[0]')]:
+            with self.assertRaises(ValueError) as raised:
+                parse_config(text)
+            self.assertIn(key, str(raised.exception))
+
+    def test_config_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            DEFAULT_CONFIG.camera.width = 1
+
+    def test_recognition_applies_to_detector(self):
+        detector = GestureDetector()
+        config = parse_config("recognition:\n  pinch_threshold: 30\n  swipe_speed: 1.5\n")
+        detector.configure(**config.recognition._asdict())
+        self.assertEqual(detector.pinch_threshold, 30.0)
+        self.assertEqual(detector.swipe_speed, 1.5)
+
+
+class TestConfigReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'config.yaml')
+        self.write("camera:\n  width: 640\n", 1)
+        self.manager = ConfigManager(self.path, poll_interval=0.5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text, mtime):
+        with open(self.path, 'w') as f:
+            f.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_reload_on_change_only(self):
+        self.assertIsNone(self.manager.poll(now=1e9))
+        self.write("camera:\n  width: 640\nrecognition:\n  swipe_cooldown: 1.0\n", 2)
+        # Not checked again before poll_interval has passed
+        self.assertIsNone(self.manager.poll(now=1e9 + 0.1))
+        config = self.manager.poll(now=1e9 + 1.0)
+        self.assertEqual(config.recognition.swipe_cooldown, 1.0)
+        self.assertEqual(changed_sections(DEFAULT_CONFIG._replace(camera=config.camera), config), ['recognition'])
+        self.assertLess(self.manager.last_reload_ms, 33.0)
+        self.assertIsNone(self.manager.poll(now=1e9 + 2.0))
+
+    def test_invalid_file_keeps_previous_config(self):
+        self.write("camera:\n  width: [\n", 3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(self.manager.poll(now=1e9))
+        self.assertIsNotNone(self.manager.error)
+        self.assertEqual(self.manager.config.camera.width, 640)
+
+        self.write("camera:\n  width: 800\n", 4)
+        self.assertEqual(self.manager.poll(now=1e9 + 1.0).camera.width, 800)
+        self.assertIsNone(self.manager.error)
+
+
+class FakeEngine:
+    def __init__(self):
+        self.smoother = 'one_euro'
+        self.inference_scale = 1.0
+        self.roi_tracking = False
+        self.roi_margin = 0.3
+        self.last_roi = (0, 0, 10, 10)
+        self.reloads = []
+
+    def reload_hands(self, max_hands, min_detection_confidence, min_tracking_confidence):
+        self.reloads.append((max_hands, min_detection_confidence, min_tracking_confidence))
+        return True
+
+
+class TestCommandLineOverrides(unittest.TestCase):
+    def test_overrides_survive_a_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'config.yaml')
+            with open(path, 'w') as f:
+                f.write("detection:\n  max_hands: 2\n")
+            os.utime(path, (1, 1))
+            manager = ConfigManager(path, poll_interval=0.0)
+            args = Namespace(hands=1, roi=False, smoothing='off', predict=None)
+            config = main.apply_overrides(manager.config, args)
+            self.assertEqual(config.detection.max_hands, 1)
+
+            with open(path, 'w') as f:
+                f.write("detection:\n  max_hands: 2\n  min_detection_confidence: 0.5\n"
+                        "smoothing:\n  predict_ms: 30\n")
+            os.utime(path, (2, 2))
+            new = main.apply_overrides(manager.poll(now=1e9), args)
+
+        engine = FakeEngine()
+        machine = Namespace(modes={})
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.apply_config(engine, Namespace(source=0), config, new, machine)
+        # The file's max_hands and filter never win over the command line
+        self.assertEqual(engine.reloads, [(1, 0.5, 0.7)])
+        self.assertIsNone(engine.smoother)
+        self.assertEqual(new.smoothing.predict_ms, 30.0)
+
+
+class TestApplyConfig(unittest.TestCase):
+    def test_roi_tracking_is_applied_on_reload(self):
+        engine = FakeEngine()
+        old = DEFAULT_CONFIG
+        new = old._replace(detection=old.detection._replace(roi_tracking=True, roi_margin=0.5))
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.apply_config(engine, Namespace(source=0), old, new, Namespace(modes={}))
+        self.assertTrue(engine.roi_tracking)
+        self.assertEqual(engine.roi_margin, 0.5)
+        self.assertIsNone(engine.last_roi)
+        # Only the ROI changed, the model is kept
+        self.assertEqual(engine.reloads, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
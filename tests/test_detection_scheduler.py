@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from core.detection_scheduler import DetectionScheduler
+from core.gesture_engine import GestureEngine
+from core.landmarks import results_from_arrays
+
+
+class BrightSpotHands:
+    """Fake detector: finds a 'hand' wherever the frame has bright pixels."""
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, rgb_frame):
+        self.calls += 1
+        if rgb_frame.max() < 128:
+            return results_from_arrays(())
+        return results_from_arrays(np.full((1, 21, 3), 0.5, dtype=np.float32))
+
+    def close(self):
+        pass
+
+
+def scene(hand=False):
+    frame = np.full((180, 320, 3), 40, dtype=np.uint8)
+    if hand:
+        frame[60:120, 100:160] = 255
+    return frame
+
+
+class TestDetectionScheduler(unittest.TestCase):
+    def setUp(self):
+        self.hands = BrightSpotHands()
+
+    def run_frames(self, engine, frames):
+        return [bool(engine.process_frame(frame).multi_hand_landmarks) for frame in frames]
+
+    def test_empty_scene_is_mostly_skipped(self):
+        scheduler = DetectionScheduler(idle_after=3, idle_interval=6)
+        engine = GestureEngine(hands=self.hands, scheduler=scheduler)
+        self.run_frames(engine, [scene()] * 63)
+
+        # 3 detections before going idle, then one every 6 frames
+        self.assertEqual(self.hands.calls, 3 + 10)
+        stats = scheduler.stats()
+        self.assertEqual(stats['skipped'], 50)
+        self.assertGreater(stats['idle_rate'], 0.9)
+        self.assertEqual(stats['wake_ups'], 0)
+
+    def test_moving_hand_is_detected_on_the_frame_it_appears(self):
+        scheduler = DetectionScheduler(idle_after=2, idle_interval=10)
+        engine = GestureEngine(hands=self.hands, scheduler=scheduler)
+        found = self.run_frames(engine, [scene()] * 7 + [scene(True)] * 5)
+
+        self.assertEqual(found, [False] * 7 + [True] * 5)
+        self.assertFalse(scheduler.idle)
+        stats = scheduler.stats()
+        self.assertEqual(stats['motion_wakes'], 1)
+        self.assertEqual(stats['wake_ups'], 1)
+        # Worst case: the hand could have been there since the first of frames 2-6 (skipped)
+        self.assertEqual(stats['wake_latency_frames_max'], 5)
+
+    def test_still_hand_is_found_by_the_periodic_check(self):
+        # Motion never counts, so only the periodic detection can find it
+        scheduler = DetectionScheduler(idle_after=1, idle_interval=4, pixel_threshold=255)
+        engine = GestureEngine(hands=self.hands, scheduler=scheduler)
+        found = self.run_frames(engine, [scene()] * 2 + [scene(True)] * 6)
+
+        first = found.index(True)
+        self.assertLessEqual(first - 2, scheduler.idle_interval - 1)
+        self.assertTrue(all(found[first:]))
+        self.assertEqual(scheduler.stats()['motion_wakes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from core.display import DisplayStage, NullSink, PipeSink, QueueSink, WindowSink, create_sink
+
+
+class SlowSink(NullSink):
+    """A window system that takes delay seconds per frame and has scripted keys."""
+    def __init__(self, delay=0.0, keys=()):
+        self.delay = delay
+        self.shown = []
+        self.keys = list(keys)
+
+    def show(self, frame):
+        time.sleep(self.delay)
+        self.shown.append(int(frame[0, 0, 0]))
+
+    def poll(self):
+        return self.keys.pop(0) if self.keys else -1
+
+
+def frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def wait_for(condition, timeout=1.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestDisplayStage(unittest.TestCase):
+    def test_slow_display_does_not_pace_processing(self):
+        sink = SlowSink(delay=0.05)
+        display = DisplayStage(sink)
+        display.start()
+        start = time.perf_counter()
+        for i in range(20):
+            display.submit(frame(i))
+        submit_time = time.perf_counter() - start
+        self.assertTrue(wait_for(lambda: sink.shown and sink.shown[-1] == 19))
+        display.close()
+
+        self.assertLess(submit_time, 0.2)
+        self.assertLess(len(sink.shown), 20)
+        # Every frame was shown or replaced by a newer one, in order
+        self.assertEqual(display.frames_shown + display.frames_dropped, 20)
+        self.assertEqual(sink.shown, sorted(sink.shown))
+
+    def test_submitted_frame_is_copied(self):
+        sink = QueueSink(maxsize=1)
+        display = DisplayStage(sink)
+        display.start()
+        composed = frame(1)
+        display.submit(composed)
+        # The caller reuses its buffer right away
+        composed[:] = 2
+        shown = sink.frames.get(timeout=1.0)
+        display.close()
+        self.assertTrue((shown == 1).all())
+
+    def test_keys_are_handled_by_the_frame_loop(self):
+        sink = SlowSink(keys=[ord('x'), -1, ord('x'), ord('q')])
+        display = DisplayStage(sink)
+        calls = []
+        display.bind('x', lambda: calls.append(threading.current_thread()))
+        display.start()
+        self.assertTrue(wait_for(lambda: not sink.keys))
+        running = display.handle_keys()
+        display.close()
+
+        self.assertFalse(running)
+        self.assertEqual(calls, [threading.current_thread()] * 2)
+
+    def test_main_thread_sink_is_shown_from_submit(self):
+        sink = SlowSink(keys=[ord('x')])
+        sink.main_thread_only = True
+        shown_on = []
+        sink.show = lambda frame: shown_on.append(threading.current_thread())
+        display = DisplayStage(sink)
+        calls = []
+        display.bind('x', lambda: calls.append(True))
+        display.start()
+        self.assertFalse(display.running)
+
+        display.submit(frame(1))
+        self.assertEqual(shown_on, [threading.current_thread()])
+        self.assertTrue(display.handle_keys())
+        display.close()
+        self.assertEqual(calls, [True])
+        self.assertEqual(display.stats()['shown'], 1)
+        self.assertEqual(WindowSink.main_thread_only, sys.platform == 'darwin')
+
+    def test_pipe_sink_writes_raw_frames_and_stops_with_the_reader(self):
+        read_fd, write_fd = os.pipe()
+        sink = PipeSink(os.fdopen(write_fd, 'wb'))
+        sink.show(frame(7))
+        data = os.read(read_fd, 48 * 64 * 3)
+        self.assertEqual(data, frame(7).tobytes())
+
+        os.close(read_fd)
+        display = DisplayStage(sink)
+        display.start()
+        display.submit(frame(8))
+        self.assertTrue(wait_for(lambda: sink.closed))
+        self.assertFalse(display.handle_keys())
+        display.close()
+        sink.stream.close()
+
+    def test_create_sink(self):
+        self.assertIsInstance(create_sink('null'), NullSink)
+        self.assertIsInstance(create_sink('queue'), QueueSink)
+        with self.assertRaises(ValueError):
+            create_sink('hologram')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from benchmarks.synthetic import POSE_DRAW, POSE_FIST, hand_pose
+from core.landmarks import Hand, INDEX_FINGER_TIP, THUMB_TIP
+from utils.gesture_detector import GestureDetector, GestureRule
+
+OPEN = (True, True, True, True, True)
+THUMB = (True, False, False, False, False)
+
+
+def hand(fingers, x=0.5, y=0.7):
+    return Hand(hand_pose(fingers, x, y))
+
+
+class TestGestureDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = GestureDetector()
+
+    def test_rule_table(self):
+        pinched = hand(POSE_DRAW)
+        pinched.landmarks[THUMB_TIP] = pinched.landmarks[INDEX_FINGER_TIP]
+        active = self.detector.update([hand(OPEN), hand(POSE_FIST), hand(POSE_DRAW), hand(THUMB), pinched],
+                                      1280, 720, 0.0)
+        self.assertEqual(active[0], {'open_palm'})
+        self.assertEqual(active[1], {'fist'})
+        self.assertEqual(active[2], {'point'})
+        self.assertEqual(active[3], {'thumb'})
+        # The thumb moved sideways onto the index tip, so it counts as up
+        self.assertEqual(active[4], {'pinch'})
+
+    def test_custom_rules(self):
+        detector = GestureDetector(rules=[GestureRule('any_index', fingers='x1xxx'),
+                                          GestureRule('no_pinch', pinch=False)])
+        self.assertEqual(detector.update([hand(OPEN)], 1280, 720, 0.0), [{'any_index', 'no_pinch'}])
+        self.assertEqual(detector.update([hand(POSE_FIST)], 1280, 720, 0.1), [{'no_pinch'}])
+
+    def test_events_and_subscriptions(self):
+        fists, everything = [], []
+        self.detector.subscribe(fists.append, names=['fist'])
+        self.detector.subscribe(everything.append)
+
+        self.detector.update([hand(POSE_FIST)], 1280, 720, 0.0)
+        self.detector.update([hand(POSE_FIST)], 1280, 720, 0.1)
+        self.detector.update([hand(OPEN)], 1280, 720, 0.2)
+        self.detector.update([], 1280, 720, 0.3)
+
+        self.assertEqual([(e.name, e.phase, e.timestamp) for e in fists],
+                         [('fist', 'start', 0.0), ('fist', 'end', 0.2)])
+        self.assertEqual([(e.name, e.phase) for e in everything],
+                         [('fist', 'start'), ('fist', 'end'), ('open_palm', 'start'), ('open_palm', 'end')])
+        self.assertIsNone(everything[-1].position)
+
+        self.detector.unsubscribe(everything.append)
+        self.detector.update([hand(POSE_FIST)], 1280, 720, 0.4)
+        self.assertEqual(len(everything), 4)
+        self.assertEqual(len(fists), 3)
+
+    def sweep(self, x0, x1, frames, t0=0.0, y=0.7):
+        swipes = []
+        for i in range(frames):
+            x = x0 + (x1 - x0) * i / (frames - 1)
+            self.detector.update([hand(OPEN, x, y)], 1280, 720, t0 + i / 30)
+            swipes += [e.name for e in self.detector.events if e.phase == 'trigger']
+        return swipes
+
+    def test_fast_sweep_is_one_swipe(self):
+        self.assertEqual(self.sweep(0.3, 0.7, 10), ['swipe_right'])
+        self.assertEqual(self.sweep(0.7, 0.3, 10, t0=2.0), ['swipe_left'])
+
+    def test_slow_drift_is_not_a_swipe(self):
+        self.assertEqual(self.sweep(0.3, 0.5, 60), [])
+
+    def test_lost_hand_breaks_the_motion(self):
+        self.sweep(0.3, 0.4, 4)
+        self.detector.update([], 1280, 720, 4 / 30)
+        self.assertEqual(self.sweep(0.45, 0.55, 3, t0=5 / 30), [])
+
+    def test_cost_is_measured(self):
+        for i in range(20):
+            self.detector.update([hand(OPEN), hand(POSE_FIST)], 1280, 720, i / 30)
+        stats = self.detector.stats()
+        self.assertEqual(stats['updates'], 20)
+        self.assertGreater(stats['max_us'], 0)
+        self.assertGreaterEqual(stats['max_us'], stats['mean_us'])
+
+
+if __name__ == '__main__':
+    unittest.main()
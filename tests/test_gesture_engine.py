@@ -1,10 +1,49 @@
 import unittest
+import numpy as np
+from benchmarks.synthetic import POSE_DRAW, hand_pose
 from core.gesture_engine import GestureEngine
+from core.landmarks import results_from_arrays
 
 class MockLandmark:
-    def __init__(self, x, y):
+    def __init__(self, x, y, z=0.0):
         self.x = x
         self.y = y
+        self.z = z
+
+class MockHand:
+    def __init__(self, points):
+        self.landmark = [MockLandmark(*p) for p in points]
+
+class SceneHands:
+    """
+    Sees the hands of a scene (full-frame landmarks) that lie entirely
+    inside the image it gets: the whole frame or the engine's ROI crop.
+    """
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.scene = []
+        self.engine = None
+        self.crops = []
+
+    def process(self, rgb):
+        if rgb.shape[:2] == (self.height, self.width):
+            x0, y0, x1, y1 = 0, 0, self.width, self.height
+        else:
+            x0, y0, x1, y1 = self.engine.last_roi
+        self.crops.append((x0, y0, x1, y1))
+        seen = []
+        for hand in self.scene:
+            px, py = hand[:, 0] * self.width, hand[:, 1] * self.height
+            if px.min() >= x0 and px.max() < x1 and py.min() >= y0 and py.max() < y1:
+                crop = hand.copy()
+                crop[:, 0] = (px - x0) / (x1 - x0)
+                crop[:, 1] = (py - y0) / (y1 - y0)
+                seen.append(crop)
+        return results_from_arrays(np.array(seen, dtype=np.float32).reshape(-1, 21, 3))
+
+    def close(self):
+        pass
+
 
 class TestGestureEngine(unittest.TestCase):
     def setUp(self):
@@ -38,5 +77,58 @@ class TestGestureEngine(unittest.TestCase):
         down_landmarks = MockLandmarks(0.6, 0.4)
         self.assertFalse(GestureEngine.is_finger_up(down_landmarks, 8, 6))
 
+    def test_hand_roi_is_square_and_clamped(self):
+        hand = np.array([[0.375, 0.375, 0.0], [0.5, 0.625, 0.0]], dtype=np.float32)
+        x0, y0, x1, y1 = GestureEngine.hand_roi(hand, 1024, 1024, 0.25)
+        # 256 px tall hand, grown by 25% on each side -> 384 px square
+        self.assertEqual((x0, y0, x1, y1), (256, 320, 640, 704))
+
+        corner = np.array([[[0.0, 0.0, 0.0], [0.125, 0.125, 0.0]]], dtype=np.float32)
+        x0, y0, x1, y1 = GestureEngine.hand_roi(corner, 1024, 1024, 0.5)
+        self.assertEqual((x0, y0), (0, 0))
+        self.assertEqual((x1, y1), (192, 192))
+
+    def test_map_landmarks_from_roi(self):
+        hand = MockHand([(0.5, 0.5, 0.1), (0.0, 1.0, 0.0)])
+        GestureEngine.map_landmarks_from_roi([hand], (200, 100, 400, 300), 1000, 500)
+        self.assertAlmostEqual(hand.landmark[0].x, 0.3)
+        self.assertAlmostEqual(hand.landmark[0].y, 0.4)
+        self.assertAlmostEqual(hand.landmark[0].z, 0.02)
+        self.assertAlmostEqual(hand.landmark[1].x, 0.2)
+        self.assertAlmostEqual(hand.landmark[1].y, 0.6)
+
+    def test_roi_tracking_finds_a_second_hand_outside_the_crop(self):
+        hands = SceneHands(640, 480)
+        engine = GestureEngine(max_hands=2, roi_tracking=True, hands=hands, roi_rescan_interval=5)
+        hands.engine = engine
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        hands.scene = [hand_pose(POSE_DRAW, 0.25, 0.8, 0.6)]
+        engine.process_frame(frame)
+        self.assertIsNotNone(engine.last_roi)
+
+        # A second hand enters far from the first one's crop
+        hands.scene.append(hand_pose(POSE_DRAW, 0.8, 0.8, 0.6))
+        counts = []
+        for _ in range(8):
+            engine.process_frame(frame)
+            counts.append(len(engine.detected_hands))
+        self.assertEqual(counts[0], 1)
+        self.assertEqual(counts[-1], 2)
+        self.assertEqual(engine.roi_rescans, 1)
+        # Found no later than roi_rescan_interval crop-only frames after it entered
+        self.assertLessEqual(counts.index(2), 5)
+
+    def test_roi_tracking_with_all_hands_found_stays_on_the_crop(self):
+        hands = SceneHands(640, 480)
+        engine = GestureEngine(max_hands=1, roi_tracking=True, hands=hands, roi_rescan_interval=2)
+        hands.engine = engine
+        hands.scene = [hand_pose(POSE_DRAW, 0.25, 0.8, 0.6)]
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(6):
+            engine.process_frame(frame)
+        self.assertEqual(engine.roi_rescans, 0)
+        self.assertEqual(sum(crop == (0, 0, 640, 480) for crop in hands.crops), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
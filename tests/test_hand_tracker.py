@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.gesture_engine import GestureEngine
+from core.hand_tracker import HandTracker
+from core.landmarks import Hand, results_from_arrays
+from modules.painter import Painter, MODE_DRAW
+
+
+class ScriptedHands:
+    """Hands backend returning a fixed list of (landmarks, handedness) per frame."""
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.index = 0
+
+    def process(self, rgb_frame):
+        hands = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        if not hands:
+            return results_from_arrays(())
+        return results_from_arrays(np.stack([h[0] for h in hands]), [h[1] for h in hands])
+
+    def close(self):
+        pass
+
+
+def pose(x, y):
+    return hand_pose(POSE_DRAW, x, y, size=0.8)
+
+
+class TestHandTracker(unittest.TestCase):
+    def test_ids_follow_hands_when_order_swaps(self):
+        tracker = HandTracker()
+        first = tracker.assign([Hand(pose(0.3, 0.7), 'Left'), Hand(pose(0.7, 0.7), 'Right')])
+        self.assertEqual([h.id for h in first], [0, 1])
+
+        # Detector lists them the other way round and both moved a little
+        swapped = tracker.assign([Hand(pose(0.72, 0.7), 'Right'), Hand(pose(0.31, 0.69), 'Left')])
+        self.assertEqual([(h.id, h.handedness) for h in swapped], [(0, 'Left'), (1, 'Right')])
+
+    def test_new_far_hand_gets_new_id(self):
+        tracker = HandTracker()
+        tracker.assign([Hand(pose(0.3, 0.7))])
+        hands = tracker.assign([Hand(pose(0.8, 0.3))])
+        self.assertEqual(hands[0].id, 1)
+
+    def test_briefly_lost_hand_keeps_its_id(self):
+        tracker = HandTracker(max_missing=3)
+        tracker.assign([Hand(pose(0.3, 0.7)), Hand(pose(0.7, 0.7))])
+        for _ in range(3):
+            tracker.assign([Hand(pose(0.3, 0.7))])
+        back = tracker.assign([Hand(pose(0.3, 0.7)), Hand(pose(0.7, 0.7))])
+        self.assertEqual([h.id for h in back], [0, 1])
+
+        for _ in range(5):
+            tracker.assign([Hand(pose(0.3, 0.7))])
+        self.assertEqual(tracker.assign([Hand(pose(0.7, 0.7))])[0].id, 2)
+
+    def test_handedness_breaks_ties(self):
+        tracker = HandTracker(handedness_penalty=0.5)
+        tracker.assign([Hand(pose(0.50, 0.7), 'Left')])
+        hands = tracker.assign([Hand(pose(0.52, 0.7), 'Right'), Hand(pose(0.55, 0.7), 'Left')])
+        self.assertEqual([(h.id, h.handedness) for h in hands], [(0, 'Left'), (1, 'Right')])
+
+
+class TestTwoHandedPainting(unittest.TestCase):
+    def test_two_hands_draw_separate_strokes(self):
+        left = [(pose(0.2, 0.5 + 0.01 * i), 'Left') for i in range(6)]
+        right = [(pose(0.7, 0.5 + 0.01 * i), 'Right') for i in range(6)]
+        # The backend reports the hands in alternating order
+        frames = [[l, r] if i % 2 else [r, l] for i, (l, r) in enumerate(zip(left, right))]
+        engine = GestureEngine(max_hands=2, hands=ScriptedHands(frames))
+        painter = Painter(320, 240)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+        for i in range(len(frames)):
+            engine.process_frame(frame, i / 30)
+            painter.update(frame.copy(), None, engine)
+            self.assertEqual([h.id for h in engine.detected_hands], [0, 1])
+            self.assertEqual(painter.current_mode, MODE_DRAW)
+
+        # Nothing was drawn between the hands
+        self.assertTrue(painter.canvas[:, 20:80].any())
+        self.assertTrue(painter.canvas[:, 200:260].any())
+        self.assertFalse(painter.canvas[:, 110:170].any())
+
+        stats = engine.stats()
+        self.assertEqual(stats['hands_per_frame'], 2.0)
+        self.assertGreater(stats['per_hand_us'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.gesture_engine import GestureEngine, mediapipe_solutions
+from core.hands_loader import BackgroundHands
+from core.landmarks import results_from_arrays
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SlowHands:
+    """Hands backend whose creation blocks until release is set."""
+    def __init__(self, release):
+        release.wait(5.0)
+        self.shapes = []
+        self.closed = False
+
+    def process(self, rgb_frame):
+        self.shapes.append(rgb_frame.shape)
+        return results_from_arrays(hand_pose(POSE_DRAW, 0.5, 0.5)[None], ['Right'])
+
+    def close(self):
+        self.closed = True
+
+
+class TestBackgroundHands(unittest.TestCase):
+    def test_no_hands_until_loaded_then_delegates(self):
+        release = threading.Event()
+        created = []
+        hands = BackgroundHands(lambda: created.append(SlowHands(release)) or created[0],
+                                warmup_shape=(48, 64, 3))
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        engine = GestureEngine(hands=hands)
+
+        # The frame loop does not wait for the model
+        engine.process_frame(frame)
+        self.assertEqual(engine.detected_hands, [])
+        self.assertFalse(hands.loaded)
+
+        release.set()
+        self.assertTrue(hands.wait(5.0))
+        engine.process_frame(frame)
+        self.assertEqual(len(engine.detected_hands), 1)
+        # One warm-up frame, then the real one
+        self.assertEqual(created[0].shapes, [(48, 64, 3), (120, 160, 3)])
+        stats = hands.stats()
+        self.assertEqual(stats['frames_before_ready'], 1)
+        self.assertGreaterEqual(stats['ready_ms'], stats['load_ms'])
+
+        engine.close()
+        self.assertTrue(created[0].closed)
+
+    def test_load_error_surfaces_on_process(self):
+        def fail():
+            raise ImportError("no model")
+        hands = BackgroundHands(fail)
+        hands.wait(5.0)
+        with self.assertRaises(ImportError):
+            hands.process(np.zeros((8, 8, 3), dtype=np.uint8))
+        hands.close()
+
+    @unittest.skipIf(mediapipe_solutions() is not None, "MediaPipe Hands is available")
+    def test_engine_background_load_without_mediapipe(self):
+        # Construction no longer fails or blocks; the error shows up on use
+        engine = GestureEngine(background_load=True)
+        self.assertTrue(engine.hands.wait(30.0))
+        with self.assertRaises(ImportError):
+            engine.process_frame(np.zeros((8, 8, 3), dtype=np.uint8))
+        engine.close()
+
+    def test_engine_import_does_not_import_mediapipe(self):
+        code = "import sys, core.gesture_engine; print('mediapipe' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=REPO_ROOT, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.gesture_engine import GestureEngine
+from core.inference_worker import InferenceWorker
+from core.landmarks import results_from_arrays
+
+
+class BrightnessHands:
+    """Reports one hand whose x coordinate is the mean red level of the frame."""
+    def process(self, rgb_frame):
+        landmarks = np.zeros((1, 21, 3), dtype=np.float32)
+        landmarks[0, :, 0] = rgb_frame[..., 0].mean() / 255.0
+        landmarks[0, :, 1] = rgb_frame.shape[1] / 1000.0
+        return results_from_arrays(landmarks, ['Left'], [0.8])
+
+    def close(self):
+        pass
+
+
+class CrashingHands(BrightnessHands):
+    """Kills its process on the third frame."""
+    def __init__(self):
+        self.frames = 0
+
+    def process(self, rgb_frame):
+        self.frames += 1
+        if self.frames == 3:
+            os._exit(1)
+        return super().process(rgb_frame)
+
+
+def frame(blue, width=64, height=48):
+    # BGR input: blue ends up as the last RGB channel, red is what gets measured
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[..., 2] = blue
+    return image
+
+
+class TestInferenceWorker(unittest.TestCase):
+    def test_engine_results_come_from_the_worker(self):
+        with InferenceWorker(64, 48, backend_factory=BrightnessHands) as worker:
+            engine = GestureEngine(hands=worker)
+            for level in (51, 102, 0):
+                engine.process_frame(frame(level))
+                hand = engine.detected_hands[0]
+                self.assertAlmostEqual(float(hand.landmarks[0, 0]), level / 255.0, places=5)
+                self.assertEqual(hand.handedness, 'Left')
+                self.assertAlmostEqual(hand.score, 0.8, places=5)
+
+            # Smaller inputs (crops, downscaled frames) fit in a slot too
+            engine.inference_scale = 0.5
+            engine.process_frame(frame(51))
+            self.assertAlmostEqual(float(engine.detected_hands[0].landmarks[0, 1]), 0.032, places=5)
+
+            engine.inference_scale = 1.0
+            with self.assertRaises(ValueError):
+                engine.process_frame(frame(0, width=128))
+
+    def test_plain_frames_are_copied_into_the_ring(self):
+        with InferenceWorker(64, 48, backend_factory=BrightnessHands) as worker:
+            rgb = np.full((48, 64, 3), 255, dtype=np.uint8)
+            results = worker.process(rgb)
+            self.assertAlmostEqual(results.multi_hand_landmarks[0].landmark[0].x, 1.0)
+
+    def test_pipelined_returns_previous_frame(self):
+        with InferenceWorker(64, 48, backend_factory=BrightnessHands, pipelined=True) as worker:
+            engine = GestureEngine(hands=worker)
+            engine.process_frame(frame(51))
+            self.assertEqual(engine.detected_hands, [])
+            engine.process_frame(frame(102))
+            self.assertAlmostEqual(float(engine.detected_hands[0].landmarks[0, 0]), 0.2, places=5)
+            engine.process_frame(frame(0))
+            self.assertAlmostEqual(float(engine.detected_hands[0].landmarks[0, 0]), 0.4, places=5)
+
+    def test_crashed_worker_is_restarted(self):
+        with InferenceWorker(64, 48, backend_factory=CrashingHands, timeout=2.0) as worker:
+            engine = GestureEngine(hands=worker)
+            found = []
+            for _ in range(4):
+                engine.process_frame(frame(51))
+                found.append(len(engine.detected_hands))
+            self.assertEqual(found, [1, 1, 0, 1])
+            self.assertEqual(worker.restarts, 1)
+            self.assertTrue(worker.is_alive())
+
+    def test_close_releases_shared_memory(self):
+        worker = InferenceWorker(64, 48, backend_factory=BrightnessHands)
+        name = worker._frames_shm.name
+        process = worker._process
+        worker.close()
+        self.assertFalse(process.is_alive())
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
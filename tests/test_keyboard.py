@@ -0,0 +1,157 @@
+import unittest
+import numpy as np
+
+from core.landmarks import Hand, INDEX_FINGER_TIP, THUMB_TIP
+from modules.keyboard import KEYBOARD_LAYOUTS, VirtualKeyboard
+from utils.gesture_detector import GestureDetector
+
+
+class FakeEngine:
+    """Just enough of GestureEngine for VirtualKeyboard.update."""
+    def __init__(self):
+        self.detected_hands = []
+        self.gestures = GestureDetector()
+
+    def draw_hands(self, frame, hands=None, style=None):
+        pass
+
+    def pinch_at(self, x, y):
+        landmarks = np.zeros((21, 3), dtype=np.float32)
+        landmarks[INDEX_FINGER_TIP, :2] = (x, y)
+        landmarks[THUMB_TIP, :2] = (x, y)
+        self.detected_hands = [Hand(landmarks)]
+        self.gestures.update(self.detected_hands, 1280, 720)
+
+    def point_at(self, x, y):
+        landmarks = np.zeros((21, 3), dtype=np.float32)
+        landmarks[INDEX_FINGER_TIP, :2] = (x, y)
+        landmarks[THUMB_TIP, :2] = (x + 0.2, y)
+        self.detected_hands = [Hand(landmarks)]
+        self.gestures.update(self.detected_hands, 1280, 720)
+
+
+class TestKeyboardLayers(unittest.TestCase):
+    def setUp(self):
+        self.width, self.height = 1280, 720
+        self.keyboard = VirtualKeyboard(self.width, self.height)
+        self.engine = FakeEngine()
+
+    def blank(self):
+        return np.full((self.height, self.width, 3), 37, dtype=np.uint8)
+
+    def test_layers_match_direct_drawing(self):
+        frame = self.keyboard.update(self.blank(), None, self.engine)
+
+        expected = self.blank()
+        self.keyboard.draw_search_bar(expected)
+        self.keyboard.draw_keyboard(expected, self.keyboard.current_layout, self.keyboard.keyboard_y_start)
+        self.keyboard.draw_instructions(expected)
+        # Anti-aliased text edges may differ by rounding only
+        diff = np.abs(frame.astype(int) - expected.astype(int))
+        self.assertLessEqual(int(diff.max()), 2)
+
+    def test_layers_are_cached_until_state_changes(self):
+        self.keyboard.update(self.blank(), None, self.engine)
+        renders = self.keyboard.layer_renders
+        for _ in range(5):
+            self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.layer_renders, renders)
+
+        self.keyboard.text_input = "abc"
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.layer_renders, renders + 1)
+
+    def test_pinch_presses_key(self):
+        self.keyboard.update(self.blank(), None, self.engine)
+        kx, ky, kw, kh = self.keyboard.key_positions['q']
+        self.engine.pinch_at((kx + kw / 2) / self.width, (ky + kh / 2) / self.height)
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.text_input, 'q')
+
+        # Holding the pinch does not repeat the key
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.text_input, 'q')
+
+
+def linear_scan(positions, x, y):
+    for key, (kx, ky, kw, kh) in positions.items():
+        if kx <= x <= kx + kw and ky <= y <= ky + kh:
+            return key
+    return None
+
+
+class TestKeyboardHitTesting(unittest.TestCase):
+    def setUp(self):
+        self.width, self.height = 1280, 720
+        self.keyboard = VirtualKeyboard(self.width, self.height, dwell_time=0.3)
+        self.engine = FakeEngine()
+
+    def blank(self):
+        return np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def center(self, key):
+        kx, ky, kw, kh = self.keyboard.key_positions[key]
+        return (kx + kw / 2) / self.width, (ky + kh / 2) / self.height
+
+    def test_hit_map_matches_linear_scan(self):
+        ys, xs = np.mgrid[0:self.height:3, 0:self.width:3]
+        for layout in KEYBOARD_LAYOUTS:
+            self.keyboard.current_layout = layout
+            self.keyboard.key_map()
+            for x, y in zip(xs.ravel().tolist(), ys.ravel().tolist()):
+                self.assertEqual(self.keyboard.check_key_press(x, y),
+                                 linear_scan(self.keyboard.key_positions, x, y))
+        self.keyboard.dropdown_map()
+        for x, y in zip(xs.ravel().tolist(), ys.ravel().tolist()):
+            self.assertEqual(self.keyboard.check_dropdown_click(x, y),
+                             linear_scan(self.keyboard.dropdown_positions, x, y))
+        self.assertIsNone(self.keyboard.check_key_press(-5, 10))
+        self.assertIsNone(self.keyboard.check_key_press(10, self.height))
+
+    def test_geometry_is_built_once_per_layout(self):
+        hit_map = self.keyboard.key_map()
+        self.keyboard.current_search_engine = 'YouTube'
+        self.assertIs(self.keyboard.key_map(), hit_map)
+        self.keyboard.current_layout = 'sym_main'
+        self.assertIsNot(self.keyboard.key_map(), hit_map)
+
+    def test_hover_follows_index_finger(self):
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.engine.point_at(*self.center('w'))
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.hover_key, 'w')
+        self.assertEqual(self.keyboard.text_input, '')
+
+        self.engine.detected_hands = []
+        self.engine.gestures.update([], 1280, 720)
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertIsNone(self.keyboard.hover_key)
+
+    def test_dwell_types_key_once(self):
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.engine.point_at(*self.center('e'))
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.keyboard._hover_since -= 0.5
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.text_input, 'e')
+
+        # Staying on the key does not repeat it
+        self.keyboard._hover_since -= 0.5
+        self.keyboard.last_click_time -= 1.0
+        self.keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(self.keyboard.text_input, 'e')
+
+    def test_no_dwell_by_default(self):
+        keyboard = VirtualKeyboard(self.width, self.height)
+        keyboard.update(self.blank(), None, self.engine)
+        self.keyboard = keyboard
+        self.engine.point_at(*self.center('e'))
+        keyboard.update(self.blank(), None, self.engine)
+        keyboard._hover_since -= 5.0
+        keyboard.update(self.blank(), None, self.engine)
+        self.assertEqual(keyboard.hover_key, 'e')
+        self.assertEqual(keyboard.text_input, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
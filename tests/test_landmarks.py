@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+
+from core.landmarks import (
+    INDEX_FINGER_TIP, MIDDLE_FINGER_TIP,
+    THUMB_IP, THUMB_TIP, fingers_up, fingers_to_dict, hands_from_results,
+    is_pinch, landmark_distance, pairwise_distances, stack_hands,
+)
+
+
+def make_hand(index_up=False, middle_up=False, thumb_out=False):
+    """Builds a (21, 3) hand with every finger folded unless asked otherwise."""
+    hand = np.full((21, 3), 0.5, dtype=np.float32)
+    hand[:, 2] = 0.0
+    # Folded: tips below (greater y than) their PIP joints
+    for tip in (8, 12, 16, 20):
+        hand[tip, 1] = 0.6
+        hand[tip - 2, 1] = 0.5
+    if index_up:
+        hand[INDEX_FINGER_TIP, 1] = 0.3
+    if middle_up:
+        hand[MIDDLE_FINGER_TIP, 1] = 0.3
+    hand[THUMB_IP, 0] = 0.5
+    hand[THUMB_TIP, 0] = 0.6 if thumb_out else 0.51
+    return hand
+
+
+class TestLandmarks(unittest.TestCase):
+    def test_fingers_up_single_hand(self):
+        states = fingers_up(make_hand(index_up=True))
+        self.assertEqual(states.shape, (5,))
+        self.assertEqual(fingers_to_dict(states),
+                         {'thumb': False, 'index': True, 'middle': False, 'ring': False, 'pinky': False})
+
+    def test_fingers_up_batch(self):
+        batch = np.stack([make_hand(), make_hand(index_up=True, middle_up=True), make_hand(thumb_out=True)])
+        states = fingers_up(batch)
+        self.assertEqual(states.shape, (3, 5))
+        self.assertEqual(states.sum(axis=1).tolist(), [0, 2, 1])
+        self.assertTrue(states[2, 0])
+
+    def test_distances(self):
+        hand = make_hand()
+        hand[THUMB_TIP, :2] = (0.1, 0.1)
+        hand[INDEX_FINGER_TIP, :2] = (0.4, 0.5)
+        self.assertAlmostEqual(float(landmark_distance(hand, THUMB_TIP, INDEX_FINGER_TIP, 1000, 1000)), 500.0, places=3)
+
+        dists = pairwise_distances(hand, 1000, 1000)
+        self.assertEqual(dists.shape, (21, 21))
+        self.assertAlmostEqual(float(dists[THUMB_TIP, INDEX_FINGER_TIP]), 500.0, places=3)
+        self.assertTrue(np.allclose(dists, dists.T))
+        self.assertTrue(np.allclose(np.diag(dists), 0))
+
+    def test_pinch(self):
+        open_hand = make_hand()
+        open_hand[THUMB_TIP, :2] = (0.1, 0.1)
+        open_hand[INDEX_FINGER_TIP, :2] = (0.4, 0.5)
+        pinched = make_hand()
+        pinched[THUMB_TIP, :2] = (0.40, 0.50)
+        pinched[INDEX_FINGER_TIP, :2] = (0.42, 0.51)
+        result = is_pinch(np.stack([open_hand, pinched]), 1280, 720)
+        self.assertEqual(result.tolist(), [False, True])
+
+    def test_hands_from_results(self):
+        class Point:
+            def __init__(self, i):
+                self.x, self.y, self.z = i / 100, i / 50, -i / 1000
+
+        class LandmarkList:
+            landmark = [Point(i) for i in range(21)]
+
+        class Classification:
+            label, score = 'Right', 0.9
+
+        class Handedness:
+            classification = [Classification()]
+
+        class Results:
+            multi_hand_landmarks = [LandmarkList()]
+            multi_handedness = [Handedness()]
+
+        hands = hands_from_results(Results())
+        self.assertEqual(len(hands), 1)
+        self.assertEqual(hands[0].handedness, 'Right')
+        self.assertEqual(hands[0].landmarks.dtype, np.float32)
+        self.assertAlmostEqual(float(hands[0].landmarks[20, 1]), 0.4, places=6)
+        self.assertEqual(stack_hands(hands).shape, (1, 21, 3))
+
+        class Empty:
+            multi_hand_landmarks = None
+
+        self.assertEqual(hands_from_results(Empty()), [])
+        self.assertEqual(stack_hands([]).shape, (0, 21, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from utils.logger import StartupTimer, Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        first = tracer.span('a')
+        with first:
+            pass
+        self.assertIs(tracer.span('b'), first)
+        self.assertEqual(len(tracer.events), 0)
+        self.assertEqual(tracer.stats(), {})
+
+    def test_spans_and_stats(self):
+        tracer = Tracer(enabled=True, capacity=4, window=3)
+        for _ in range(5):
+            with tracer.span('outer'):
+                with tracer.span('inner'):
+                    pass
+        # The event ring and the stats window are bounded
+        self.assertEqual(len(tracer.events), 4)
+        stats = tracer.stats()
+        self.assertEqual(set(stats), {'outer', 'inner'})
+        self.assertEqual(stats['outer']['count'], 3)
+        self.assertGreaterEqual(stats['outer']['mean'], stats['inner']['mean'])
+
+    def test_chrome_trace_export(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span('main.frame'):
+            pass
+
+        def read():
+            with tracer.span('capture.read'):
+                pass
+
+        worker = threading.Thread(target=read, name='CameraManager')
+        worker.start()
+        worker.join()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'trace.json')
+        tracer.export_chrome_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+
+        spans = [e for e in events if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in spans], ['main.frame', 'capture.read'])
+        self.assertEqual(spans[0]['cat'], 'main')
+        self.assertEqual(spans[0]['ts'], 0)
+        self.assertNotEqual(spans[0]['tid'], spans[1]['tid'])
+        names = {e['args']['name'] for e in events if e['ph'] == 'M'}
+        self.assertIn('CameraManager', names)
+
+    def test_nested_spans_start_at_or_after_origin(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span('outer'):
+            with tracer.span('inner'):
+                pass
+        spans = [e for e in tracer.chrome_trace()['traceEvents'] if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in spans], ['inner', 'outer'])
+        self.assertTrue(all(e['ts'] >= 0 for e in spans))
+        self.assertEqual(min(e['ts'] for e in spans), 0)
+
+    def test_overlay_draws_in_place(self):
+        tracer = Tracer(enabled=True)
+        img = np.full((240, 320, 3), 200, dtype=np.uint8)
+        tracer.draw_overlay(img)
+        self.assertTrue((img == 200).all())
+
+        with tracer.span('painter.render'):
+            pass
+        tracer.draw_overlay(img)
+        self.assertFalse((img[10:40, 10:100] == 200).all())
+        self.assertTrue((img[200:] == 200).all())
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_first_mark_counts_and_report_is_ordered(self):
+        timer = StartupTimer(start=10.0)
+        timer.mark('camera', at=10.5)
+        timer.mark('imports', at=10.2)
+        timer.mark('camera', at=11.0)
+        self.assertAlmostEqual(timer.marks['camera'], 0.5)
+        lines = timer.report().splitlines()
+        self.assertIn('imports', lines[1])
+        self.assertIn('camera', lines[2])
+        self.assertIn('(+300.0)', lines[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.config_manager import MouseConfig
+from core.gesture_engine import GestureEngine
+from core.landmarks import INDEX_FINGER_TIP, THUMB_TIP, results_from_arrays
+from core.state_machine import StateMachine
+from modules.mouse_control import CursorDriver, CursorTrack, MouseControl, RecordingBackend
+
+PEACE = (False, True, True, False, False)
+
+
+class PointingHands:
+    """Hands backend with one hand whose index tip is at (x, y); None means no hand."""
+    def __init__(self):
+        self.tip = (0.5, 0.5)
+        self.fingers = POSE_DRAW
+        self.pinch = False
+
+    def process(self, rgb_frame):
+        if self.tip is None:
+            return results_from_arrays(())
+        landmarks = hand_pose(self.fingers, 0.5, 0.7)
+        landmarks[:, :2] += np.array(self.tip, dtype=np.float32) - landmarks[INDEX_FINGER_TIP, :2]
+        if self.pinch:
+            landmarks[THUMB_TIP] = landmarks[INDEX_FINGER_TIP]
+        return results_from_arrays(landmarks[None], ['Right'])
+
+    def close(self):
+        pass
+
+
+class TestCursorDriver(unittest.TestCase):
+    def test_extrapolation_is_capped(self):
+        track = CursorTrack(max_extrapolation=0.05)
+        self.assertIsNone(track.target(0.0))
+        track.push(0.0, 100.0, 100.0)
+        track.push(0.1, 110.0, 100.0)
+        self.assertEqual(track.target(0.12), (112.0, 100.0))
+        self.assertEqual(track.target(1.0), (115.0, 100.0))
+        # A jump starts a new motion
+        track.push(0.2, 500.0, 100.0, jump=True)
+        self.assertEqual(track.target(0.25), (500.0, 100.0))
+
+    def test_cursor_glides_between_hand_updates(self):
+        backend = RecordingBackend(1000, 500)
+        driver = CursorDriver(backend, rate_hz=120.0, smoothing=0.7, max_extrapolation=0.08)
+        speed = 300.0  # pixels per second
+        errors = []
+        for tick in range(120):
+            now = tick / 120.0
+            if tick % 4 == 0:
+                # Hand updates at 30 Hz
+                driver.track.push(now, 100.0 + speed * now, 250.0)
+            x, y = driver.step(now)
+            if now > 0.5:
+                errors.append(abs(x - (100.0 + speed * now)))
+        xs = [move[1] for move in backend.moves]
+        # Moves on (almost) every display tick, not in 30 Hz steps of 10 px
+        self.assertGreater(len(xs), 100)
+        self.assertLess(max(np.diff(xs[60:])), 6)
+        # The lead keeps it on the moving fingertip instead of trailing behind
+        self.assertLess(np.mean(errors), 3.0)
+
+    def test_clamped_to_screen_and_buttons_follow_moves(self):
+        backend = RecordingBackend(800, 600)
+        driver = CursorDriver(backend, smoothing=0.0)
+        driver.track.push(0.0, -50.0, 900.0)
+        driver.press()
+        self.assertEqual(driver.step(0.0), (0, 599))
+        driver.release()
+        driver.step(0.01)
+        self.assertEqual([b[1] for b in backend.buttons], ['press', 'release'])
+        self.assertLessEqual(backend.moves[0][0], backend.buttons[0][0])
+
+    def test_thread_runs_at_display_rate(self):
+        backend = RecordingBackend()
+        driver = CursorDriver(backend, rate_hz=200.0)
+        driver.track.push(0.0, 10.0, 10.0)
+        driver.start()
+        driver._stop.wait(0.25)
+        driver.close()
+        self.assertFalse(driver.running)
+        self.assertGreater(driver.ticks, 20)
+
+
+class TestMouseControl(unittest.TestCase):
+    def setUp(self):
+        self.hands = PointingHands()
+        self.engine = GestureEngine(hands=self.hands)
+        self.backend = RecordingBackend(1000, 500)
+        config = MouseConfig(sensitivity=1.0, dead_zone=0.1, precision_scale=0.25)
+        self.mouse = MouseControl(640, 480, config, backend=self.backend)
+        self.machine = StateMachine(self.engine)
+        self.machine.add('mouse', self.mouse)
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        self.mouse.close()
+
+    def step(self):
+        results = self.engine.process_frame(self.frame)
+        self.machine.update(self.frame, results)
+
+    def target(self):
+        track = self.mouse.driver.track
+        return track.target(track._sample[0]) if track._sample else None
+
+    def test_dead_zones_map_to_screen_edges(self):
+        self.hands.tip = (0.1, 0.9)
+        self.step()
+        np.testing.assert_allclose(self.target(), (0.0, 499.0), atol=0.01)
+        self.hands.tip = (0.5, 0.5)
+        self.step()
+        np.testing.assert_allclose(self.target(), (499.5, 249.5), atol=0.01)
+        # Beyond the active area the target is clamped by the driver
+        self.assertAlmostEqual(self.mouse.to_screen(0.0, 0.5)[0], -124.875)
+        self.assertTrue(self.mouse.driver.running)
+
+    def test_precision_mode_slows_relative_motion(self):
+        self.hands.tip = (0.5, 0.5)
+        self.step()
+        self.mouse.driver.position = (499.5, 249.5)
+        self.hands.fingers = PEACE
+        self.step()
+        self.assertTrue(self.mouse.precision)
+        self.hands.tip = (0.6, 0.5)
+        self.step()
+        x, y = self.target()
+        # 0.1 of the frame is 125 px normally, a quarter of that in precision mode
+        # (the cursor thread keeps easing, so the anchor is within a pixel)
+        self.assertAlmostEqual(x, 499.5 + 125.0 * 0.25, delta=0.5)
+        self.hands.fingers = POSE_DRAW
+        self.step()
+        self.assertFalse(self.mouse.precision)
+        self.assertAlmostEqual(self.target()[0], 624.375, delta=0.01)
+
+    def test_pinch_holds_button_until_hand_lost(self):
+        self.step()
+        self.hands.pinch = True
+        self.step()
+        self.assertTrue(self.mouse.button_down)
+        self.hands.tip = None
+        self.step()
+        self.assertFalse(self.mouse.button_down)
+        self.assertIsNone(self.mouse.driver.track.target(0.0))
+        self.mouse.close()
+        self.assertEqual([b[1] for b in self.backend.buttons], ['press', 'release'])
+
+
+if __name__ == '__main__':
+    unittest.main()
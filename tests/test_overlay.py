@@ -0,0 +1,112 @@
+import tracemalloc
+import unittest
+
+import cv2
+import numpy as np
+
+from core.landmarks import Hand, INDEX_FINGER_PIP, INDEX_FINGER_TIP
+from modules.keyboard import VirtualKeyboard
+from modules.painter import Painter, INFO_PANEL_HEIGHT
+from ui.overlay import Compositor, OverlayLayer
+from utils.gesture_detector import GestureDetector
+
+
+class FakeEngine:
+    def __init__(self):
+        self.detected_hands = []
+        self.gestures = GestureDetector()
+
+    def draw_hands(self, frame, hands=None, style=None):
+        pass
+
+    def point_at(self, x, y):
+        """One hand with only the index finger up, tip at (x, y)."""
+        landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+        landmarks[:, 2] = 0.0
+        for tip in (12, 16, 20):
+            landmarks[tip, 1] = 0.9
+        landmarks[INDEX_FINGER_TIP, :2] = (x, y)
+        landmarks[INDEX_FINGER_PIP, 1] = y + 0.1
+        self.detected_hands = [Hand(landmarks)]
+        self.gestures.update(self.detected_hands, 640, 480)
+
+
+class TestOverlayLayer(unittest.TestCase):
+    def test_blend_matches_direct_drawing(self):
+        def draw(img):
+            cv2.rectangle(img, (10, 10), (60, 40), (0, 200, 255), -1)
+            cv2.putText(img, "Hello", (70, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2, cv2.LINE_AA)
+
+        layer, _ = OverlayLayer.render((60, 200, 3), draw)
+        rng = np.random.default_rng(1)
+        frame = rng.integers(0, 256, (60, 200, 3), dtype=np.uint8)
+        expected = frame.copy()
+        draw(expected)
+        layer.blend(frame)
+        diff = np.abs(frame.astype(int) - expected.astype(int))
+        self.assertLessEqual(int(diff.max()), 1)
+
+    def test_antialiased_edges_on_white_do_not_wrap(self):
+        # A half-transparent anti-aliased edge pixel whose channels rounded
+        # differently in the two renders (alpha comes from the widest one)
+        on_black = np.zeros((3, 3, 3), dtype=np.uint8)
+        on_white = np.full((3, 3, 3), 255, dtype=np.uint8)
+        on_black[1, 1] = (129, 128, 128)
+        on_white[1, 1] = (255, 255, 254)
+        on_black[1, 2] = on_white[1, 2] = (255, 255, 255)
+        layer = OverlayLayer(on_black, on_white)
+        self.assertEqual(len(layer.edge_bgr), 1)
+
+        frame = np.full((3, 3, 3), 255, dtype=np.uint8)
+        layer.blend(frame)
+        # Near-white over white stays white, no black speck
+        self.assertEqual(tuple(int(v) for v in frame[1, 1]), (255, 255, 255))
+
+class TestCompositor(unittest.TestCase):
+    def test_buffers_are_reused(self):
+        compositor = Compositor(32, 16, panel_height=8, buffers=2)
+        frame = np.full((16, 32, 3), 7, dtype=np.uint8)
+        compositor.panel().fill(200)
+
+        outputs = []
+        for _ in range(4):
+            compositor.begin(frame)
+            outputs.append(compositor.finish())
+        self.assertIs(outputs[0], outputs[2])
+        self.assertIs(outputs[1], outputs[3])
+        self.assertIsNot(outputs[0], outputs[1])
+        for out in outputs[:2]:
+            self.assertEqual(out.shape, (24, 32, 3))
+            self.assertTrue((out[:16] == 7).all())
+            self.assertTrue((out[16:] == 200).all())
+
+    def test_steady_state_frames_allocate_no_full_frames(self):
+        width, height = 640, 480
+        frame_bytes = width * height * 3
+        engine = FakeEngine()
+        painter = Painter(width, height)
+        keyboard = VirtualKeyboard(width, height)
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+        def run_frames(count, start):
+            for i in range(start, start + count):
+                engine.point_at(0.2 + 0.01 * (i % 40), 0.3)
+                output = painter.update(frame, None, engine)
+                keyboard.update(frame, None, engine)
+            return output
+
+        # Warm up: buffers, cached layers and the info panel get created
+        output = run_frames(5, 0)
+        self.assertEqual(output.shape, (height + INFO_PANEL_HEIGHT, width, 3))
+
+        tracemalloc.start()
+        try:
+            run_frames(30, 5)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, frame_bytes // 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import cv2
+import numpy as np
+
+from modules.painter import Painter, SHAPE_CIRCLE, SHAPE_RECT, SHAPE_TRIANGLE
+
+
+def reference_composite(frame, canvas):
+    """The original full-frame compositing of Painter._render."""
+    gray_canvas = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
+    _, mask = cv2.threshold(gray_canvas, 1, 255, cv2.THRESH_BINARY)
+    mask_inv = cv2.bitwise_not(mask)
+    frame_bg = cv2.bitwise_and(frame, frame, mask=mask_inv)
+    canvas_fg = cv2.bitwise_and(canvas, canvas, mask=mask)
+    return cv2.add(frame_bg, canvas_fg)
+
+
+class TestPainterCompositing(unittest.TestCase):
+    def setUp(self):
+        self.painter = Painter(320, 200)
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (200, 320, 3), dtype=np.uint8)
+
+    def test_empty_canvas_touches_nothing(self):
+        frame = self.frame.copy()
+        self.painter.composite(frame)
+        self.assertFalse(self.painter.ink_tiles.any())
+        self.assertTrue((frame == self.frame).all())
+
+    def test_matches_full_frame_compositing(self):
+        painter = self.painter
+        painter.draw_line((10, 10), (300, 190), (255, 0, 0), 5)
+        painter.draw_line((-20, 100), (60, 120), (0, 255, 255), 9)
+        painter.draw_shapes_final((160, 100), (200, 100), SHAPE_CIRCLE, (0, 0, 255), 5)
+        painter.draw_shapes_final((20, 150), (90, 190), SHAPE_RECT, (0, 255, 0), 5)
+        painter.draw_shapes_final((250, 20), (300, 80), SHAPE_TRIANGLE, (255, 0, 255), 3)
+        # Erasing goes through the same path with black ink
+        painter.draw_line((0, 0), (319, 199), (0, 0, 0), 30)
+
+        expected = reference_composite(self.frame, painter.canvas)
+        frame = self.frame.copy()
+        painter.composite(frame)
+        self.assertTrue((frame == expected).all())
+
+    def test_stroke_only_marks_its_tiles(self):
+        self.painter.draw_line((5, 5), (20, 20), (255, 255, 255), 3)
+        self.assertEqual(int(self.painter.ink_tiles.sum()), 1)
+        self.assertTrue(self.painter.ink_tiles[0, 0])
+
+        # Erasing the stroke empties the tile again
+        self.painter.draw_line((5, 5), (20, 20), (0, 0, 0), 10)
+        self.assertFalse(self.painter.ink_tiles.any())
+
+    def test_clear_and_invalidate(self):
+        self.painter.draw_line((5, 5), (300, 150), (255, 255, 255), 3)
+        self.painter.clear_canvas()
+        self.assertFalse(self.painter.ink_tiles.any())
+        self.assertFalse(self.painter.canvas.any())
+
+        self.painter.canvas[195:, 310:] = 255
+        self.painter.invalidate()
+        self.assertTrue(self.painter.ink_tiles[-1, -1])
+        self.assertEqual(int(self.painter.ink_tiles.sum()), 1)
+
+
+class TestPainterHistory(unittest.TestCase):
+    def setUp(self):
+        self.painter = Painter(320, 200)
+
+    def snapshot(self):
+        return self.painter.canvas.copy(), self.painter.ink_tiles.copy()
+
+    def assertState(self, state):
+        canvas, ink_tiles = state
+        self.assertTrue((self.painter.canvas == canvas).all())
+        self.assertTrue((self.painter.ink_tiles == ink_tiles).all())
+
+    def test_undo_redo_strokes_shapes_and_clear(self):
+        painter = self.painter
+        states = [self.snapshot()]
+        painter.draw_line((10, 10), (100, 40), (255, 0, 0), 5)
+        painter.draw_line((100, 40), (150, 90), (255, 0, 0), 5)
+        painter.history.commit()
+        states.append(self.snapshot())
+        painter.draw_shapes_final((200, 100), (230, 100), SHAPE_CIRCLE, (0, 0, 255), 5)
+        states.append(self.snapshot())
+        painter.draw_line((0, 0), (120, 60), (0, 0, 0), 30)
+        states.append(self.snapshot())
+        painter.clear_canvas()
+        states.append(self.snapshot())
+        self.assertEqual(len(painter.history.undo_stack), 4)
+
+        for state in reversed(states[:-1]):
+            painter.undo()
+            self.assertState(state)
+        painter.undo()
+        self.assertState(states[0])
+
+        for state in states[1:]:
+            painter.redo()
+            self.assertState(state)
+
+    def test_new_action_drops_redo(self):
+        painter = self.painter
+        painter.draw_line((10, 10), (100, 40), (255, 0, 0), 5)
+        painter.undo()
+        painter.draw_line((10, 150), (100, 150), (0, 255, 0), 5)
+        painter.redo()
+        self.assertEqual(painter.history.stats()['redo'], 0)
+        self.assertFalse(painter.canvas[10:41, 10:101].any())
+        self.assertTrue(painter.canvas[150, 50].any())
+
+    def test_only_changed_tiles_are_stored(self):
+        painter = self.painter
+        painter.draw_line((5, 5), (20, 20), (255, 255, 255), 3)
+        painter.history.commit()
+        tiles, size = painter.history.undo_stack[-1]
+        self.assertEqual(len(tiles), 1)
+        # A compressed stroke tile is far smaller than the raw 64x64x3 tile
+        self.assertLess(size, 64 * 64 * 3)
+
+        # Clearing saves only the inked tiles
+        painter.clear_canvas()
+        tiles, _ = painter.history.undo_stack[-1]
+        self.assertEqual(len(tiles), 1)
+
+    def test_memory_cap_evicts_oldest(self):
+        painter = Painter(320, 200, history_bytes=4000)
+        rng = np.random.default_rng(0)
+        for i in range(20):
+            painter.draw_line(tuple(rng.integers(0, 300, 2).tolist()), tuple(rng.integers(0, 190, 2).tolist()),
+                              (255, i * 10, 0), 7)
+            painter.history.commit()
+        stats = painter.history.stats()
+        self.assertLessEqual(stats['bytes'], 4000)
+        self.assertGreater(stats['evicted'], 0)
+        self.assertEqual(stats['undo'] + stats['evicted'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, POSE_FIST, hand_pose
+from core.config_manager import GestureBinding
+from core.gesture_engine import GestureEngine
+from core.landmarks import Hand
+from core.recorder import LandmarkRecorder, LandmarkRecording, ReplayHands
+from core.state_machine import StateMachine
+from modules.presentation_control import LATENCY_BUDGET, PresentationControl, RecordingBackend
+
+FPS = 30.0
+
+
+def swipe_path(x0=0.25, x1=0.75, still=6, moving=10):
+    """Palm x per frame: still, an eased swipe over moving frames, still again."""
+    s = np.linspace(0.0, 1.0, moving)
+    eased = s * s * (3 - 2 * s)
+    return [x0] * still + list(x0 + (x1 - x0) * eased) + [x1] * still
+
+
+class TestPresentationControl(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'swipe.lmrec')
+        with LandmarkRecorder(self.path, 640, 480) as recorder:
+            for i, x in enumerate(swipe_path()):
+                recorder.write(i / FPS, [Hand(hand_pose(POSE_DRAW, x, 0.6), 'Right')])
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def replay(self, early=True, paced=False):
+        """Replays the recording through engine and module; returns the module."""
+        engine = GestureEngine(hands=ReplayHands(self.path))
+        if not early:
+            engine.gestures.configure(swipe_early_distance=engine.gestures.swipe_distance)
+        module = PresentationControl(640, 480, backend=RecordingBackend())
+        machine = StateMachine(engine)
+        machine.add('presentation', module)
+        timestamps = LandmarkRecording(self.path).timestamps
+        start = time.perf_counter()
+        for t in timestamps:
+            if paced:
+                # Like a camera: the frame is captured at its recorded time
+                time.sleep(max(0.0, start + t - time.perf_counter()))
+                captured = time.perf_counter()
+            else:
+                captured = float(t)
+            results = engine.process_frame(self.frame, captured)
+            machine.update(self.frame, results)
+        module.close()
+        return module
+
+    def test_fast_swipe_fires_early_and_once(self):
+        early = self.replay(early=True)
+        late = self.replay(early=False)
+        self.assertEqual([r.action for r in early.records], ['next_slide'])
+        self.assertEqual([r.action for r in late.records], ['next_slide'])
+        # Recorded stream time of the frame that fired: at least a frame sooner
+        self.assertLessEqual(early.records[0].captured, late.records[0].captured - 1 / FPS + 1e-9)
+        # and well before the motion is over
+        motion_end = (6 + 10 - 1) / FPS
+        self.assertLess(early.records[0].captured, motion_end - 4 / FPS)
+
+    def test_latency_is_measured_from_capture(self):
+        module = self.replay(paced=True)
+        record = module.records[0]
+        self.assertAlmostEqual(record.latency, record.dispatched - record.captured)
+        self.assertGreater(record.latency, 0.0)
+        self.assertLess(record.latency, LATENCY_BUDGET)
+        stats = module.stats()
+        self.assertEqual(stats['actions'], 1)
+        self.assertEqual(stats['over_budget'], 0)
+        # The action reached the backend
+        self.assertEqual([a for _, a in module.backend.actions], ['next_slide'])
+
+    def test_debounce_drops_flicker_not_later_gestures(self):
+        engine = GestureEngine(hands=ReplayHands(self.path))
+        module = PresentationControl(640, 480, backend=RecordingBackend(), debounce=0.5)
+        module.attach(engine.gestures)
+        fist = Hand(hand_pose(POSE_FIST, 0.5, 0.6))
+        # The fist is lost for one frame, then again much later
+        for i, hands in enumerate([[fist], [], [fist], [fist], [], [], [], [], [], [], [], [], [], [], [], [fist]]):
+            engine.gestures.update(hands, 640, 480, i / FPS)
+        self.assertEqual([r.action for r in module.records], ['start_stop_presentation'] * 2)
+        self.assertEqual(module.suppressed, 1)
+
+    def test_bindings_and_inactive_mode(self):
+        with self.assertRaises(ValueError):
+            PresentationControl(640, 480, [GestureBinding('fist', 'launch_rocket')], RecordingBackend())
+
+        engine = GestureEngine(hands=ReplayHands(self.path))
+        module = PresentationControl(640, 480, [GestureBinding('swipe_right', 'previous_slide')],
+                                     RecordingBackend())
+        machine = StateMachine(engine)
+        machine.add('presentation', module)
+        machine.add('other', module, stages={'landmarks', 'swipes'})
+        machine.update(self.frame, engine.process_frame(self.frame, 0.0))
+        # Gestures made in another mode do not turn slides
+        machine.switch('other')
+        for t in LandmarkRecording(self.path).timestamps[1:]:
+            engine.process_frame(self.frame, float(t))
+        self.assertEqual(module.records, type(module.records)())
+        self.assertEqual(module.bindings, {'swipe_right': 'previous_slide'})
+
+
+if __name__ == '__main__':
+    unittest.main()
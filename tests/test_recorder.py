@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from core.gesture_engine import GestureEngine
+from core.landmarks import Hand, INDEX_FINGER_PIP, INDEX_FINGER_TIP
+from core.recorder import LandmarkRecorder, LandmarkRecording, ReplayHands, record_dtype, HEADER
+from modules.painter import Painter, MODE_DRAW
+
+
+def pointing_hand(x, y):
+    """A hand with only the index finger up, tip at (x, y)."""
+    landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+    landmarks[:, 2] = 0.0
+    for tip in (12, 16, 20):
+        landmarks[tip, 1] = 0.9
+    landmarks[INDEX_FINGER_TIP, :2] = (x, y)
+    landmarks[INDEX_FINGER_PIP, 1] = y + 0.1
+    return Hand(landmarks, 'Right', 0.95)
+
+
+class TestLandmarkRecorder(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'session.lmrec')
+
+    def record_stroke(self, frames=20, start=0.0):
+        with LandmarkRecorder(self.path, 640, 480) as recorder:
+            for i in range(frames):
+                hands = [] if i % 10 == 9 else [pointing_hand(0.2 + 0.02 * i, 0.4)]
+                recorder.write(start + i / 30, hands)
+
+    def test_round_trip_and_append(self):
+        self.record_stroke(20)
+        # Reopening appends
+        self.record_stroke(5, start=10.0)
+
+        recording = LandmarkRecording(self.path)
+        self.assertEqual(len(recording), 25)
+        self.assertEqual((recording.width, recording.height), (640, 480))
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 25 * record_dtype(2).itemsize)
+
+        self.assertEqual(recording.landmarks(9).shape, (0, 21, 3))
+        landmarks = recording.landmarks(3)
+        self.assertEqual(landmarks.shape, (1, 21, 3))
+        self.assertAlmostEqual(float(landmarks[0, INDEX_FINGER_TIP, 0]), 0.26, places=6)
+        self.assertAlmostEqual(float(recording.timestamps[20]), 10.0)
+
+        results = recording.results(3)
+        self.assertEqual(results.multi_handedness[0].classification[0].label, 'Right')
+        self.assertIsNone(recording.results(9).multi_hand_landmarks)
+
+    def test_hands_beyond_max_hands_are_counted(self):
+        hands = [pointing_hand(0.2 + 0.2 * i, 0.4) for i in range(3)]
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), LandmarkRecorder(self.path, max_hands=2) as recorder:
+            recorder.write(0.0, hands)
+            recorder.write(1 / 30, hands)
+        self.assertEqual(recorder.hands_dropped, 2)
+        self.assertEqual(output.getvalue().count('Warning'), 1)
+        self.assertEqual(LandmarkRecording(self.path).landmarks(0).shape, (2, 21, 3))
+
+        path = os.path.join(os.path.dirname(self.path), 'three.lmrec')
+        with LandmarkRecorder(path, max_hands=3) as recorder:
+            recorder.write(0.0, hands)
+        self.assertEqual(recorder.hands_dropped, 0)
+        self.assertEqual(LandmarkRecording(path).landmarks(0).shape, (3, 21, 3))
+
+    def test_partial_record_is_dropped_on_append(self):
+        self.record_stroke(3)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 7)
+        self.assertEqual(len(LandmarkRecording(self.path)), 3)
+        self.record_stroke(2)
+        self.assertEqual(len(LandmarkRecording(self.path)), 5)
+
+    def test_replay_drives_engine_and_painter(self):
+        self.record_stroke(9)
+        replay = ReplayHands(self.path)
+        engine = GestureEngine(hands=replay)
+        painter = Painter(640, 480)
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        modes = []
+        while True:
+            engine.process_frame(frame)
+            if replay.finished:
+                break
+            painter.update(frame, None, engine)
+            modes.append(painter.current_mode)
+
+        self.assertEqual(modes, [MODE_DRAW] * 9)
+        self.assertTrue(painter.ink_tiles.any())
+        self.assertEqual(engine.detected_hands, [])
+
+    def test_realtime_replay_keeps_recorded_pace(self):
+        self.record_stroke(4)
+        replay = ReplayHands(self.path, realtime=True)
+        start = time.perf_counter()
+        for _ in range(4):
+            replay.process()
+        self.assertGreaterEqual(time.perf_counter() - start, 3 / 30 - 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
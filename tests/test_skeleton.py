@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.gesture_engine import GestureEngine
+from core.landmarks import Hand, NUM_LANDMARKS, results_from_arrays
+from core.state_machine import LANDMARKS
+from ui.skeleton import HAND_CONNECTIONS, STYLES, SkeletonRenderer
+
+
+class FixedHands:
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+
+    def process(self, rgb):
+        return results_from_arrays(self.landmarks[None], ['Right'])
+
+    def close(self):
+        pass
+
+
+class TestSkeletonRenderer(unittest.TestCase):
+    def setUp(self):
+        self.hand = hand_pose(POSE_DRAW, 0.3, 0.8, 1.5)
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def test_draws_every_bone_and_joint(self):
+        self.assertEqual(len(HAND_CONNECTIONS), 21)
+        self.assertEqual(set(HAND_CONNECTIONS.ravel()), set(range(NUM_LANDMARKS)))
+
+        SkeletonRenderer().draw(self.frame, self.hand)
+        style = STYLES['default']
+        pixels = (self.hand[:, :2] * (640, 480)).astype(int)
+        for x, y in pixels:
+            self.assertEqual(tuple(self.frame[y, x]), style.landmark_color)
+        for a, b in HAND_CONNECTIONS:
+            # Bone midpoints away from the joint dots
+            x, y = ((pixels[a] + pixels[b]) // 2)
+            if np.linalg.norm(pixels[a] - pixels[b]) > 4 * style.radius:
+                self.assertEqual(tuple(self.frame[y, x]), style.connection_color)
+
+    def test_batch_matches_hand_by_hand(self):
+        other = hand_pose(POSE_DRAW, 0.7, 0.9, 1.2)
+        renderer = SkeletonRenderer('keyboard')
+        expected = self.frame.copy()
+        renderer.draw(expected, self.hand)
+        renderer.draw(expected, other)
+        # The second hand reaches past the bottom of the frame
+        renderer.draw(self.frame, np.stack([self.hand, other]))
+        np.testing.assert_array_equal(self.frame, expected)
+
+    def test_off_draws_nothing(self):
+        renderer = SkeletonRenderer('off')
+        self.assertFalse(renderer.enabled)
+        renderer.draw(self.frame, self.hand, style='keyboard')
+        self.assertFalse(self.frame.any())
+        with self.assertRaises(ValueError):
+            renderer.set_style('neon')
+
+
+class TestEngineSkeleton(unittest.TestCase):
+    def test_draws_hands_without_mediapipe_only_with_skeleton_stage(self):
+        landmarks = hand_pose(POSE_DRAW, 0.4, 0.8)
+        engine = GestureEngine(hands=FixedHands(landmarks))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        engine.process_frame(frame)
+        self.assertEqual(len(engine.detected_hands), 1)
+
+        engine.draw_hands(frame)
+        self.assertTrue(frame.any())
+
+        frame[:] = 0
+        engine.set_stages({LANDMARKS})
+        engine.draw_landmarks(frame, Hand(landmarks))
+        self.assertFalse(frame.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import unittest
+
+import numpy as np
+
+from benchmarks import smoothing_benchmark
+from core.landmarks import Hand
+from utils.smoothing import HandSmoother, KalmanFilter, OneEuroFilter
+
+
+def noisy_track(velocity, frames=90, fps=30.0, noise=0.003, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) / fps
+    clean = 0.3 + velocity * t[:, None, None] * np.ones((1, 21, 3))
+    return t, (clean + rng.normal(0, noise, clean.shape)).astype(np.float32), clean
+
+
+class TestFilters(unittest.TestCase):
+    def test_filters_reduce_jitter_of_a_still_hand(self):
+        t, noisy, clean = noisy_track(0.0)
+        for landmark_filter in (OneEuroFilter(), KalmanFilter()):
+            out = np.array([landmark_filter(x, ts).copy() for x, ts in zip(noisy, t)])
+            raw_error = np.abs(noisy[30:] - clean[30:]).mean()
+            error = np.abs(out[30:] - clean[30:]).mean()
+            self.assertLess(error, raw_error * 0.8, type(landmark_filter).__name__)
+
+    def test_kalman_tracks_and_predicts_constant_velocity(self):
+        t, noisy, clean = noisy_track(0.5, noise=0.0005)
+        landmark_filter = KalmanFilter()
+        for x, ts in zip(noisy, t):
+            landmark_filter(x, ts)
+        np.testing.assert_allclose(landmark_filter.velocity, 0.5, atol=0.05)
+        expected = clean[-1] + 0.5 * 0.05
+        np.testing.assert_allclose(landmark_filter.predict(0.05), expected, atol=0.005)
+
+    def test_repeated_timestamp_keeps_state(self):
+        landmark_filter = OneEuroFilter()
+        first = np.full((21, 3), 0.5, dtype=np.float32)
+        landmark_filter(first, 1.0)
+        out = landmark_filter(first + 0.1, 1.0)
+        np.testing.assert_allclose(out, first)
+
+
+class TestHandSmoother(unittest.TestCase):
+    def test_filter_per_hand_and_drop_after_missing(self):
+        smoother = HandSmoother('kalman', max_missing=2)
+        landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+        hands = [Hand(landmarks.copy(), 'Left'), Hand(landmarks.copy(), 'Right')]
+        smoother.apply(hands, 0.0)
+        self.assertEqual(set(smoother.filters), {('Left', 0), ('Right', 0)})
+
+        right = Hand(landmarks + 0.01, 'Right')
+        for i in range(3):
+            smoother.apply([right], 0.1 + i / 30)
+        self.assertEqual(set(smoother.filters), {('Right', 0)})
+        # Raw input is not modified, the hand gets a new smoothed array
+        self.assertFalse(np.shares_memory(right.landmarks, smoother.filters[('Right', 0)].x))
+
+    def test_unknown_filter(self):
+        with self.assertRaises(ValueError):
+            HandSmoother('median')
+
+
+class TestSmoothingBenchmark(unittest.TestCase):
+    def test_report(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = smoothing_benchmark.main(['--frames', '150', '--width', '640', '--height', '480'])
+        filters = report['filters']
+        self.assertEqual(set(filters), set(smoothing_benchmark.CONFIGS))
+        self.assertLess(filters['kalman']['jitter_px'], filters['raw']['jitter_px'])
+        self.assertLess(filters['kalman_predict_33ms']['lag_ms'], filters['kalman']['lag_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import POSE_DRAW, hand_pose
+from core.gesture_engine import GestureEngine
+from core.landmarks import INDEX_FINGER_TIP, THUMB_TIP, results_from_arrays
+from core.state_machine import FINGERS, LANDMARKS, PINCH, SKELETON, SWIPES, StateMachine
+from modules.keyboard import VirtualKeyboard
+from modules.painter import MODE_DRAW, Painter
+
+WIDTH, HEIGHT = 640, 480
+
+
+class CountingHands:
+    """Hands backend returning one pointing (or pinching) hand, counting calls."""
+    def __init__(self, x=0.5):
+        self.landmarks = hand_pose(POSE_DRAW, x, 0.6)
+        self.pinch = False
+        self.calls = 0
+
+    def process(self, rgb_frame):
+        self.calls += 1
+        landmarks = self.landmarks.copy()
+        if self.pinch:
+            landmarks[THUMB_TIP] = landmarks[INDEX_FINGER_TIP]
+        return results_from_arrays(landmarks[None], ['Right'])
+
+    def close(self):
+        pass
+
+
+class RecordingModule:
+    def __init__(self, stages):
+        self.stages = stages
+        self.updates = 0
+        self.events = []
+
+    def update(self, frame, results, engine):
+        self.updates += 1
+        return frame
+
+    def on_enter(self):
+        self.events.append('on_enter')
+
+    def on_exit(self):
+        self.events.append('on_exit')
+
+
+class TestStateMachine(unittest.TestCase):
+    def setUp(self):
+        self.hands = CountingHands()
+        self.engine = GestureEngine(hands=self.hands)
+        self.machine = StateMachine(self.engine)
+        self.frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    def step(self):
+        results = self.engine.process_frame(self.frame)
+        return self.machine.update(self.frame.copy(), results)
+
+    def test_only_active_module_runs_with_its_stages(self):
+        first = RecordingModule({LANDMARKS, FINGERS})
+        second = RecordingModule({PINCH, SWIPES})
+        self.machine.add('first', first)
+        self.machine.add('second', second)
+        self.assertEqual(self.machine.current, 'first')
+        self.assertEqual(self.engine.stages, {LANDMARKS, FINGERS})
+        self.step()
+
+        self.assertEqual(self.machine.cycle(), 'second')
+        # Gesture stages imply detection
+        self.assertEqual(self.engine.stages, {LANDMARKS, PINCH, SWIPES})
+        self.step()
+        self.step()
+        self.assertEqual((first.updates, second.updates), (1, 2))
+        self.assertEqual(first.events, ['on_enter', 'on_exit'])
+        self.assertEqual(second.events, ['on_enter'])
+        self.assertFalse(self.machine.switch('second'))
+        with self.assertRaises(ValueError):
+            self.machine.add('bad', RecordingModule({'sound'}))
+
+    def test_mode_without_landmarks_skips_detection(self):
+        self.machine.add('hands', RecordingModule({LANDMARKS, FINGERS}))
+        self.machine.add('idle', RecordingModule({SKELETON}))
+        self.step()
+        self.assertEqual(self.engine.gestures.active, [{'point'}])
+        self.machine.switch('idle')
+        self.step()
+        self.step()
+        self.assertEqual(self.hands.calls, 1)
+        self.assertEqual(self.engine.detected_hands, [])
+        self.assertEqual(self.engine.gestures.active, [])
+
+    def test_gestures_follow_the_active_mode(self):
+        painter = Painter(WIDTH, HEIGHT)
+        keyboard = VirtualKeyboard(WIDTH, HEIGHT)
+        self.machine.add('painter', painter)
+        self.machine.add('keyboard', keyboard)
+
+        # The painter reads finger states only: no pinch is computed
+        self.step()
+        self.assertEqual(self.engine.gestures.active, [{'point'}])
+        self.assertEqual(painter.current_mode, MODE_DRAW)
+        self.hands.pinch = True
+        self.step()
+        self.assertEqual(self.engine.gestures.active, [set()])
+
+        # The keyboard reads the pinch only: no finger gestures
+        self.machine.switch('keyboard')
+        self.step()
+        self.assertEqual(self.engine.gestures.active, [{'pinch'}])
+        self.assertTrue(keyboard.pinch_was_active)
+        self.hands.pinch = False
+        self.step()
+        self.assertEqual(self.engine.gestures.active, [set()])
+        painter.close()
+
+    def test_modules_stay_warm_across_switches(self):
+        painter = Painter(WIDTH, HEIGHT)
+        keyboard = VirtualKeyboard(WIDTH, HEIGHT)
+        self.machine.add('painter', painter)
+        self.machine.add('keyboard', keyboard)
+        keyboard.text_input = "hello"
+
+        # A stroke in progress becomes one undo step when the mode changes
+        self.step()
+        self.hands.landmarks[:, 0] += 0.1
+        self.step()
+        self.assertTrue(painter.canvas.any())
+        self.machine.switch('keyboard')
+        self.assertEqual(len(painter.history.undo_stack), 1)
+        self.assertEqual(painter.hands, {})
+
+        self.step()
+        self.machine.switch('painter')
+        self.assertTrue(painter.canvas.any())
+        self.assertEqual(keyboard.text_input, "hello")
+        self.assertFalse(keyboard.pinch_was_active)
+        painter.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from modules.painter import Painter, SHAPE_CIRCLE, SHAPE_RECT, SHAPE_SQUARE, SHAPE_TRIANGLE
+from modules.vector_canvas import VectorCanvas
+
+
+class TestVectorCanvas(unittest.TestCase):
+    def setUp(self):
+        self.painter = Painter(320, 200, vector=True)
+
+    def draw_scene(self):
+        painter = self.painter
+        path = [(10, 10), (40, 30), (80, 35), (120, 90), (60, 150)]
+        for start, end in zip(path, path[1:]):
+            painter.draw_line(start, end, (255, 0, 0), 5)
+        painter.commit_action()
+        painter.draw_shapes_final((200, 100), (230, 100), SHAPE_CIRCLE, (0, 0, 255), 5)
+        painter.draw_shapes_final((20, 150), (90, 190), SHAPE_RECT, (0, 255, 0), 3)
+        painter.draw_shapes_final((150, 20), (190, 60), SHAPE_SQUARE, (0, 255, 255), 3)
+        painter.draw_shapes_final((250, 20), (300, 80), SHAPE_TRIANGLE, (255, 0, 255), 3)
+        # Erase part of the first stroke
+        painter.draw_line((30, 0), (60, 60), (0, 0, 0), 20)
+        painter.commit_action()
+
+    def test_render_matches_raster_canvas(self):
+        self.draw_scene()
+        self.assertTrue((self.painter.vector.render() == self.painter.canvas).all())
+
+    def test_render_at_other_resolution(self):
+        self.draw_scene()
+        big = self.painter.vector.render(640, 400)
+        self.assertEqual(big.shape, (400, 640, 3))
+        # The stroke lands at the scaled position
+        self.assertTrue(big[2 * 90, 2 * 120].any())
+        self.assertFalse(big[2 * 90, 2 * 20].any())
+
+    def test_undo_redo_and_clear_stay_in_sync(self):
+        self.draw_scene()
+        self.painter.clear_canvas()
+        self.assertFalse(self.painter.vector.render().any())
+        for _ in range(3):
+            self.painter.undo()
+            self.assertTrue((self.painter.vector.render() == self.painter.canvas).all())
+        self.painter.redo()
+        self.assertTrue((self.painter.vector.render() == self.painter.canvas).all())
+
+        # New drawing after undo drops the undone actions from the record
+        self.painter.draw_line((5, 195), (300, 195), (255, 255, 255), 3)
+        self.painter.commit_action()
+        self.assertTrue((self.painter.vector.render() == self.painter.canvas).all())
+
+    def test_serialization_round_trip(self):
+        self.draw_scene()
+        data = self.painter.vector.to_bytes()
+        self.assertLess(len(data), 8 * 1024)
+
+        loaded = VectorCanvas.from_bytes(data)
+        painter = Painter(320, 200, vector=True)
+        painter.vector = loaded
+        painter.rebuild_canvas()
+        self.assertTrue((painter.canvas == self.painter.canvas).all())
+        self.assertTrue((painter.ink_tiles == self.painter.ink_tiles).all())
+
+    def test_replay_until(self):
+        vector = VectorCanvas(320, 200)
+        vector.add_segment((10, 10), (100, 10), (255, 255, 255), 3, timestamp=1.0)
+        vector.add_segment((100, 10), (100, 100), (255, 255, 255), 3, timestamp=2.0)
+        vector.end_action()
+        halfway = vector.render(until=1.5)
+        self.assertTrue(halfway[10, 50].any())
+        self.assertFalse(halfway[60, 100].any())
+        self.assertTrue(vector.render()[60, 100].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Constant-time hit testing for rectangular UI elements.
+
+HitMap rasterizes a set of named rectangles once into a label image the size
+of the frame: every pixel holds the index of the element under it. Finding
+the element under a fingertip is then a single array read, however many
+elements there are, so it is cheap enough to do every frame (hover, dwell)
+and not only on a pinch.
+"""
+import numpy as np
+
+
+class HitMap:
+    """
+    Label raster of named (x, y, w, h) rectangles on a (height, width) frame.
+
+    Rectangles include their right and bottom edges, like the linear
+    kx <= x <= kx + kw scan they replace; where rectangles overlap, the one
+    that comes first in rects wins.
+    """
+    def __init__(self, rects, width, height):
+        self.rects = dict(rects)
+        self.names = [None] + list(self.rects)
+        self.labels = np.zeros((height, width), dtype=np.uint16)
+        # Paint back to front so that earlier rectangles end up on top
+        for label in range(len(self.names) - 1, 0, -1):
+            x, y, w, h = self.rects[self.names[label]]
+            x0, y0 = max(x, 0), max(y, 0)
+            self.labels[y0:max(y + h + 1, 0), x0:max(x + w + 1, 0)] = label
+
+    def lookup(self, x, y):
+        """Name of the rectangle containing pixel (x, y), or None."""
+        height, width = self.labels.shape
+        if 0 <= x < width and 0 <= y < height:
+            return self.names[self.labels[int(y), int(x)]]
+        return None
+
+    def rect(self, name):
+        return self.rects.get(name)
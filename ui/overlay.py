@@ -0,0 +1,115 @@
+"""
+Overlay compositing shared by all modules.
+
+OverlayLayer holds pre-rendered UI (keyboard keys, info panels, menus) as
+colour + alpha and blends it onto a frame in place. Compositor owns the
+output buffers, so a steady-state frame allocates no full-frame arrays.
+"""
+import cv2
+import numpy as np
+
+
+class OverlayLayer:
+    """
+    A cached UI layer: BGR pixels, alpha and position on the frame.
+
+    Opaque pixels are copied with a single masked copy, the semi-transparent
+    edges of anti-aliased text are blended separately.
+
+    A layer is built from two renders of the same content, one on black and
+    one on white: their difference gives the alpha and the black render is
+    the colour already multiplied by alpha (OpenCV's anti-aliased drawing
+    does not produce a usable alpha channel on 4-channel images).
+    """
+    def __init__(self, on_black, on_white, x=0, y=0):
+        alpha = 255 - (on_white.astype(np.int16) - on_black).max(axis=2)
+        alpha = np.clip(alpha, 0, 255).astype(np.uint8)
+        bx, by, w, h = cv2.boundingRect(alpha)
+        self.x, self.y = x + bx, y + by
+        self.bgr = np.ascontiguousarray(on_black[by:by + h, bx:bx + w])
+        alpha = alpha[by:by + h, bx:bx + w]
+        self.mask = np.ascontiguousarray(alpha == 255).view(np.uint8)
+
+        # Edges: result = colour + frame * (1 - alpha)
+        self.edge_idx = np.nonzero((alpha > 0) & (alpha < 255))
+        self.edge_bgr = self.bgr[self.edge_idx].astype(np.uint16)
+        self.edge_inv_alpha = (255 - alpha[self.edge_idx]).astype(np.uint16)[:, None]
+
+    @classmethod
+    def render(cls, shape, draw, x=0, y=0):
+        """
+        Calls draw(img) on a blank (height, width, 3) image and returns
+        (layer, whatever draw returned). The layer is placed at (x, y).
+        """
+        on_black = np.zeros(shape, dtype=np.uint8)
+        on_white = np.full(shape, 255, dtype=np.uint8)
+        result = draw(on_black)
+        draw(on_white)
+        return cls(on_black, on_white, x, y), result
+
+    def blend(self, frame):
+        """Blends the layer onto frame in place."""
+        h, w = self.mask.shape
+        if not h or not w:
+            return frame
+        region = frame[self.y:self.y + h, self.x:self.x + w]
+        cv2.copyTo(self.bgr, self.mask, region)
+        if len(self.edge_bgr):
+            under = region[self.edge_idx]
+            blended = self.edge_bgr + (under * self.edge_inv_alpha + 127) // 255
+            # Rounding can push bright pixels to 256, which would wrap to black
+            region[self.edge_idx] = np.minimum(blended, 255, out=blended)
+        return frame
+
+
+class Compositor:
+    """
+    Builds output frames in preallocated buffers: the camera frame on top and
+    an optional panel strip below it (replaces np.vstack([frame, panel])).
+
+    Output buffers are used round-robin so a frame handed to a display can
+    stay untouched while the next one is composed. The panel is only copied
+    into a buffer when its content changed since that buffer last got it.
+    """
+    def __init__(self, frame_width, frame_height, panel_height=0, buffers=2):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.panel_height = panel_height
+        self._outputs = [np.zeros((frame_height + panel_height, frame_width, 3), dtype=np.uint8)
+                         for _ in range(max(1, buffers))]
+        self._panel_versions = [-1] * len(self._outputs)
+        self._current = 0
+
+        # The panel is drawn into this buffer by its owner, see panel()
+        self.panel_image = np.zeros((panel_height, frame_width, 3), dtype=np.uint8)
+        self.panel_version = 0
+
+    @property
+    def output(self):
+        """The buffer being composed."""
+        return self._outputs[self._current]
+
+    def begin(self, frame):
+        """Starts a new output frame and returns its (writable) camera area."""
+        self._current = (self._current + 1) % len(self._outputs)
+        out = self.output
+        view = out[:self.frame_height]
+        if frame is not view:
+            np.copyto(view, frame)
+        return view
+
+    def panel(self):
+        """Returns the panel image for redrawing; call only when its content changes."""
+        self.panel_version += 1
+        return self.panel_image
+
+    def blend(self, layer):
+        """Blends an OverlayLayer onto the camera area of the current output."""
+        return layer.blend(self.output[:self.frame_height])
+
+    def finish(self):
+        """Completes the current output frame and returns it."""
+        if self.panel_height and self._panel_versions[self._current] != self.panel_version:
+            np.copyto(self.output[self.frame_height:], self.panel_image)
+            self._panel_versions[self._current] = self.panel_version
+        return self.output
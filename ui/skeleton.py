@@ -0,0 +1,79 @@
+"""
+Hand skeleton drawing.
+
+Replaces mp.solutions.drawing_utils.draw_landmarks, which loops in Python
+over the 21 landmarks and 21 connections of a hand with one cv2.circle or
+cv2.line call each. SkeletonRenderer converts the landmark arrays of all
+hands to pixels at once, draws every bone with a single cv2.polylines call
+over the precomputed HAND_CONNECTIONS index array and every joint with a
+second one (a zero-length segment drawn thick is a filled dot).
+
+Colours and sizes come from the presets in STYLES, which take the place of
+MediaPipe's DrawingSpecs. The 'off' style draws nothing at all, for runs
+without debug drawing (display.skeleton in config.yaml).
+"""
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from core.landmarks import NUM_LANDMARKS
+
+# Bones as (from, to) landmark indices, the same 21 as mp.solutions.hands.HAND_CONNECTIONS
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),          # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # index
+    (9, 10), (10, 11), (11, 12),             # middle
+    (13, 14), (14, 15), (15, 16),            # ring
+    (0, 17), (17, 18), (18, 19), (19, 20),   # pinky
+    (5, 9), (9, 13), (13, 17),               # palm
+], dtype=np.intp)
+
+# Colours are BGR; radius is the joint dot radius in pixels
+SkeletonStyle = namedtuple('SkeletonStyle', ['landmark_color', 'connection_color', 'thickness',
+                                             'radius', 'line_type'])
+
+STYLES = {
+    # MediaPipe's default look: red joints, light grey bones
+    'default': SkeletonStyle((0, 0, 255), (224, 224, 224), 2, 3, cv2.LINE_8),
+    'keyboard': SkeletonStyle((0, 255, 0), (0, 122, 255), 2, 4, cv2.LINE_8),
+    'thin': SkeletonStyle((0, 255, 255), (255, 255, 255), 1, 2, cv2.LINE_AA),
+    'off': None,
+}
+
+
+class SkeletonRenderer:
+    """Draws hand skeletons in one of the STYLES presets."""
+    def __init__(self, style='default'):
+        self.set_style(style)
+
+    def set_style(self, name):
+        if name not in STYLES:
+            raise ValueError(f"Unknown skeleton style {name!r}, expected one of {list(STYLES)}")
+        self.style_name = name
+        self.style = STYLES[name]
+
+    @property
+    def enabled(self):
+        return self.style is not None
+
+    def draw(self, frame, landmarks, style=None):
+        """
+        Draws normalized landmarks, one hand (21, 3) or a batch (N, 21, 3),
+        onto frame in place. style names a preset that replaces the
+        renderer's own, but nothing is drawn while the renderer is off.
+        """
+        if self.style is None:
+            return frame
+        style = self.style if style is None else STYLES[style]
+        points = np.asarray(landmarks)[..., :2].reshape(-1, NUM_LANDMARKS, 2)
+        if style is None or not len(points):
+            return frame
+        height, width = frame.shape[:2]
+        points = (points * np.array([width, height], dtype=np.float32)).astype(np.int32)
+
+        bones = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+        cv2.polylines(frame, bones, False, style.connection_color, style.thickness, style.line_type)
+        joints = np.repeat(points.reshape(-1, 1, 2), 2, axis=1)
+        cv2.polylines(frame, joints, False, style.landmark_color, 2 * style.radius + 1, style.line_type)
+        return frame
@@ -0,0 +1,318 @@
+"""
+Table-driven gesture classifier.
+
+Static gestures are rows of a declarative rule table:
+
+    GestureRule('point', fingers='01000')       # index up, the rest down
+    GestureRule('pinch', pinch=True)            # thumb and index tips touch
+
+fingers lists thumb, index, middle, ring and pinky: '1' up, '0' down, 'x'
+either. A hand is described completely by its five finger states and its
+pinch state, 64 combinations in all, so the table is compiled once into a
+lookup of the matching gestures for every combination. Per frame only the
+finger and pinch states of the (N, 21, 3) landmark batch are computed and
+looked up, whatever the number of rules. Motion gestures (swipes) come from
+a fixed-size ring buffer of the recent poses of the primary hand (the first
+one; with core.hand_tracker ids that is the oldest tracked hand).
+
+GestureEngine owns a GestureDetector (engine.gestures) and updates it once
+per frame; modules read engine.gestures.active[i] for hand i or subscribe to
+GestureEvent callbacks instead of recomputing finger states themselves.
+enable() turns the finger, pinch and swipe stages off for modes that do not
+read them (see core.state_machine); disabled gestures are never active.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from core.landmarks import (
+    INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, NUM_LANDMARKS, PINCH_THRESHOLD, PINKY_MCP,
+    RING_FINGER_MCP, WRIST, fingers_up, is_pinch, stack_hands,
+)
+from utils.logger import tracer
+
+GestureRule = namedtuple('GestureRule', ['name', 'fingers', 'pinch'], defaults=('xxxxx', None))
+
+# phase is 'start' or 'end' for static gestures and 'trigger' for swipes;
+# hand is the Hand.id (its index in the frame when hands carry no id);
+# position is the normalized (x, y) palm centre of the hand.
+GestureEvent = namedtuple('GestureEvent', ['name', 'phase', 'hand', 'timestamp', 'position'])
+
+DEFAULT_RULES = (
+    GestureRule('open_palm', fingers='11111'),
+    GestureRule('fist', fingers='00000'),
+    GestureRule('point', fingers='01000'),
+    GestureRule('thumb', fingers='10000'),
+    GestureRule('peace', fingers='01100'),
+    GestureRule('pinch', pinch=True),
+)
+
+SWIPES = ('swipe_left', 'swipe_right', 'swipe_up', 'swipe_down')
+
+PALM = np.array([WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, RING_FINGER_MCP, PINKY_MCP])
+
+# Weights turning the five finger states into a code 0..31
+FINGER_BITS = 1 << np.arange(5)
+
+
+class GestureDetector:
+    """
+    Evaluates the rule table and the swipe detector once per frame.
+
+    history         poses kept in the ring buffer
+    swipe_window    seconds of history a swipe is measured over
+    swipe_distance  minimum palm travel (normalized frame units)
+    swipe_speed     minimum mean palm speed (normalized units per second)
+    swipe_cooldown  seconds after a swipe during which no other swipe fires
+
+    A fast swipe fires early, before it has covered swipe_distance, once it
+    has covered swipe_early_distance in at least four samples, every step
+    went the same way, and its recent speed (last two intervals) is at least
+    swipe_early_speed. Setting swipe_early_distance to swipe_distance turns
+    early firing off.
+    """
+    def __init__(self, rules=DEFAULT_RULES, pinch_threshold=PINCH_THRESHOLD, history=32,
+                 swipe_window=0.4, swipe_distance=0.2, swipe_speed=0.8, swipe_cooldown=0.6,
+                 swipe_early_distance=0.12, swipe_early_speed=1.2):
+        self.rules = tuple(rules)
+        self.names = [rule.name for rule in self.rules]
+        self.pinch_threshold = pinch_threshold
+        self.swipe_window = swipe_window
+        self.swipe_distance = swipe_distance
+        self.swipe_speed = swipe_speed
+        self.swipe_cooldown = swipe_cooldown
+        self.swipe_early_distance = swipe_early_distance
+        self.swipe_early_speed = swipe_early_speed
+
+        # Compile the table: table[pinched, code] tells which rules match a
+        # hand whose finger states, read as bits, give code
+        want = np.array([[c == '1' for c in rule.fingers] for rule in self.rules], dtype=bool)
+        care = np.array([[c != 'x' for c in rule.fingers] for rule in self.rules], dtype=bool)
+        pinch = np.array([-1 if rule.pinch is None else int(rule.pinch) for rule in self.rules])
+        states = (np.arange(32)[:, None] >> np.arange(5)) & 1 == 1
+        fingers_match = ~((states[:, None, :] ^ want) & care).any(axis=-1)
+        self.table = np.stack([fingers_match & (pinch != 1), fingers_match & (pinch != 0)])
+        self._active_sets = [[frozenset(self.names[r] for r in np.flatnonzero(row)) for row in rows]
+                             for rows in self.table]
+        self._uses_pinch = bool((pinch >= 0).any())
+        # Without finger states only the rules that ignore the fingers can match
+        free = ~care.any(axis=1)
+        self._finger_free_sets = [frozenset(self.names[r] for r in np.flatnonzero(row & free))
+                                  for row in self.table[:, 0]]
+
+        # Stages computed by update(), see enable()
+        self.fingers_enabled = True
+        self.pinch_enabled = True
+        self.swipes_enabled = True
+
+        # Ring buffer of the primary hand's recent poses and palm centres
+        self.history = np.zeros((history, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.history_palm = np.zeros((history, 2), dtype=np.float32)
+        self.history_times = np.full(history, -np.inf)
+        self._head = 0
+        self._last_swipe = -np.inf
+        self._primary = None
+
+        # Active gesture sets per hand index (active) and per hand identity
+        self.active = []
+        self._active_by_hand = {}
+        self.events = []
+        self._subscribers = []
+
+        # Cost of update() in seconds
+        self.last_cost = 0.0
+        self.max_cost = 0.0
+        self._total_cost = 0.0
+        self._updates = 0
+
+    def configure(self, pinch_threshold=None, swipe_window=None, swipe_distance=None,
+                  swipe_speed=None, swipe_cooldown=None, swipe_early_distance=None, swipe_early_speed=None):
+        """Changes thresholds in place (config reload); None keeps a value."""
+        params = dict(pinch_threshold=pinch_threshold, swipe_window=swipe_window,
+                      swipe_distance=swipe_distance, swipe_speed=swipe_speed, swipe_cooldown=swipe_cooldown,
+                      swipe_early_distance=swipe_early_distance, swipe_early_speed=swipe_early_speed)
+        for name, value in params.items():
+            if value is not None:
+                setattr(self, name, value)
+
+    def enable(self, fingers=True, pinch=True, swipes=True):
+        """Chooses which stages update() computes."""
+        self.fingers_enabled = fingers
+        self.pinch_enabled = pinch
+        if self.swipes_enabled and not swipes:
+            self.reset_history()
+        self.swipes_enabled = swipes
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def subscribe(self, callback, names=None):
+        """Calls callback(event) for every GestureEvent, or only for names."""
+        self._subscribers.append((callback, None if names is None else frozenset(names)))
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, names) for cb, names in self._subscribers if cb != callback]
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+    def codes(self, landmarks, width=1, height=1):
+        """
+        (pinched, code) index arrays into the compiled table for a (N, 21, 3)
+        batch; disabled stages read as fingers down and no pinch.
+        """
+        if self.fingers_enabled:
+            codes = fingers_up(landmarks) @ FINGER_BITS
+        else:
+            codes = np.zeros(len(landmarks), dtype=np.intp)
+        if self._uses_pinch and self.pinch_enabled:
+            pinched = is_pinch(landmarks, width, height, self.pinch_threshold).astype(np.intp)
+        else:
+            pinched = np.zeros(len(codes), dtype=np.intp)
+        return pinched, codes
+
+    def classify(self, landmarks, width=1, height=1):
+        """(N, R) boolean matrix: which rules match which hand of a (N, 21, 3) batch."""
+        return self.table[self.codes(landmarks, width, height)]
+
+    def update(self, hands, width, height, timestamp=None):
+        """
+        Classifies the hands of a frame, fires events and returns the list of
+        active gesture name sets, one per hand.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        start = time.perf_counter()
+        with tracer.span('gestures.update'):
+            landmarks = stack_hands(hands)
+            events = []
+            active = []
+            if len(landmarks):
+                pinched, codes = self.codes(landmarks, width, height)
+                if self.fingers_enabled:
+                    active = [self._active_sets[p][c] for p, c in zip(pinched.tolist(), codes.tolist())]
+                else:
+                    active = [self._finger_free_sets[p] for p in pinched.tolist()]
+                centres = landmarks[:, PALM, :2].mean(axis=1)
+            else:
+                centres = np.empty((0, 2), dtype=np.float32)
+
+            # Start/end transitions of static gestures, per hand
+            keys = [i if hand.id is None else hand.id for i, hand in enumerate(hands)]
+            active_by_hand = dict(zip(keys, active))
+            for key in list(self._active_by_hand) + [k for k in keys if k not in self._active_by_hand]:
+                now = active_by_hand.get(key, frozenset())
+                before = self._active_by_hand.get(key, frozenset())
+                i = keys.index(key) if key in active_by_hand else None
+                position = None if i is None else (float(centres[i, 0]), float(centres[i, 1]))
+                for name in sorted(before - now):
+                    events.append(GestureEvent(name, 'end', key, timestamp, position))
+                for name in sorted(now - before):
+                    events.append(GestureEvent(name, 'start', key, timestamp, position))
+
+            # A different primary hand starts a new motion
+            primary = keys[0] if keys else None
+            if primary != self._primary:
+                self.reset_history()
+                self._primary = primary
+            swipe = None
+            if self.swipes_enabled:
+                swipe = self._track(landmarks[0] if len(landmarks) else None,
+                                    centres[0] if len(centres) else None, timestamp)
+            if swipe is not None:
+                events.append(GestureEvent(swipe, 'trigger', primary, timestamp,
+                                           (float(centres[0, 0]), float(centres[0, 1]))))
+
+            self.active = active
+            self._active_by_hand = active_by_hand
+            self.events = events
+
+        cost = time.perf_counter() - start
+        self.last_cost = cost
+        self.max_cost = max(self.max_cost, cost)
+        self._total_cost += cost
+        self._updates += 1
+
+        for event in events:
+            for callback, names in self._subscribers:
+                if names is None or event.name in names:
+                    callback(event)
+        return active
+
+    def is_active(self, name, hand=0):
+        return hand < len(self.active) and name in self.active[hand]
+
+    # ------------------------------------------------------------------
+    # Temporal history
+    # ------------------------------------------------------------------
+    def _track(self, landmarks, palm, timestamp):
+        """Pushes the primary hand into the ring buffer, returns a swipe name or None."""
+        if landmarks is None:
+            # A lost hand breaks the motion
+            self.reset_history()
+            return None
+
+        last = self._head
+        self.history[last] = landmarks
+        self.history_palm[last] = palm
+        self.history_times[last] = timestamp
+        self._head = (last + 1) % len(self.history)
+
+        if timestamp - self._last_swipe < self.swipe_cooldown:
+            return None
+
+        # Oldest sample inside the window (cleared slots hold -inf)
+        inside = self.history_times >= timestamp - self.swipe_window
+        if np.count_nonzero(inside) < 3:
+            return None
+        first = int(np.argmin(np.where(inside, self.history_times, np.inf)))
+
+        dt = timestamp - self.history_times[first]
+        dx, dy = (self.history_palm[last] - self.history_palm[first]).tolist()
+        distance = max(abs(dx), abs(dy))
+        if dt <= 0:
+            return None
+        if distance < self.swipe_distance or distance / dt < self.swipe_speed:
+            if not self._early_swipe(inside, dx, dy, distance):
+                return None
+        # Mostly along one axis
+        if abs(dx) >= 2 * abs(dy):
+            name = 'swipe_right' if dx > 0 else 'swipe_left'
+        elif abs(dy) >= 2 * abs(dx):
+            name = 'swipe_down' if dy > 0 else 'swipe_up'
+        else:
+            return None
+
+        self._last_swipe = timestamp
+        self.reset_history()
+        return name
+
+    def _early_swipe(self, inside, dx, dy, distance):
+        """Whether the motion in the window is already a certain swipe."""
+        if distance < self.swipe_early_distance:
+            return False
+        order = np.flatnonzero(inside)
+        if len(order) < 4:
+            return False
+        order = order[np.argsort(self.history_times[order])]
+        axis = 0 if abs(dx) >= abs(dy) else 1
+        path = self.history_palm[order, axis] * (1.0 if (dx, dy)[axis] > 0 else -1.0)
+        # Every step forward (small jitter allowed) and still fast at the end
+        if (np.diff(path) < -0.01).any():
+            return False
+        recent_dt = self.history_times[order[-1]] - self.history_times[order[-3]]
+        return recent_dt > 0 and (path[-1] - path[-3]) / recent_dt >= self.swipe_early_speed
+
+    def reset_history(self):
+        self.history_times.fill(-np.inf)
+
+    def stats(self):
+        """Measured cost of update() in microseconds."""
+        return {
+            'updates': self._updates,
+            'mean_us': self._total_cost / self._updates * 1e6 if self._updates else 0.0,
+            'max_us': self.max_cost * 1e6,
+            'last_us': self.last_cost * 1e6,
+        }
@@ -0,0 +1,207 @@
+"""
+Lightweight span tracing for the frame loop.
+
+Stages are wrapped in spans of the shared module-level tracer:
+
+    from utils.logger import tracer
+
+    with tracer.span('engine.hands.process'):
+        results = self.hands.process(rgb_frame)
+
+While the tracer is disabled (the default) span() returns a shared no-op
+context manager, so instrumented code pays one attribute lookup and call.
+When enabled, every span is kept in a bounded ring of events that can be
+exported as Chrome trace-event JSON (open it in https://ui.perfetto.dev or
+chrome://tracing), and the last durations of each stage feed a rolling stats
+overlay that can be drawn onto the output frame.
+"""
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+import cv2
+import numpy as np
+
+
+class _NullSpan:
+    """Context manager that does nothing, handed out while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.start, perf_counter_ns())
+        return False
+
+
+class Tracer:
+    """
+    Collects (name, thread, start, end) spans. capacity bounds the number of
+    events kept for export, window the number of durations per stage used
+    for the rolling stats.
+    """
+    def __init__(self, enabled=False, capacity=200000, window=120):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.window = window
+        self.events = deque(maxlen=capacity)
+        self.durations = {}
+        self.thread_names = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.durations.clear()
+
+    def span(self, name):
+        """Context manager timing the enclosed block as stage name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """Adds a finished span (perf_counter_ns timestamps)."""
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.events.append((name, tid, start_ns, end_ns))
+        durations = self.durations.get(name)
+        if durations is None:
+            with self._lock:
+                durations = self.durations.setdefault(name, deque(maxlen=self.window))
+        durations.append(end_ns - start_ns)
+
+    # ------------------------------------------------------------------
+    # Rolling statistics
+    # ------------------------------------------------------------------
+    def stats(self):
+        """{stage: {'mean', 'p95', 'max', 'count'}} in milliseconds over the window."""
+        with self._lock:
+            items = [(name, list(durations)) for name, durations in self.durations.items()]
+        stats = {}
+        for name, durations in items:
+            if not durations:
+                continue
+            ms = np.asarray(durations, dtype=np.float64) / 1e6
+            stats[name] = {
+                'mean': float(ms.mean()),
+                'p95': float(np.percentile(ms, 95)),
+                'max': float(ms.max()),
+                'count': len(ms),
+            }
+        return stats
+
+    def draw_overlay(self, img, x=10, y=10, font_scale=0.45):
+        """Draws the rolling per-stage stats into the corner of img, in place."""
+        stats = self.stats()
+        if not stats:
+            return img
+        line_height = int(22 * font_scale / 0.45)
+        lines = [f"{'stage':<24}{'mean':>7}{'p95':>7}"]
+        lines += [f"{name:<24}{s['mean']:>7.2f}{s['p95']:>7.2f}" for name, s in sorted(stats.items())]
+
+        width = int(img.shape[1] * 0.45)
+        height = line_height * len(lines) + 8
+        x1, y1 = min(img.shape[1], x + width), min(img.shape[0], y + height)
+        # Darken the background so the text stays readable over video
+        region = img[y:y1, x:x1]
+        np.right_shift(region, 2, out=region)
+        for i, line in enumerate(lines):
+            cv2.putText(img, line, (x + 6, y + line_height * (i + 1)), cv2.FONT_HERSHEY_PLAIN,
+                        font_scale * 2, (0, 255, 0) if i else (255, 255, 255), 1)
+        return img
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def chrome_trace(self):
+        """The recorded spans as a Chrome trace-event dict."""
+        pid = os.getpid()
+        events = list(self.events)
+        # Spans are recorded when they end, so an enclosing span comes after
+        # the spans nested in it: the earliest start is the origin
+        origin = min(event[2] for event in events) if events else 0
+        tids = {}
+        trace = []
+        for name, thread, start, end in events:
+            tid = tids.setdefault(thread, len(tids) + 1)
+            trace.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (start - origin) / 1000.0,
+                'dur': (end - start) / 1000.0,
+                'pid': pid,
+                'tid': tid,
+            })
+        for thread, tid in tids.items():
+            trace.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': self.thread_names.get(thread, str(thread))},
+            })
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """Writes the recorded spans to path as Chrome trace-event JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+class StartupTimer:
+    """
+    Milestones of program startup, as seconds since start (a perf_counter
+    value taken as early as possible, before the heavy imports). Only the
+    first mark of each milestone counts, so marks can sit inside the loop.
+    """
+    def __init__(self, start=None):
+        self.start = perf_counter_ns() / 1e9 if start is None else start
+        self.marks = {}
+
+    def mark(self, name, at=None):
+        if name not in self.marks:
+            self.marks[name] = (perf_counter_ns() / 1e9 if at is None else at) - self.start
+
+    def report(self):
+        """One line per milestone with its time and the step from the previous one."""
+        lines = ["Startup timing (ms since launch):"]
+        previous = 0.0
+        for name, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {name:<24}{seconds * 1000:>9.1f}  (+{(seconds - previous) * 1000:.1f})")
+            previous = seconds
+        return '\n'.join(lines)
+
+
+# Shared tracer used by all instrumented modules
+tracer = Tracer()
@@ -0,0 +1,203 @@
+"""
+Landmark smoothing and latency-compensating prediction.
+
+Both filters work on a whole hand at once: the state is a (21, 3) NumPy array
+(any shape works), so one call filters every landmark of a frame.
+
+    OneEuroFilter   adaptive low-pass: heavy smoothing while the hand is
+                    still, little lag when it moves fast
+    KalmanFilter    constant-velocity Kalman filter; every coordinate shares
+                    the same noise model, so the covariance is a single 2x2
+                    matrix and the gain is two scalars
+
+Both track a velocity, so predict(horizon) extrapolates the filtered
+landmarks to the time the frame will actually be on screen, hiding part of
+the capture-to-display latency.
+
+HandSmoother applies a filter per detected hand and is what GestureEngine
+uses (GestureEngine(smoother=HandSmoother())).
+"""
+import math
+import time
+
+import numpy as np
+
+
+def _alpha(cutoff, dt):
+    """Exponential smoothing factor for a cutoff frequency (Hz, scalar or array)."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter (Casiez et al., 2012) over an array of coordinates.
+
+    min_cutoff  cutoff frequency (Hz) at rest; lower means smoother
+    beta        how fast the cutoff rises with speed (per normalized unit/s);
+                higher means less lag
+    d_cutoff    cutoff frequency (Hz) of the velocity estimate
+    """
+    def __init__(self, min_cutoff=1.0, beta=20.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.velocity = None
+        self.timestamp = None
+
+    def __call__(self, value, timestamp):
+        value = np.asarray(value, dtype=np.float32)
+        if self.x is None or timestamp <= self.timestamp:
+            if self.x is None:
+                self.x = value.copy()
+                self.velocity = np.zeros_like(self.x)
+            self.timestamp = timestamp
+            return self.x
+
+        dt = timestamp - self.timestamp
+        self.timestamp = timestamp
+
+        # Smoothed speed of every coordinate
+        a_d = _alpha(self.d_cutoff, dt)
+        self.velocity += a_d * ((value - self.x) / dt - self.velocity)
+
+        # The faster it moves, the higher the cutoff
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        self.x += _alpha(cutoff, dt) * (value - self.x)
+        return self.x
+
+    def predict(self, horizon):
+        """Filtered value extrapolated horizon seconds ahead."""
+        if self.x is None:
+            return None
+        return self.x + self.velocity * horizon
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter over an array of coordinates.
+
+    process_noise       acceleration noise density (units/s^2); higher
+                        follows direction changes faster
+    measurement_noise   standard deviation of the measurements (units)
+    """
+    def __init__(self, process_noise=1.0, measurement_noise=0.004):
+        self.q = process_noise ** 2
+        self.r = measurement_noise ** 2
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.velocity = None
+        self.timestamp = None
+        # Shared covariance [[pp, pv], [pv, vv]]
+        self.pp = self.r
+        self.pv = 0.0
+        self.vv = 1.0
+
+    def __call__(self, value, timestamp):
+        value = np.asarray(value, dtype=np.float32)
+        if self.x is None or timestamp <= self.timestamp:
+            if self.x is None:
+                self.x = value.copy()
+                self.velocity = np.zeros_like(self.x)
+            self.timestamp = timestamp
+            return self.x
+
+        dt = timestamp - self.timestamp
+        self.timestamp = timestamp
+
+        # Predict
+        self.x += self.velocity * dt
+        q = self.q
+        pp = self.pp + 2 * dt * self.pv + dt * dt * self.vv + q * dt ** 4 / 4
+        pv = self.pv + dt * self.vv + q * dt ** 3 / 2
+        vv = self.vv + q * dt * dt
+
+        # Update with the measured positions
+        s = pp + self.r
+        k_pos, k_vel = pp / s, pv / s
+        innovation = value - self.x
+        self.x += k_pos * innovation
+        self.velocity += k_vel * innovation
+
+        self.pp = (1 - k_pos) * pp
+        self.pv = (1 - k_pos) * pv
+        self.vv = vv - k_vel * pv
+        return self.x
+
+    def predict(self, horizon):
+        """Filtered value extrapolated horizon seconds ahead."""
+        if self.x is None:
+            return None
+        return self.x + self.velocity * horizon
+
+
+FILTERS = {
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+class HandSmoother:
+    """
+    Smooths the landmarks of every detected hand in place.
+
+    Each hand gets its own filter, keyed by Hand.id when a tracker assigned
+    one, otherwise by handedness (and order, for two hands with the same
+    label); a filter is dropped when its hand is lost for more than
+    max_missing frames. lead > 0 shifts the output lead
+    seconds ahead along the estimated velocity, capped at max_lead.
+    """
+    def __init__(self, kind='one_euro', lead=0.0, max_lead=0.1, max_missing=3, **params):
+        if kind not in FILTERS:
+            raise ValueError(f"Unknown filter '{kind}', expected one of {sorted(FILTERS)}")
+        self.kind = kind
+        self.params = params
+        self.lead = min(max(lead, 0.0), max_lead)
+        self.max_missing = max_missing
+        self.filters = {}
+        self.missing = {}
+
+    def new_filter(self):
+        return FILTERS[self.kind](**self.params)
+
+    def apply(self, hands, timestamp=None):
+        """Replaces hand.landmarks of each Hand with its smoothed value."""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        seen = set()
+        for hand in hands:
+            if hand.id is not None:
+                key = hand.id
+            else:
+                key = (hand.handedness, sum(1 for k in seen if isinstance(k, tuple) and k[0] == hand.handedness))
+            seen.add(key)
+            landmark_filter = self.filters.get(key)
+            if landmark_filter is None:
+                landmark_filter = self.filters[key] = self.new_filter()
+            self.missing[key] = 0
+
+            smoothed = landmark_filter(hand.landmarks, timestamp)
+            if self.lead:
+                hand.landmarks = landmark_filter.predict(self.lead)
+            else:
+                hand.landmarks = smoothed.copy()
+
+        for key in list(self.filters):
+            if key in seen:
+                continue
+            self.missing[key] += 1
+            if self.missing[key] > self.max_missing:
+                del self.filters[key]
+                del self.missing[key]
+        return hands
+
+    def reset(self):
+        self.filters.clear()
+        self.missing.clear()